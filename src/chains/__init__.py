@@ -1,13 +1,18 @@
 """Chains 모듈: 개별 LLM 체인들"""
 
 from .intent_classifier import create_intent_classifier
+from .local_intent_classifier import LocalIntentClassifier, evaluate_agreement
 from .recommendation import create_recommendation_chain
 from .summary import create_summary_chain
 from .quiz import create_quiz_chain
+from .llm_cache import LRUSQLiteLLMCache
 
 __all__ = [
     "create_intent_classifier",
+    "LocalIntentClassifier",
+    "evaluate_agreement",
     "create_recommendation_chain",
     "create_summary_chain",
     "create_quiz_chain",
+    "LRUSQLiteLLMCache",
 ]
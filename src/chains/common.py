@@ -1,13 +1,18 @@
 """공통 모듈: LLM, 컨텍스트 검색 함수, Logger"""
 
+import time
 import logging
 from typing import Optional
+from langchain_core.caches import BaseCache
 from langchain_openai import ChatOpenAI
-from src.utils.web_search import search_for_nutrition_info
+from .web_fallback import get_web_fallback
 
 # Logger 설정
 logger = logging.getLogger(__name__)
 
+# 프롬프트 버전 (체인 프롬프트를 바꾸면 올려서 캐시된 응답을 무효화)
+PROMPT_VERSION = "1"
+
 
 # LLM 초기화
 def get_llm(
@@ -15,6 +20,7 @@ def get_llm(
     temperature: float = 0.7,
     max_tokens: Optional[int] = None,
     top_p: float = 1.0,
+    cache: Optional[BaseCache] = None,
 ):
     """
     LLM 인스턴스 반환
@@ -24,6 +30,7 @@ def get_llm(
         temperature: 응답의 창의성 (0.0~2.0, 기본값: 0.7)
         max_tokens: 최대 토큰 수 (기본값: None - 제한 없음)
         top_p: 누적 확률 필터링 (기본값: 1.0)
+        cache: LLM 응답 캐시 (기본값: None - 캐시 사용 안 함, 결정적인 체인에만 사용 권장)
 
     Returns:
         ChatOpenAI 인스턴스
@@ -33,72 +40,137 @@ def get_llm(
         temperature=temperature,
         max_tokens=max_tokens,
         top_p=top_p,
+        cache=cache,
     )
 
 
+# 검색 쿼리 (워크플로우가 요청 단위로 미리 검색할 수 있도록 체인과 같은 문자열을 사용)
+def ingredient_query(dish_name: str) -> str:
+    """재료 컨텍스트 검색 쿼리"""
+    return f"{dish_name} 재료 레시피"
+
+
+def recommendation_query(dish_name: str) -> str:
+    """대체재 추천 컨텍스트 검색 쿼리"""
+    return f"저칼륨 저인 식품 대체재 {dish_name}"
+
+
 # 컨텍스트 검색 함수들
-def get_context_for_ingredients(retriever, dish_name: str) -> str:
-    """재료 추출을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
-    query = f"{dish_name} 재료 레시피"
+def _join_docs(docs) -> str:
+    """검색된 문서 본문을 이어붙입니다."""
+    return "\n\n".join([doc.page_content for doc in docs])
 
-    # 1. RAG 검색 시도
-    docs = retriever.retrieve(query)
-    total_length = sum(len(doc.page_content) for doc in docs)
-    min_required_length = 300
-
-    if total_length >= min_required_length:
-        context = "\n\n".join([doc.page_content for doc in docs])
-        logger.info(f"✅ '{dish_name}' RAG 검색 결과 사용")
-    else:
-        # Fallback: 웹 검색
-        logger.warning(f"⚠️ '{dish_name}' RAG 검색 결과 부족 → 웹 검색 실행 중...")
-        rag_context = "\n\n".join([doc.page_content for doc in docs]) if docs else "검색 결과 없음"
-        web_results = search_for_nutrition_info(f"{dish_name} 레시피 재료", max_results=2)
-        context = f"[RAG 검색 결과]\n{rag_context}\n\n[웹 검색 결과]\n{web_results}"
-        logger.info("✅ RAG + 웹 검색 결과 결합 완료")
 
-    return context
+def _is_enough(docs, min_required_length: int) -> bool:
+    """검색 결과 본문 길이가 충분한지 확인합니다."""
+    return sum(len(doc.page_content) for doc in docs) >= min_required_length
 
 
-def get_context_for_recommendation(retriever, dish_name: str) -> str:
-    """추천을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
-    query = f"저칼륨 저인 식품 대체재 {dish_name}"
-    docs = retriever.retrieve(query)
+def _combine_with_web(rag_context: str, web_results: Optional[str]) -> str:
+    """RAG 검색 결과와 웹 검색 결과를 합칩니다. (웹 검색을 생략했거나 실패하면 RAG 결과만 사용)"""
+    if web_results is None:
+        logger.warning("⚠️ 웹 검색 결과 없음 → RAG 검색 결과만 사용")
+        return rag_context
+    logger.info("✅ RAG + 웹 검색 결과 결합 완료")
+    return f"[RAG 검색 결과]\n{rag_context}\n\n[웹 검색 결과]\n{web_results}"
 
-    total_length = sum(len(doc.page_content) for doc in docs)
-    min_required_length = 500
 
-    if total_length >= min_required_length:
-        context = "\n\n".join([doc.page_content for doc in docs])
-        logger.info("✅ 대체재 추천: RAG 검색 결과 사용")
-    else:
-        logger.warning("⚠️ 대체재 추천: RAG 검색 결과 부족 -> 웹 검색 실행 중...")
-        rag_context = "\n\n".join([doc.page_content for doc in docs])
-        web_results = search_for_nutrition_info(query, max_results=3)
-        context = f"[RAG 검색 결과]\n{rag_context}\n\n[웹 검색 결과]\n{web_results}"
-        logger.info("✅ RAG + 웹 검색 결과 결합 완료")
+def _is_prefetched(retriever, query: str) -> bool:
+    """요청 단위 검색 컨텍스트에 이미 결과가 있는지 확인합니다. (있으면 웹 검색을 미리 시작할 필요 없음)"""
+    return hasattr(retriever, "has") and retriever.has(query)
 
-    return context
 
+def _context_with_web_fallback(
+    retriever,
+    query: str,
+    web_query: str,
+    min_required_length: int,
+    max_results: int,
+    label: str = "",
+    empty_context: str = ""
+) -> str:
+    """
+    RAG 검색 결과가 부족하면 웹 검색 결과를 덧붙입니다.
+    웹 검색은 RAG 검색과 동시에 미리 시작하고(충분하면 취소), 시간 예산과 서킷 브레이커를 적용합니다.
 
-def get_context_for_summary(retriever, topic: str) -> str:
-    """요약을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
-    docs = retriever.retrieve(topic)
+    Args:
+        retriever: RAG 리트리버
+        query: RAG 검색 쿼리
+        web_query: 웹 검색 쿼리
+        min_required_length: RAG 결과로 충분하다고 보는 최소 본문 길이
+        max_results: 웹 검색 최대 결과 수
+        label: 로그 앞에 붙일 설명
+        empty_context: RAG 결과가 없을 때 대신 넣을 문자열
 
-    total_length = sum(len(doc.page_content) for doc in docs)
-    min_required_length = 500
+    Returns:
+        컨텍스트 문자열
+    """
+    fallback = get_web_fallback()
+    started = time.monotonic()
+    web_future = None if _is_prefetched(retriever, query) else fallback.start(web_query, max_results, started)
 
-    if total_length >= min_required_length:
-        context = "\n\n".join([doc.page_content for doc in docs])
-        logger.info("✅ RAG 검색 결과 사용")
-    else:
-        logger.warning("⚠️ RAG 검색 결과 부족 -> 웹 검색 실행 중...")
-        rag_context = "\n\n".join([doc.page_content for doc in docs])
-        web_results = search_for_nutrition_info(topic, max_results=3)
-        context = f"[RAG 검색 결과]\n{rag_context}\n\n[웹 검색 결과]\n{web_results}"
-        logger.info("✅ RAG + 웹 검색 결과 결합 완료")
+    docs = retriever.retrieve(query)
+    if _is_enough(docs, min_required_length):
+        fallback.cancel(web_future)
+        logger.info(f"✅ {label}RAG 검색 결과 사용")
+        return _join_docs(docs)
+
+    logger.warning(f"⚠️ {label}RAG 검색 결과 부족 → 웹 검색 결과 대기 중...")
+    web_results = fallback.result(web_future, web_query, max_results, started)
+    return _combine_with_web(_join_docs(docs) if docs else empty_context, web_results)
+
+
+async def _acontext_with_web_fallback(
+    retriever,
+    query: str,
+    web_query: str,
+    min_required_length: int,
+    max_results: int,
+    label: str = "",
+    empty_context: str = ""
+) -> str:
+    """_context_with_web_fallback의 비동기 버전"""
+    fallback = get_web_fallback()
+    started = time.monotonic()
+    web_task = None if _is_prefetched(retriever, query) else fallback.astart(web_query, max_results, started)
+
+    try:
+        docs = await retriever.aretrieve(query)
+    except BaseException:
+        if web_task is not None:
+            web_task.cancel()
+        raise
+
+    if _is_enough(docs, min_required_length):
+        fallback.acancel(web_task)
+        logger.info(f"✅ {label}RAG 검색 결과 사용")
+        return _join_docs(docs)
+
+    logger.warning(f"⚠️ {label}RAG 검색 결과 부족 → 웹 검색 결과 대기 중...")
+    web_results = await fallback.aresult(web_task, web_query, max_results, started)
+    return _combine_with_web(_join_docs(docs) if docs else empty_context, web_results)
 
-    return context
+
+def get_context_for_ingredients(retriever, dish_name: str) -> str:
+    """재료 추출을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
+    return _context_with_web_fallback(
+        retriever, ingredient_query(dish_name), f"{dish_name} 레시피 재료",
+        min_required_length=300, max_results=2,
+        label=f"'{dish_name}' ", empty_context="검색 결과 없음",
+    )
+
+
+def get_context_for_recommendation(retriever, dish_name: str) -> str:
+    """추천을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
+    query = recommendation_query(dish_name)
+    return _context_with_web_fallback(
+        retriever, query, query, min_required_length=500, max_results=3, label="대체재 추천: ",
+    )
+
+
+def get_context_for_summary(retriever, topic: str) -> str:
+    """요약을 위한 컨텍스트 검색 (RAG + 웹 검색 Fallback)"""
+    return _context_with_web_fallback(retriever, topic, topic, min_required_length=500, max_results=3)
 
 
 def get_context_for_quiz(retriever, topic: str) -> str:
@@ -106,3 +178,31 @@ def get_context_for_quiz(retriever, topic: str) -> str:
     docs = retriever.retrieve(topic)
     context = "\n\n".join([doc.page_content for doc in docs])
     return context
+
+
+# 비동기 컨텍스트 검색 함수들 (임베딩/웹 검색 대기 중 스레드를 점유하지 않음)
+async def aget_context_for_ingredients(retriever, dish_name: str) -> str:
+    """get_context_for_ingredients의 비동기 버전"""
+    return await _acontext_with_web_fallback(
+        retriever, ingredient_query(dish_name), f"{dish_name} 레시피 재료",
+        min_required_length=300, max_results=2,
+        label=f"'{dish_name}' ", empty_context="검색 결과 없음",
+    )
+
+
+async def aget_context_for_recommendation(retriever, dish_name: str) -> str:
+    """get_context_for_recommendation의 비동기 버전"""
+    query = recommendation_query(dish_name)
+    return await _acontext_with_web_fallback(
+        retriever, query, query, min_required_length=500, max_results=3, label="대체재 추천: ",
+    )
+
+
+async def aget_context_for_summary(retriever, topic: str) -> str:
+    """get_context_for_summary의 비동기 버전"""
+    return await _acontext_with_web_fallback(retriever, topic, topic, min_required_length=500, max_results=3)
+
+
+async def aget_context_for_quiz(retriever, topic: str) -> str:
+    """get_context_for_quiz의 비동기 버전"""
+    return _join_docs(await retriever.aretrieve(topic))
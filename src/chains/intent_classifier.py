@@ -2,9 +2,11 @@
 
 import logging
 from typing import Optional
+from langchain_core.caches import BaseCache
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
 from .common import get_llm
+from .local_intent_classifier import LocalIntentClassifier
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,9 @@ def create_intent_classifier(
     model: str = "gpt-4o-mini",
     temperature: float = 0.3,
     max_tokens: Optional[int] = None,
+    use_local: bool = True,
+    min_margin: float = 0.05,
+    cache: Optional[BaseCache] = None,
 ):
     """
     사용자 의도 분류 체인 생성
@@ -21,11 +26,14 @@ def create_intent_classifier(
         model: 사용할 모델명
         temperature: 응답의 창의성 (의도분류는 낮을수록 좋음)
         max_tokens: 최대 토큰 수
+        use_local: True면 로컬 분류기를 먼저 쓰고 확신도가 낮을 때만 LLM 호출
+        min_margin: 로컬 분류기의 최소 확신도 (1등-2등 중심 유사도 차이)
+        cache: LLM 응답 캐시 (같은 질문의 LLM 분류 결과 재사용)
 
     Returns:
-        의도 분류 체인
+        의도 분류 체인 ({"query": ...}를 받아 의도 문자열 반환)
     """
-    llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens)
+    llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens, cache=cache)
 
     intent_classification_prompt = ChatPromptTemplate.from_messages([
         ("system", """당신은 사용자 의도를 분류하는 전문가입니다.
@@ -47,4 +55,7 @@ def create_intent_classifier(
     intent_classifier = intent_classification_prompt | llm | StrOutputParser()
     logger.info(f"의도 분류 체인 생성 완료 (model={model}, temperature={temperature})")
 
+    if use_local:
+        logger.info("로컬 의도 분류기 사용 (확신도가 낮을 때만 LLM 호출)")
+        return LocalIntentClassifier(fallback=intent_classifier, min_margin=min_margin)
     return intent_classifier
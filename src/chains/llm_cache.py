@@ -0,0 +1,297 @@
+"""
+LLM 응답 캐시 모듈
+(모델 설정 문자열, 렌더링된 프롬프트) 해시를 키로 LLM 응답을 SQLite에 저장하여
+의도 분류, 요리명 추출, 요약 필요성 판단처럼 낮은 온도의 거의 결정적인 호출을 다시 하지 않습니다.
+
+모델 설정 문자열(llm_string)에는 모델명, temperature, 바인딩된 도구(구조화 출력) 등이 포함되므로
+설정이 바뀌면 자동으로 다른 키가 됩니다. 체인별로 get_llm(..., cache=cache)로 선택해서 사용합니다.
+
+워밍업 (쿼리 로그로 캐시 미리 채우기):
+    python -m src.chains.llm_cache queries.txt --cache data/cache/llm_cache.sqlite
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 파일 경로
+DEFAULT_LLM_CACHE_PATH = "data/cache/llm_cache.sqlite"
+
+# 워밍업할 수 있는 체인
+WARMUP_CHAINS = ("intent", "analysis", "dish", "decision")
+
+
+def _dump_generations(generations: RETURN_VAL_TYPE) -> str:
+    """Generation 리스트를 JSON 문자열로 직렬화합니다. (채팅 응답은 메시지 전체를 보존)"""
+    rows = []
+    for generation in generations:
+        if isinstance(generation, ChatGeneration):
+            rows.append({"message": message_to_dict(generation.message), "info": generation.generation_info})
+        else:
+            rows.append({"text": generation.text, "info": generation.generation_info})
+    return json.dumps(rows, ensure_ascii=False)
+
+
+def _load_generations(serialized: str) -> RETURN_VAL_TYPE:
+    """_dump_generations로 직렬화한 문자열을 새 Generation 객체로 복원합니다."""
+    generations = []
+    for row in json.loads(serialized):
+        if "message" in row:
+            message = messages_from_dict([row["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=row["info"]))
+        else:
+            generations.append(Generation(text=row["text"], generation_info=row["info"]))
+    return generations
+
+
+class LRUSQLiteLLMCache(BaseCache):
+    """SQLite 기반 LLM 응답 캐시 (LRU 크기 제한 + 메모리 앞단 캐시)"""
+
+    def __init__(
+        self,
+        cache_path: str = DEFAULT_LLM_CACHE_PATH,
+        max_entries: int = 50_000,
+        max_memory_entries: int = 1024
+    ):
+        """
+        Args:
+            cache_path: SQLite 파일 경로
+            max_entries: 최대 저장 응답 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+            max_memory_entries: 메모리에 보관할 최근 응답 수 (적중 시 SQLite 조회 생략)
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_memory_entries = max_memory_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                generations TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used)"
+        )
+        self._conn.commit()
+
+        # 직렬화된 응답을 보관 (반환할 때마다 새 객체로 복원하여 호출 간 공유를 피함)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # 메모리에서 적중한 키 (다음 쓰기 때 last_used를 한 번에 갱신)
+        self._touched: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """(모델 설정 문자열, 렌더링된 프롬프트) 해시 키를 만듭니다."""
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def size(self) -> int:
+        """저장된 응답 수 (__len__을 정의하면 빈 캐시가 False로 평가되어 LangChain이 캐시를 건너뜀)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def _remember(self, key: str, serialized: str):
+        """메모리 앞단 캐시에 저장합니다. (lock 안에서 호출)"""
+        self._memory[key] = serialized
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        캐시된 응답을 찾습니다.
+
+        Args:
+            prompt: 렌더링된 프롬프트 (직렬화된 메시지)
+            llm_string: 모델 설정 문자열
+
+        Returns:
+            Generation 리스트 (없으면 None)
+        """
+        key = self.make_key(prompt, llm_string)
+        with self._lock:
+            serialized = self._memory.get(key)
+            if serialized is not None:
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+            else:
+                row = self._conn.execute(
+                    "SELECT generations FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                serialized = row[0]
+                self._remember(key, serialized)
+                self._conn.execute(
+                    "UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+            self.hits += 1
+        return _load_generations(serialized)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        응답을 저장하고 크기 제한을 넘으면 LRU 순으로 삭제합니다.
+
+        Args:
+            prompt: 렌더링된 프롬프트 (직렬화된 메시지)
+            llm_string: 모델 설정 문자열
+            return_val: Generation 리스트
+        """
+        key = self.make_key(prompt, llm_string)
+        serialized = _dump_generations(return_val)
+        with self._lock:
+            self._remember(key, serialized)
+            touched, self._touched = self._touched, {}
+            if touched:
+                self._conn.executemany(
+                    "UPDATE llm_responses SET last_used = ? WHERE key = ?",
+                    [(used, touched_key) for touched_key, used in touched.items()],
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, generations, last_used) VALUES (?, ?, ?)",
+                (key, serialized, time.time()),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._memory.clear()
+            self._touched.clear()
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            hits, misses, hit_rate, entries를 담은 딕셔너리
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": self.size(),
+        }
+
+
+def read_query_log(path: str) -> List[str]:
+    """
+    쿼리 로그를 읽습니다. (한 줄에 쿼리 하나, 또는 {"query": ...} JSON 한 줄)
+
+    Args:
+        path: 쿼리 로그 파일 경로
+
+    Returns:
+        중복을 제거한 쿼리 리스트 (등장 순서 유지)
+    """
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = str(json.loads(line).get("query", "")).strip()
+            if line:
+                queries.append(line)
+    return list(dict.fromkeys(queries))
+
+
+def warm_up(
+    cache: LRUSQLiteLLMCache,
+    queries: Iterable[str],
+    model: str = "gpt-4o-mini",
+    chains: Sequence[str] = WARMUP_CHAINS,
+    max_concurrency: int = 4
+) -> Dict[str, int]:
+    """
+    쿼리 로그로 결정적인 체인들의 LLM 응답을 미리 캐시에 채웁니다.
+    워크플로우와 같은 체인 생성 함수를 사용하므로 프롬프트가 같아 실행 시 그대로 적중합니다.
+
+    Args:
+        cache: LLM 응답 캐시
+        queries: 사용자 쿼리
+        model: 사용할 모델명 (워크플로우 llm_config의 model과 같아야 적중)
+        chains: 워밍업할 체인 ('intent', 'analysis', 'dish', 'decision')
+        max_concurrency: 동시에 호출할 최대 수
+
+    Returns:
+        체인별 호출한 쿼리 수
+    """
+    from .intent_classifier import create_intent_classifier
+    from .query_analyzer import create_dish_extractor, create_query_analyzer, create_summary_decision_chain
+
+    factories = {
+        "intent": lambda: create_intent_classifier(model=model, use_local=False, cache=cache),
+        "analysis": lambda: create_query_analyzer(model=model, cache=cache),
+        "dish": lambda: create_dish_extractor(model=model, cache=cache),
+        "decision": lambda: create_summary_decision_chain(model=model, cache=cache),
+    }
+    unknown = set(chains) - set(factories)
+    if unknown:
+        raise ValueError(f"Unknown warm-up chains: {sorted(unknown)} (choose from {WARMUP_CHAINS})")
+
+    inputs = [{"query": query} for query in dict.fromkeys(queries)]
+    report = {}
+    for name in chains:
+        logger.info(f"🔥 LLM 캐시 워밍업: {name} ({len(inputs)}개 쿼리)")
+        factories[name]().batch(inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        report[name] = len(inputs)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="쿼리 로그로 LLM 응답 캐시를 미리 채웁니다.")
+    parser.add_argument("query_log", help="쿼리 로그 파일 (한 줄에 쿼리 하나 또는 JSON)")
+    parser.add_argument("--cache", default=DEFAULT_LLM_CACHE_PATH, help="SQLite 캐시 파일 경로")
+    parser.add_argument("--model", default="gpt-4o-mini", help="모델명")
+    parser.add_argument("--chains", nargs="+", default=list(WARMUP_CHAINS), choices=WARMUP_CHAINS)
+    args = parser.parse_args()
+
+    llm_cache = LRUSQLiteLLMCache(args.cache)
+    report = warm_up(llm_cache, read_query_log(args.query_log), model=args.model, chains=args.chains)
+    print(f"워밍업 완료: {report}")
+    print(f"캐시 통계: {llm_cache.stats()}")
@@ -0,0 +1,308 @@
+"""
+로컬 의도 분류 모듈
+키워드 규칙과 글자 bigram 최근접 중심(nearest centroid)으로 의도를 1ms 안에 분류하고,
+확신도가 낮을 때만 LLM 의도 분류 체인을 호출합니다.
+"""
+
+import time
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.rag.sparse_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+INTENT_LABELS = ("recommendation", "summary", "quiz")
+
+# 하나의 의도에만 걸리면 바로 그 의도로 판단하는 키워드
+INTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "recommendation": ("대체", "대신", "바꿀", "바꿔", "바꾸", "추천", "저칼륨으로", "저인으로"),
+    "summary": ("요약", "정리", "주의사항"),
+    "quiz": ("퀴즈", "문제", "출제", "시험", "테스트", "ox"),
+}
+
+# 최근접 중심 계산에 쓰는 의도별 예시 질문
+SEED_EXAMPLES: Dict[str, Tuple[str, ...]] = {
+    "recommendation": (
+        "김치찌개 만들 때 뭘 대체할 수 있을까?",
+        "불고기에서 저칼륨 재료 추천해줘",
+        "김치찌개 저칼륨 대체재",
+        "된장찌개에 감자 대신 넣을 수 있는 재료는?",
+        "미역국을 저칼륨으로 만들려면 어떤 재료를 바꿔야 해?",
+        "잡채 재료 중에 칼륨 높은 걸 바꾸고 싶어",
+        "떡볶이 만들 때 저인 재료로 바꿀 수 있어?",
+        "시금치나물 대신 먹을 수 있는 나물은?",
+    ),
+    "summary": (
+        "저염식 조리법 알려줘",
+        "신장 질환자 식사 주의사항은?",
+        "혈액투석 환자의 식사 관리 주의사항 요약해줘",
+        "칼륨을 줄이는 조리 방법은?",
+        "투석 환자가 피해야 할 음식은 무엇인가요?",
+        "인 섭취를 줄이는 방법 정리해줘",
+        "나트륨 줄이는 식습관 알려줘",
+        "채소 데치기로 칼륨 빼는 법",
+    ),
+    "quiz": (
+        "영양 관리 퀴즈 만들어줘",
+        "문제 출제해줘",
+        "저염식에 대한 퀴즈 3개 만들어줘",
+        "칼륨 관련 OX 문제 내줘",
+        "투석 식단 시험 문제 만들어줘",
+        "신장병 식사 관리 퀴즈 풀고 싶어",
+    ),
+}
+
+# 로컬 분류기 평가용 라벨 데이터 (evaluate_agreement 기본값)
+# SEED_EXAMPLES로 중심을 만들므로 평가가 학습 데이터 재현이 되지 않도록 예시와 겹치지 않는 질문만 둠
+LABELED_QUERIES: Tuple[Tuple[str, str], ...] = (
+    ("카레라이스에 감자 대신 뭘 넣으면 좋을까?", "recommendation"),
+    ("갈비찜 저칼륨 대체 재료 추천", "recommendation"),
+    ("콩국수 먹고 싶은데 콩 대신 쓸 수 있는 거 있어?", "recommendation"),
+    ("김치찌개 재료 알려줘", "recommendation"),
+    ("비빔밥에 들어가는 시금치를 다른 채소로 바꿔줘", "recommendation"),
+    ("부대찌개를 투석 환자용으로 만들고 싶어", "recommendation"),
+    ("감자조림 대신 먹을 반찬 추천해줘", "recommendation"),
+    ("순두부찌개 저인 재료로 만드는 법", "recommendation"),
+    ("저칼륨 식품은 무엇인가요?", "summary"),
+    ("인이 많은 가공식품 주의사항 알려줘", "summary"),
+    ("투석 중 단백질 섭취 기준 설명해줘", "summary"),
+    ("채소의 칼륨을 줄이는 조리법은?", "summary"),
+    ("복막투석 환자 수분 섭취 요령 정리", "summary"),
+    ("외식할 때 나트륨 줄이는 방법은?", "summary"),
+    ("과일 중에 칼륨이 적은 건 뭐가 있어?", "summary"),
+    ("인 결합제는 언제 먹어야 하나요?", "summary"),
+    ("나트륨 섭취 관련 문제 5개 출제해줘", "quiz"),
+    ("신장 식단 OX 퀴즈", "quiz"),
+    ("칼륨에 대해 시험 문제 내줘", "quiz"),
+    ("인 섭취 관리 퀴즈 5문제", "quiz"),
+    ("투석 환자 식이 지식 테스트해줘", "quiz"),
+    ("저칼륨 식단 관련 객관식 문제 만들어줘", "quiz"),
+)
+
+
+@dataclass
+class IntentPrediction:
+    """의도 분류 결과"""
+    label: str
+    confidence: float
+    source: str  # 'keyword', 'centroid', 'llm'
+
+
+class LocalIntentClassifier:
+    """키워드 규칙 + bigram 최근접 중심 의도 분류기 (불확실하면 LLM fallback)"""
+
+    def __init__(
+        self,
+        fallback=None,
+        examples: Optional[Dict[str, Sequence[str]]] = None,
+        keywords: Optional[Dict[str, Sequence[str]]] = None,
+        min_similarity: float = 0.15,
+        min_margin: float = 0.05,
+        n_features: int = 4096
+    ):
+        """
+        Args:
+            fallback: 확신도가 낮을 때 호출할 LLM 의도 분류 체인 (None이면 로컬 결과 사용)
+            examples: 의도별 예시 질문 (None이면 SEED_EXAMPLES)
+            keywords: 의도별 키워드 (None이면 INTENT_KEYWORDS)
+            min_similarity: 최근접 중심 유사도가 이 값보다 낮으면 LLM 호출
+            min_margin: 1등과 2등 중심 유사도 차이가 이 값보다 작으면 LLM 호출
+            n_features: bigram 해시 특징 차원
+        """
+        self.fallback = fallback
+        self.keywords = keywords or INTENT_KEYWORDS
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.n_features = n_features
+
+        self.labels: List[str] = list(INTENT_LABELS)
+        self._examples: Dict[str, List[str]] = {label: [] for label in self.labels}
+        self.centroids = np.zeros((len(self.labels), n_features), dtype=np.float32)
+        self.fit(examples or SEED_EXAMPLES)
+
+        self.local_count = 0
+        self.fallback_count = 0
+
+    def _features(self, text: str) -> np.ndarray:
+        """bigram/단어 토큰을 해시 특징 벡터(L2 정규화)로 변환합니다."""
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for token in tokenize(text):
+            vector[zlib.crc32(token.encode("utf-8")) % self.n_features] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def fit(self, examples: Dict[str, Iterable[str]]) -> "LocalIntentClassifier":
+        """
+        예시 질문을 추가하고 의도별 중심 벡터를 다시 계산합니다.
+        (로그에 쌓인 LLM 분류 결과를 넣어 점진적으로 학습할 수 있음)
+
+        Args:
+            examples: 의도 → 질문 리스트
+
+        Returns:
+            self
+        """
+        for label, queries in examples.items():
+            if label not in self._examples:
+                raise ValueError(f"Unknown intent: {label} (choose from {INTENT_LABELS})")
+            self._examples[label].extend(queries)
+
+        for i, label in enumerate(self.labels):
+            if self._examples[label]:
+                centroid = np.mean([self._features(q) for q in self._examples[label]], axis=0)
+                self.centroids[i] = centroid / max(float(np.linalg.norm(centroid)), 1e-12)
+        return self
+
+    def _keyword_label(self, query: str) -> Optional[str]:
+        """키워드가 정확히 하나의 의도에만 걸리면 그 의도를 반환합니다."""
+        text = query.lower()
+        matched = [
+            label for label in self.labels
+            if any(keyword in text for keyword in self.keywords.get(label, ()))
+        ]
+        return matched[0] if len(matched) == 1 else None
+
+    def predict_local(self, query: str) -> IntentPrediction:
+        """
+        LLM 없이 의도를 분류합니다.
+        키워드 의도는 최근접 중심의 1등 의도와 같을 때만 확정하고, 다르면 확신도 0으로 반환합니다.
+        (예: "김치찌개 재료 알려줘"처럼 범용 표현이 다른 의도의 키워드에 걸리는 경우)
+
+        Args:
+            query: 사용자 질문
+
+        Returns:
+            IntentPrediction (confidence: 키워드 1.0, 중심 방식은 1등-2등 유사도 차이)
+        """
+        keyword_label = self._keyword_label(query)
+
+        similarities = self.centroids @ self._features(query)
+        order = np.argsort(-similarities)
+        best, second = similarities[order[0]], similarities[order[1]]
+        label = self.labels[order[0]]
+        if keyword_label is not None:
+            if keyword_label == label:
+                return IntentPrediction(label, 1.0, "keyword")
+            return IntentPrediction(keyword_label, 0.0, "keyword")
+
+        confidence = float(best - second) if best >= self.min_similarity else 0.0
+        return IntentPrediction(label, confidence, "centroid")
+
+    def predict(self, query: str) -> IntentPrediction:
+        """
+        의도를 분류합니다. 로컬 확신도가 낮으면 LLM fallback을 호출합니다.
+
+        Args:
+            query: 사용자 질문
+
+        Returns:
+            IntentPrediction
+        """
+        prediction = self.predict_local(query)
+        if prediction.confidence >= self.min_margin or self.fallback is None:
+            self.local_count += 1
+            return prediction
+
+        self.fallback_count += 1
+        logger.info(f"의도 분류 확신도 낮음 ({prediction.confidence:.3f}) → LLM 분류")
+        label = self.fallback.invoke({"query": query}).strip().lower()
+        return IntentPrediction(label, 1.0, "llm")
+
+    async def apredict(self, query: str) -> IntentPrediction:
+        """predict의 비동기 버전 (LLM fallback을 ainvoke로 호출)"""
+        prediction = self.predict_local(query)
+        if prediction.confidence >= self.min_margin or self.fallback is None:
+            self.local_count += 1
+            return prediction
+
+        self.fallback_count += 1
+        logger.info(f"의도 분류 확신도 낮음 ({prediction.confidence:.3f}) → LLM 분류")
+        label = (await self.fallback.ainvoke({"query": query})).strip().lower()
+        return IntentPrediction(label, 1.0, "llm")
+
+    def invoke(self, inputs: dict, config=None) -> str:
+        """LLM 의도 분류 체인과 같은 형태로 호출합니다. ({"query": ...} → 의도 문자열)"""
+        return self.predict(inputs["query"]).label
+
+    async def ainvoke(self, inputs: dict, config=None) -> str:
+        """invoke의 비동기 버전"""
+        return (await self.apredict(inputs["query"])).label
+
+    def stats(self) -> Dict[str, float]:
+        """로컬 처리/LLM fallback 횟수를 반환합니다."""
+        total = self.local_count + self.fallback_count
+        return {
+            "local": self.local_count,
+            "fallback": self.fallback_count,
+            "fallback_rate": self.fallback_count / total if total else 0.0,
+        }
+
+
+def evaluate_agreement(
+    classifier: LocalIntentClassifier,
+    labeled_queries: Sequence[Tuple[str, str]] = LABELED_QUERIES,
+    llm_classifier=None
+) -> Dict[str, float]:
+    """
+    라벨 데이터로 로컬 분류기의 정확도와 LLM 분류 체인과의 일치율을 측정합니다.
+
+    Args:
+        classifier: 로컬 의도 분류기
+        labeled_queries: (질문, 정답 의도) 리스트
+        llm_classifier: 비교할 LLM 의도 분류 체인 (None이면 일치율 생략)
+
+    Returns:
+        {"accuracy", "local_accuracy", "llm_agreement", "fallback_rate", "p50_local_ms"}
+
+    Raises:
+        ValueError: 평가 질문이 분류기의 예시 질문(학습 데이터)과 겹칠 때
+    """
+    seen = {query for queries in classifier._examples.values() for query in queries}
+    overlap = [query for query, _ in labeled_queries if query in seen]
+    if overlap:
+        raise ValueError(f"Labeled queries overlap the classifier examples: {overlap}")
+
+    correct = local_correct = agree = fallbacks = 0
+    latencies = []
+    for query, label in labeled_queries:
+        started = time.perf_counter()
+        local = classifier.predict_local(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        local_correct += local.label == label
+
+        needs_fallback = local.confidence < classifier.min_margin and classifier.fallback is not None
+        fallbacks += needs_fallback
+        prediction = classifier.predict(query) if needs_fallback else local
+        correct += prediction.label == label
+
+        if llm_classifier is not None:
+            llm_label = llm_classifier.invoke({"query": query}).strip().lower()
+            agree += prediction.label == llm_label
+
+    n = len(labeled_queries)
+    report = {
+        "accuracy": correct / n,
+        "local_accuracy": local_correct / n,
+        "fallback_rate": fallbacks / n,
+        "p50_local_ms": float(np.percentile(latencies, 50)),
+    }
+    if llm_classifier is not None:
+        report["llm_agreement"] = agree / n
+    return report
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from .intent_classifier import create_intent_classifier
+
+    load_dotenv()
+
+    llm_classifier = create_intent_classifier(use_local=False)
+    classifier = LocalIntentClassifier(fallback=llm_classifier)
+    for name, value in evaluate_agreement(classifier, llm_classifier=llm_classifier).items():
+        print(f"{name}: {value:.3f}")
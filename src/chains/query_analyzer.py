@@ -0,0 +1,127 @@
+"""쿼리 분석 체인 모듈 - 의도, 요리명, 요약 필요 여부 추출"""
+
+import logging
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+from langchain_core.caches import BaseCache
+from langchain.prompts import ChatPromptTemplate
+from langchain.schema.output_parser import StrOutputParser
+from .common import get_llm
+
+logger = logging.getLogger(__name__)
+
+
+class QueryAnalysis(BaseModel):
+    """사용자 쿼리 분석 결과"""
+
+    intent: Literal["recommendation", "summary", "quiz"] = Field(
+        description="recommendation: 요리 재료 대체재 추천 요청, summary: 조리법/주의사항 요약 또는 정보 제공 요청, quiz: 문제 출제 요청"
+    )
+    dish_name: str = Field(
+        default="",
+        description="질문에 나온 요리명 (한 단어 또는 짧은 구문, 없으면 빈 문자열)"
+    )
+    need_summary: bool = Field(
+        default=False,
+        description="추천 후 조리법과 주의사항 요약이 필요한지 여부 (조리법, 주의사항, 팁 등을 요청한 경우 true)"
+    )
+
+
+def create_query_analyzer(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.0,
+    max_tokens: Optional[int] = None,
+    cache: Optional[BaseCache] = None,
+):
+    """
+    쿼리 분석 체인 생성 (의도 분류 + 요리명 추출 + 요약 필요성 판단을 한 번에 수행)
+
+    Args:
+        model: 사용할 모델명
+        temperature: 응답의 창의성 (분석은 0 권장)
+        max_tokens: 최대 토큰 수
+        cache: LLM 응답 캐시
+
+    Returns:
+        쿼리 분석 체인 ({"query": ...}를 받아 QueryAnalysis 반환)
+    """
+    llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens, cache=cache)
+
+    query_analysis_prompt = ChatPromptTemplate.from_messages([
+        ("system", """당신은 신장 질환 환자용 식단 도우미의 사용자 질문을 분석하는 전문가입니다.
+질문을 분석하여 다음 세 가지를 판단하세요.
+
+1. intent (의도)
+   - recommendation: 요리 재료 대체재 추천 요청 (예: "김치찌개 만들 때 뭘 대체할 수 있을까?")
+   - summary: 조리법, 주의사항 요약 또는 정보 제공 요청 (예: "신장 질환자 식사 주의사항은?")
+   - quiz: 문제 출제 요청 (예: "영양 관리 퀴즈 만들어줘")
+
+2. dish_name (요리명)
+   - 질문에 나온 요리명만 짧게 추출하세요. 요리명이 없으면 빈 문자열로 두세요.
+
+3. need_summary (요약 필요 여부)
+   - "만드는 법", "조리법", "어떻게", "방법", "주의", "팁", "알려줄래" 등 조리법/주의사항을 요청하면 true
+   - "추천", "대체", "뭐", "뭘", "가능한", "할 수" 등 단순 재료 대체 추천만 원하면 false"""),
+        ("user", "{query}")
+    ])
+
+    query_analyzer = query_analysis_prompt | llm.with_structured_output(QueryAnalysis)
+    logger.info(f"쿼리 분석 체인 생성 완료 (model={model}, temperature={temperature})")
+
+    return query_analyzer
+
+
+def create_dish_extractor(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3,
+    cache: Optional[BaseCache] = None,
+):
+    """
+    요리명 추출 체인 생성
+
+    Args:
+        model: 사용할 모델명
+        temperature: 응답의 창의성
+        cache: LLM 응답 캐시
+
+    Returns:
+        요리명 추출 체인 ({"query": ...}를 받아 요리명 문자열 반환)
+    """
+    llm = get_llm(model=model, temperature=temperature, cache=cache)
+    extract_dish_prompt = ChatPromptTemplate.from_messages([
+        ("system", "사용자의 질문에서 요리명만 추출하세요. 한 단어 또는 짧은 구문만 반환하세요."),
+        ("user", "{query}")
+    ])
+    return extract_dish_prompt | llm | StrOutputParser()
+
+
+def create_summary_decision_chain(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3,
+    cache: Optional[BaseCache] = None,
+):
+    """
+    요약 필요성 판단 체인 생성
+
+    Args:
+        model: 사용할 모델명
+        temperature: 응답의 창의성
+        cache: LLM 응답 캐시
+
+    Returns:
+        요약 필요성 판단 체인 ({"query": ...}를 받아 'yes'/'no' 반환)
+    """
+    llm = get_llm(model=model, temperature=temperature, cache=cache)
+    summary_decision_prompt = ChatPromptTemplate.from_messages([
+        ("system", """사용자 쿼리를 분석하여 추천 후 조리법과 주의사항 요약이 필요한지 판단하세요.
+
+다음 중 하나만 반환하세요:
+- "yes": 요약이 필요한 경우 (사용자가 조리법, 주의사항, 팁 등을 요청한 경우)
+- "no": 요약이 불필요한 경우 (단순 재료 대체 추천만 원하는 경우)
+
+판단 기준:
+- "만드는 법", "조리법", "어떻게", "방법", "주의", "팁", "알려줄래" 등의 키워드 포함 → yes
+- "추천", "대체", "뭐", "뭘", "뭐가", "가능한", "할 수" 등만 포함 → no"""),
+        ("user", "{query}")
+    ])
+    return summary_decision_prompt | llm | StrOutputParser()
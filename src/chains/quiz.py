@@ -4,7 +4,8 @@ import logging
 from typing import Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from .common import get_llm, get_context_for_quiz
+from langchain.schema.runnable import RunnableLambda
+from .common import get_llm, get_context_for_quiz, aget_context_for_quiz
 
 logger = logging.getLogger(__name__)
 
@@ -19,13 +20,13 @@ def create_quiz_chain(
     문제 생성 체인 생성 (주관식/객관식 문제 3개 생성)
 
     Args:
-        retriever: RAG 리트리버
+        retriever: RAG 리트리버 (입력에 "retriever"가 있으면 그 요청에서는 입력의 리트리버 사용)
         model: 사용할 모델명
         temperature: 응답의 창의성
         max_tokens: 최대 토큰 수
 
     Returns:
-        문제 생성 체인
+        문제 생성 체인 (invoke/ainvoke 지원 Runnable)
     """
     llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens)
 
@@ -70,12 +71,17 @@ def create_quiz_chain(
     def get_quiz_context(inputs):
         """문제 생성을 위한 컨텍스트 검색"""
         topic = inputs["topic"]
-        context = get_context_for_quiz(retriever, topic)
+        context = get_context_for_quiz(inputs.get("retriever") or retriever, topic)
+        return {**inputs, "context": context}
+
+    async def aget_quiz_context(inputs):
+        """문제 생성을 위한 컨텍스트 검색 (비동기)"""
+        context = await aget_context_for_quiz(inputs.get("retriever") or retriever, inputs["topic"])
         return {**inputs, "context": context}
 
     # 문제 생성 체인 구성
     quiz_chain = (
-        get_quiz_context
+        RunnableLambda(get_quiz_context, afunc=aget_quiz_context)
         | quiz_prompt
         | llm
         | StrOutputParser()
@@ -88,5 +94,12 @@ def create_quiz_chain(
         logger.info("✅ 문제 생성 체인 완료")
         return result
 
+    async def arun_quiz(inputs):
+        """문제 생성 프로세스 실행 (비동기)"""
+        logger.info(f"❓ 문제 생성 체인 실행 중... (주제: {inputs['topic']})")
+        result = await quiz_chain.ainvoke(inputs)
+        logger.info("✅ 문제 생성 체인 완료")
+        return result
+
     logger.info(f"문제 생성 체인 생성 완료 (model={model}, temperature={temperature})")
-    return run_quiz
+    return RunnableLambda(run_quiz, afunc=arun_quiz)
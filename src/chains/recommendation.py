@@ -1,11 +1,20 @@
 """추천 체인 모듈"""
 
+import asyncio
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from langchain.schema.runnable import RunnablePassthrough
-from .common import get_llm, get_context_for_ingredients, get_context_for_recommendation
+from langchain.schema.runnable import RunnableLambda, RunnablePassthrough
+from src.nutrition.scoring import score_dishes
+from .common import (
+    get_llm,
+    get_context_for_ingredients,
+    get_context_for_recommendation,
+    aget_context_for_ingredients,
+    aget_context_for_recommendation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,18 +32,31 @@ def create_recommendation_chain(
     model: str = "gpt-4o-mini",
     temperature: float = 0.7,
     max_tokens: Optional[int] = None,
+    nutrient_engine=None,
+    recipe_table=None,
+    substitute_finder=None,
+    stage: str = "투석 전",
+    weight_kg: float = 60.0,
 ):
     """
     추천 체인 생성 (재료 분석 + 대체재 추천)
 
     Args:
-        retriever: RAG 리트리버
+        retriever: RAG 리트리버 (입력에 "retriever"가 있으면 그 요청에서는 입력의 리트리버 사용)
         model: 사용할 모델명
         temperature: 응답의 창의성
         max_tokens: 최대 토큰 수
+        nutrient_engine: 로컬 영양성분 엔진 (src.nutrition.NutrientEngine)
+            있으면 LLM은 재료명과 분량만 나열하고, 영양성분 수치와 신호등 판정은 로컬에서 계산해 프롬프트에 넣음
+        recipe_table: 미리 계산한 레시피 영양성분 테이블 (src.nutrition.RecipeNutrientTable)
+            요리명이 테이블에 있으면 재료 추출(컨텍스트 검색 + LLM 호출)을 생략하고 테이블의 재료/영양성분 사용
+        substitute_finder: 식품성분표 기반 대체재 탐색기 (src.nutrition.SubstituteFinder)
+            있으면 영양성분을 로컬에서 계산한 재료의 대체재 후보 순위를 프롬프트에 넣고 LLM은 설명만 작성
+        stage: 신호등 판정 기준 투석 단계 ('투석 전', '투석 중', '이식 후', 입력의 "stage"가 우선)
+        weight_kg: 신호등 판정 기준 체중 (kg, 입력의 "weight_kg"가 우선)
 
     Returns:
-        추천 체인
+        추천 체인 (invoke/ainvoke 지원 Runnable)
     """
     llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens)
 
@@ -51,20 +73,106 @@ def create_recommendation_chain(
         ("user", "요리명: {dish_name}")
     ])
 
+    # 1단계: 재료 추출 프롬프트 (영양성분 엔진 사용 시 - 수치는 로컬에서 계산하므로 재료명과 분량만 요청)
+    ingredient_list_prompt = ChatPromptTemplate.from_messages([
+        ("system", """당신은 요리 전문가입니다. 주어진 요리명에 대해 일반적으로 사용되는 재료들을 1인분 기준으로 나열해주세요.
+
+참고 자료:
+{context}
+
+한 줄에 재료 하나씩 "재료명 분량" 형식으로만 답하세요. (예: 두부 150g, 대파 1/2대, 간장 1큰술)
+번호, 설명, 영양성분은 쓰지 마세요."""),
+        ("user", "요리명: {dish_name}")
+    ])
+
     # 1단계: 컨텍스트 검색 함수 (RAG + 웹 검색 Fallback)
-    def get_ingredient_context(dish_name_input: dict):
+    def get_ingredient_context(dish_name_input: dict) -> str:
         """재료 추출을 위한 컨텍스트 검색"""
-        dish_name = dish_name_input["dish_name"]
-        return {"dish_name": dish_name, "context": get_context_for_ingredients(retriever, dish_name)}
+        return get_context_for_ingredients(
+            dish_name_input.get("retriever") or retriever, dish_name_input["dish_name"]
+        )
+
+    async def aget_ingredient_context(dish_name_input: dict) -> str:
+        """재료 추출을 위한 컨텍스트 검색 (비동기)"""
+        return await aget_context_for_ingredients(
+            dish_name_input.get("retriever") or retriever, dish_name_input["dish_name"]
+        )
 
     # 2단계: Runnable 체인 정의
     ingredient_chain = (
-        RunnablePassthrough.assign(context=get_ingredient_context)
-        | ingredient_extraction_prompt
+        RunnablePassthrough.assign(context=RunnableLambda(get_ingredient_context, afunc=aget_ingredient_context))
+        | (ingredient_list_prompt if nutrient_engine is not None else ingredient_extraction_prompt)
         | llm
         | StrOutputParser()
     )
 
+    def split_ingredient_lines(text: str) -> List[str]:
+        """LLM이 나열한 재료 목록을 줄 단위 재료 문자열로 나눕니다. (번호/글머리 기호 제거)"""
+        lines = []
+        for line in text.splitlines():
+            line = line.strip().lstrip("-*•·").strip()
+            line = line.split(". ", 1)[1] if line[:1].isdigit() and ". " in line[:4] else line
+            if line:
+                lines.append(line)
+        return lines
+
+    def format_local_nutrients(ingredient_lines: str, amounts, inputs: dict, names, food_rows, grams) -> str:
+        """로컬에서 계산한 재료별 영양성분에 합계, 신호등 판정, 대체재 후보를 붙입니다."""
+        active_stage = inputs.get("stage") or stage
+        active_weight = inputs.get("weight_kg") or weight_kg
+        score = score_dishes(amounts, stage=active_stage, weight_kg=active_weight)
+        sections = [
+            ingredient_lines,
+            f"- 합계 및 신호등 ({score.stage}, 체중 {active_weight:g}kg 1일 권장량 대비): {score.format()}",
+        ]
+        substitutes = (
+            substitute_finder.format_for_ingredients(names, food_rows, grams)
+            if substitute_finder is not None else None
+        )
+        if substitutes:
+            sections += [
+                "",
+                "대체재 후보 (식품성분표 기준, 같은 식품군에서 에너지·단백질이 비슷하고 칼륨·인이 낮은 순, 같은 분량):",
+                substitutes,
+                "(추천 대체재는 위 후보에서 순서대로 고르고, 영양성분과 신호등은 식품성분표로 계산한 값이므로 "
+                "다시 추정하지 말고 그대로 사용하세요.)",
+            ]
+        else:
+            sections.append("(위 영양성분과 신호등은 식품성분표로 계산한 값이므로 다시 추정하지 말고 그대로 사용하세요.)")
+        return "\n".join(sections)
+
+    def with_local_nutrients(ingredients: str, inputs: dict) -> str:
+        """재료 목록에 식품성분표 기반 영양성분 수치와 신호등 판정을 붙입니다. (엔진이 없으면 그대로 반환)"""
+        if nutrient_engine is None:
+            return ingredients
+        texts = split_ingredient_lines(ingredients)
+        resolved, amounts = nutrient_engine.resolve_many(texts)
+        matched = sum(item is not None for item in resolved)
+        logger.info(f"🧮 로컬 영양성분 계산: {matched}/{len(texts)}개 재료 대응")
+        return format_local_nutrients(
+            nutrient_engine.format_ingredients(texts, resolved), amounts, inputs,
+            names=[item.name if item is not None else text for text, item in zip(texts, resolved)],
+            food_rows=[item.food_index if item is not None else -1 for item in resolved],
+            grams=[item.grams if item is not None else 0.0 for item in resolved],
+        )
+
+    def known_recipe_ingredients(dish_name: str, inputs: dict) -> Optional[str]:
+        """레시피 테이블에 있는 요리면 1인분 재료/영양성분을 반환합니다. (없으면 None)"""
+        recipe = recipe_table.lookup(dish_name) if recipe_table is not None else None
+        if recipe is None:
+            return None
+        logger.info(f"📒 레시피 테이블 적중: {recipe.dish_name} (재료 {len(recipe.names)}개, 재료 추출 LLM 호출 생략)")
+        matches = [
+            substitute_finder.engine.find(food_name) if substitute_finder is not None and food_name else None
+            for food_name in recipe.food_names
+        ]
+        return format_local_nutrients(
+            recipe.format(), recipe.amounts, inputs,
+            names=recipe.names,
+            food_rows=[match.index if match is not None else -1 for match in matches],
+            grams=recipe.grams,
+        )
+
     # 2단계: RAG 기반 대체재 추천 체인
     recommendation_prompt = ChatPromptTemplate.from_messages([
         ("system", f"""당신은 신장 질환 환자를 위한 영양 전문가입니다.
@@ -88,32 +196,71 @@ def create_recommendation_chain(
 추천하는 대체제의 재료명, 단백질, 나트륨, 칼륨, 인과 칼로리들을 나열하되, 화살표로 대체된 항목을 표시합니다.""")
     ])
 
-    def get_recommendation_context(inputs):
-        """추천을 위한 컨텍스트 검색"""
-        dish_name = inputs['dish_name']
-        context = get_context_for_recommendation(retriever, dish_name)
-        return {**inputs, "context": context}
-
     # 2단계: 최종 추천 체인
     recommendation_chain = recommendation_prompt | llm | StrOutputParser()
 
+    # 추천 컨텍스트 검색은 요리명에만 의존하므로 재료 추출과 동시에 실행
+    context_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="recommendation-context")
+
     def run_full_recommendation(inputs):
-        """전체 추천 프로세스 실행"""
-        logger.info(f"🍳 추천 체인 실행 중... (요리: {inputs['dish_name']})")
+        """
+        전체 추천 프로세스 실행
+        요리명이 정해지면 추천 컨텍스트 검색(RAG + 웹 검색)을 바로 시작하고,
+        그동안 재료 컨텍스트 검색과 재료 추출 LLM 호출을 진행합니다. (레시피 테이블에 있는 요리면 생략)
+        """
+        dish_name = inputs['dish_name']
+        active_retriever = inputs.get('retriever') or retriever
+        logger.info(f"🍳 추천 체인 실행 중... (요리: {dish_name})")
 
-        # 1단계: 재료 추출
-        ingredients = ingredient_chain.invoke({'dish_name': inputs['dish_name']})
+        # 1단계: 추천 컨텍스트 검색 시작 (백그라운드)
+        context_future = context_executor.submit(get_context_for_recommendation, active_retriever, dish_name)
 
-        # 2단계: 컨텍스트 검색 및 추천
-        inputs_with_context = get_recommendation_context({
-            "dish_name": inputs['dish_name'],
-            "ingredients": ingredients
-        })
+        # 2단계: 재료 추출 (레시피 테이블 → 없으면 재료 컨텍스트 검색 + LLM)
+        ingredients = known_recipe_ingredients(dish_name, inputs)
+        if ingredients is None:
+            ingredients = with_local_nutrients(
+                ingredient_chain.invoke({'dish_name': dish_name, 'retriever': active_retriever}), inputs
+            )
 
         # 3단계: 최종 추천 생성
-        result = recommendation_chain.invoke(inputs_with_context)
+        result = recommendation_chain.invoke({
+            "dish_name": dish_name,
+            "ingredients": ingredients,
+            "context": context_future.result(),
+        })
+        logger.info("✅ 추천 체인 완료")
+        return result
+
+    async def arun_full_recommendation(inputs):
+        """전체 추천 프로세스 실행 (비동기)"""
+        dish_name = inputs['dish_name']
+        active_retriever = inputs.get('retriever') or retriever
+        logger.info(f"🍳 추천 체인 실행 중... (요리: {dish_name})")
+
+        context_task = asyncio.ensure_future(aget_context_for_recommendation(active_retriever, dish_name))
+        try:
+            ingredients = known_recipe_ingredients(dish_name, inputs)
+            if ingredients is None:
+                ingredients = with_local_nutrients(
+                    await ingredient_chain.ainvoke({'dish_name': dish_name, 'retriever': active_retriever}), inputs
+                )
+            context = await context_task
+        except BaseException:
+            context_task.cancel()
+            raise
+
+        result = await recommendation_chain.ainvoke({
+            "dish_name": dish_name,
+            "ingredients": ingredients,
+            "context": context,
+        })
         logger.info("✅ 추천 체인 완료")
         return result
 
-    logger.info(f"추천 체인 생성 완료 (model={model}, temperature={temperature})")
-    return run_full_recommendation
+    logger.info(
+        f"추천 체인 생성 완료 (model={model}, temperature={temperature}, "
+        f"nutrient_engine={'on' if nutrient_engine is not None else 'off'}, "
+        f"recipe_table={len(recipe_table) if recipe_table is not None else 'off'}, "
+        f"substitute_finder={'on' if substitute_finder is not None else 'off'})"
+    )
+    return RunnableLambda(run_full_recommendation, afunc=arun_full_recommendation)
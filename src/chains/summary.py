@@ -4,7 +4,8 @@ import logging
 from typing import Optional
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema.output_parser import StrOutputParser
-from .common import get_llm, get_context_for_summary
+from langchain.schema.runnable import RunnableLambda
+from .common import get_llm, get_context_for_summary, aget_context_for_summary
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +28,13 @@ def create_summary_chain(
     요약 체인 생성 (조리법 및 주의사항 요약, Q&A 생성)
 
     Args:
-        retriever: RAG 리트리버
+        retriever: RAG 리트리버 (입력에 "retriever"가 있으면 그 요청에서는 입력의 리트리버 사용)
         model: 사용할 모델명
         temperature: 응답의 창의성
         max_tokens: 최대 토큰 수
 
     Returns:
-        요약 체인
+        요약 체인 (invoke/ainvoke 지원 Runnable)
     """
     llm = get_llm(model=model, temperature=temperature, max_tokens=max_tokens)
 
@@ -61,12 +62,17 @@ def create_summary_chain(
     def get_summary_context(inputs):
         """요약을 위한 컨텍스트 검색"""
         topic = inputs["topic"]
-        context = get_context_for_summary(retriever, topic)
+        context = get_context_for_summary(inputs.get("retriever") or retriever, topic)
+        return {**inputs, "context": context}
+
+    async def aget_summary_context(inputs):
+        """요약을 위한 컨텍스트 검색 (비동기)"""
+        context = await aget_context_for_summary(inputs.get("retriever") or retriever, inputs["topic"])
         return {**inputs, "context": context}
 
     # 요약 체인 구성
     summary_chain = (
-        get_summary_context
+        RunnableLambda(get_summary_context, afunc=aget_summary_context)
         | summary_prompt
         | llm
         | StrOutputParser()
@@ -79,5 +85,12 @@ def create_summary_chain(
         logger.info("✅ 요약 체인 완료")
         return result
 
+    async def arun_summary(inputs):
+        """요약 프로세스 실행 (비동기)"""
+        logger.info(f"📝 요약 체인 실행 중... (주제: {inputs['topic']})")
+        result = await summary_chain.ainvoke(inputs)
+        logger.info("✅ 요약 체인 완료")
+        return result
+
     logger.info(f"요약 체인 생성 완료 (model={model}, temperature={temperature})")
-    return run_summary
+    return RunnableLambda(run_summary, afunc=arun_summary)
@@ -0,0 +1,153 @@
+"""
+요약 필요성 판단 규칙 모듈
+요약 판단 프롬프트의 키워드 목록을 Aho-Corasick 오토마톤으로 한 번에 매칭하여
+need_summary를 LLM 호출 없이 결정하고, 애매한 경우에만 LLM에 맡깁니다.
+"""
+
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 요약(조리법/주의사항)이 필요하다는 키워드
+SUMMARY_KEYWORDS = ("만드는 법", "만드는법", "조리법", "어떻게", "방법", "주의", "팁", "알려줄래")
+
+# 단순 대체재 추천만 원한다는 키워드
+NO_SUMMARY_KEYWORDS = ("추천", "대체", "뭐", "뭘", "가능한", "할 수")
+
+# 키워드 바로 뒤에 오면 그 키워드를 부정하는 표현 ("조리법은 필요 없어", "주의사항 말고")
+NEGATION_CUES = ("필요 없", "필요없", "말고", "빼고", "제외", "없이", "안 알려", "안알려", "몰라도")
+
+# 부정 표현을 찾을 키워드 뒤 범위 (글자 수)
+NEGATION_WINDOW = 8
+
+
+class KeywordAutomaton:
+    """여러 키워드를 텍스트 한 번 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: 찾을 키워드 목록
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            node = 0
+            for char in keyword:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node].append(keyword)
+
+        # BFS로 실패 링크 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        텍스트에서 키워드를 모두 찾습니다.
+
+        Args:
+            text: 검색할 텍스트
+
+        Returns:
+            (키워드 끝 위치(미포함), 키워드) 리스트
+        """
+        matches = []
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword in self._output[node]:
+                matches.append((i + 1, keyword))
+        return matches
+
+
+class SummaryDecisionRules:
+    """키워드 규칙으로 need_summary를 판단하는 엔진 (앱 생성 시 한 번만 만듦)"""
+
+    def __init__(
+        self,
+        summary_keywords: Iterable[str] = SUMMARY_KEYWORDS,
+        no_summary_keywords: Iterable[str] = NO_SUMMARY_KEYWORDS,
+        negation_cues: Iterable[str] = NEGATION_CUES,
+        negation_window: int = NEGATION_WINDOW
+    ):
+        """
+        Args:
+            summary_keywords: 요약이 필요하다는 키워드
+            no_summary_keywords: 요약이 불필요하다는 키워드
+            negation_cues: 키워드를 부정하는 표현
+            negation_window: 키워드 뒤에서 부정 표현을 찾을 글자 수
+        """
+        self.summary_keywords = set(summary_keywords)
+        self.no_summary_keywords = set(no_summary_keywords)
+        self.negation_window = negation_window
+        self._keywords = KeywordAutomaton(self.summary_keywords | self.no_summary_keywords)
+        self._negations = KeywordAutomaton(negation_cues)
+
+        self.rule_decisions = 0
+        self.escalations = 0
+
+    def match(self, query: str) -> Tuple[List[str], List[str]]:
+        """
+        쿼리에서 부정되지 않은 요약/비요약 키워드를 찾습니다.
+        부정된 요약 키워드("조리법은 필요 없어")는 비요약 근거로 셉니다.
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            (요약 키워드 리스트, 비요약 키워드 리스트)
+        """
+        text = unicodedata.normalize("NFC", query)
+        negation_starts = [end - len(cue) for end, cue in self._negations.find(text)]
+
+        summary_hits, no_summary_hits = [], []
+        for end, keyword in self._keywords.find(text):
+            negated = any(end <= start <= end + self.negation_window for start in negation_starts)
+            if keyword in self.summary_keywords:
+                (no_summary_hits if negated else summary_hits).append(keyword)
+            elif not negated:
+                no_summary_hits.append(keyword)
+        return summary_hits, no_summary_hits
+
+    def decide(self, query: str) -> Optional[bool]:
+        """
+        need_summary를 규칙으로 판단합니다.
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            True/False (한쪽 키워드만 있을 때), None (양쪽 모두 있거나 둘 다 없으면 LLM 판단 필요)
+        """
+        summary_hits, no_summary_hits = self.match(query)
+        if bool(summary_hits) == bool(no_summary_hits):
+            self.escalations += 1
+            return None
+        self.rule_decisions += 1
+        return bool(summary_hits)
+
+    def stats(self) -> Dict[str, float]:
+        """규칙 판단/LLM 위임 횟수를 반환합니다."""
+        total = self.rule_decisions + self.escalations
+        return {
+            "rule": self.rule_decisions,
+            "escalated": self.escalations,
+            "rule_rate": self.rule_decisions / total if total else 0.0,
+        }
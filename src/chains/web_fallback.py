@@ -0,0 +1,320 @@
+"""
+웹 검색 Fallback 제어 모듈
+RAG 검색 결과가 부족할 때 실행하는 웹 검색에 요청 단위 시간 예산과 서킷 브레이커를 적용합니다.
+
+- 시간 예산: 컨텍스트 검색 시작부터 budget_seconds 안에 웹 검색이 끝나지 않으면 RAG 결과만 사용
+- 서킷 브레이커: 연속 실패/시간 초과가 failure_threshold회 이상이면 recovery_seconds 동안 웹 검색 생략
+- 추측 실행: RAG 검색과 동시에 웹 검색을 시작하고, RAG 결과가 충분하면 취소
+  (비동기 경로는 task.cancel()로 HTTP 요청까지 중단됨. 동기 경로는 이미 시작한 요청을 멈출 수 없어
+  취소해도 검색 비용이 나가므로 speculative_sync=True일 때만 사용)
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from src.utils.web_search import WebSearcher, _enhance_query, get_web_searcher
+
+logger = logging.getLogger(__name__)
+
+# 남은 예산이 이보다 적으면 웹 검색을 시작하지 않음 (초)
+MIN_SEARCH_SECONDS = 0.05
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half-open)"""
+
+    def __init__(self, failure_threshold: int = 3, recovery_seconds: float = 30.0):
+        """
+        Args:
+            failure_threshold: 회로를 여는 연속 실패 횟수
+            recovery_seconds: 회로를 연 뒤 시험 호출을 허용하기까지의 시간 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open', 'half-open'"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.recovery_seconds:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """호출해도 되는지 확인합니다. (half-open이면 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.recovery_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """성공을 기록하고 회로를 닫습니다."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """시험 호출이 결과 없이 취소되었을 때 다음 시험 호출을 허용합니다."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """실패를 기록하고, 임계값을 넘거나 시험 호출이 실패하면 회로를 엽니다."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    logger.warning(f"🔌 웹 검색 회로 열림 ({self._failures}회 연속 실패, {self.recovery_seconds}초 동안 생략)")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class WebFallback:
+    """RAG → 웹 검색 Fallback 실행기 (시간 예산 + 서킷 브레이커 + 추측 실행 + 통계)"""
+
+    def __init__(
+        self,
+        budget_seconds: float = 4.0,
+        speculative: bool = True,
+        speculative_sync: bool = False,
+        failure_threshold: int = 3,
+        recovery_seconds: float = 30.0,
+        max_workers: int = 8
+    ):
+        """
+        Args:
+            budget_seconds: 컨텍스트 검색 한 번에 웹 검색을 기다리는 최대 시간 (초, 검색 시작 시점 기준)
+            speculative: 비동기 경로에서 RAG 검색과 동시에 웹 검색을 미리 시작할지 여부
+            speculative_sync: 동기 경로에서도 미리 시작할지 여부
+                (실행 중인 스레드 검색은 취소되지 않으므로 RAG 결과가 충분해도 검색 비용이 발생)
+            failure_threshold: 서킷 브레이커를 여는 연속 실패 횟수
+            recovery_seconds: 서킷 브레이커를 연 뒤 다시 시도하기까지의 시간 (초)
+            max_workers: 동기 웹 검색 스레드 수
+        """
+        self.budget_seconds = budget_seconds
+        self.speculative = speculative
+        self.speculative_sync = speculative_sync
+        self.breaker = CircuitBreaker(failure_threshold, recovery_seconds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web-fallback")
+
+        self._stats_lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self.reset_stats()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._counts[name] += 1
+
+    def _remaining(self, started: float) -> float:
+        return self.budget_seconds - (time.monotonic() - started)
+
+    def _allowed(self, started: float, count: bool = True) -> bool:
+        """예산과 서킷 브레이커를 확인합니다. (count=False면 생략 통계를 세지 않음)"""
+        if self._remaining(started) < MIN_SEARCH_SECONDS:
+            if count:
+                self._count("budget_exhausted")
+            return False
+        if not self.breaker.allow():
+            if count:
+                self._count("circuit_open")
+            return False
+        return True
+
+    def _record(self, ok: bool):
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+            self._count("web_failed")
+
+    def _timed_out(self):
+        """
+        예산 안에 끝나지 않은 웹 검색을 기록합니다. (동기/비동기 공통)
+        기다림을 포기한 시점에 서킷 브레이커 실패 한 번과 timeout 통계만 남기고, web_failed는 세지 않습니다.
+        """
+        logger.warning(f"⏱️ 웹 검색 시간 초과 (예산 {self.budget_seconds}초) → RAG 결과만 사용")
+        self.breaker.record_failure()
+        self._count("timeout")
+
+    def _search(self, query: str, max_results: int, deadline: float) -> Optional[str]:
+        """
+        웹 검색을 실행합니다. (실패하면 None)
+        deadline(time.monotonic())을 넘겨 끝난 검색은 result()가 이미 시간 초과로 기록했으므로
+        (또는 cancel()로 결과를 버렸으므로) 시험 호출 표시만 풀고 다시 기록하지 않습니다.
+        """
+        try:
+            results = get_web_searcher().search(
+                _enhance_query(query), max_results=max_results,
+                timeout=max(deadline - time.monotonic(), MIN_SEARCH_SECONDS), raise_errors=True
+            )
+        except Exception as e:
+            if time.monotonic() > deadline:
+                self.breaker.release()
+            else:
+                logger.warning(f"⚠️ 웹 검색 실패: {e!r}")
+                self._record(False)
+            return None
+        if time.monotonic() > deadline:
+            self.breaker.release()
+            return None
+        self._record(True)
+        return WebSearcher.format_results(results)
+
+    async def _asearch(self, query: str, max_results: int, timeout: float) -> Optional[str]:
+        """_search의 비동기 버전"""
+        try:
+            results = await get_web_searcher().asearch(
+                _enhance_query(query), max_results=max_results, timeout=timeout, raise_errors=True
+            )
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ 웹 검색 실패: {e!r}")
+            self._record(False)
+            return None
+        self._record(True)
+        return WebSearcher.format_results(results)
+
+    # 동기 실행
+    def start(self, query: str, max_results: int, started: float) -> Optional[Future]:
+        """동기 추측 실행(speculative_sync)이 켜져 있으면 웹 검색을 백그라운드에서 시작합니다."""
+        if not self.speculative_sync or not self._allowed(started, count=False):
+            return None
+        self._count("speculative_started")
+        return self._executor.submit(self._search, query, max_results, started + self.budget_seconds)
+
+    def cancel(self, future: Optional[Future]):
+        """RAG 결과가 충분할 때 미리 시작한 웹 검색을 취소합니다. (이미 실행 중이면 결과만 버림)"""
+        self._count("rag_sufficient")
+        if future is not None:
+            if future.cancel():
+                self.breaker.release()
+            self._count("speculative_cancelled")
+
+    def result(self, future: Optional[Future], query: str, max_results: int, started: float) -> Optional[str]:
+        """
+        웹 검색 결과를 남은 예산 안에서 기다립니다.
+
+        Args:
+            future: start()가 반환한 Future (None이면 지금 검색 시작)
+            query: 웹 검색 쿼리 (보강 전)
+            max_results: 반환할 최대 결과 수
+            started: 컨텍스트 검색 시작 시각 (time.monotonic())
+
+        Returns:
+            포맷팅된 웹 검색 결과 (생략/실패/시간 초과면 None)
+        """
+        self._count("fallback")
+        if future is None:
+            if not self._allowed(started):
+                return None
+            future = self._executor.submit(self._search, query, max_results, started + self.budget_seconds)
+        try:
+            context = future.result(timeout=max(self._remaining(started), 0.0))
+        except FutureTimeoutError:
+            self._timed_out()
+            return None
+        if context is not None:
+            self._count("web_used")
+        return context
+
+    # 비동기 실행
+    def astart(self, query: str, max_results: int, started: float) -> Optional[asyncio.Task]:
+        """start의 비동기 버전 (asyncio Task 반환)"""
+        if not self.speculative or not self._allowed(started, count=False):
+            return None
+        self._count("speculative_started")
+        return asyncio.ensure_future(self._asearch(query, max_results, self._remaining(started)))
+
+    def acancel(self, task: Optional[asyncio.Task]):
+        """cancel의 비동기 버전 (진행 중인 HTTP 요청도 취소됨)"""
+        self._count("rag_sufficient")
+        if task is not None:
+            task.cancel()
+            self._count("speculative_cancelled")
+
+    async def aresult(self, task: Optional[asyncio.Task], query: str, max_results: int, started: float) -> Optional[str]:
+        """result의 비동기 버전"""
+        self._count("fallback")
+        if task is None:
+            if not self._allowed(started):
+                return None
+            task = asyncio.ensure_future(self._asearch(query, max_results, self._remaining(started)))
+        try:
+            context = await asyncio.wait_for(task, timeout=max(self._remaining(started), 0.0))
+        except asyncio.TimeoutError:
+            self._timed_out()
+            return None
+        if context is not None:
+            self._count("web_used")
+        return context
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Fallback 통계를 반환합니다.
+
+        Returns:
+            rag_sufficient, fallback, web_used, web_failed, timeout, circuit_open, budget_exhausted,
+            speculative_started, speculative_cancelled, fallback_rate, web_success_rate, circuit_state
+        """
+        with self._stats_lock:
+            report: Dict[str, float] = dict(self._counts)
+        total = report["rag_sufficient"] + report["fallback"]
+        report["fallback_rate"] = report["fallback"] / total if total else 0.0
+        report["web_success_rate"] = report["web_used"] / report["fallback"] if report["fallback"] else 0.0
+        report["circuit_state"] = self.breaker.state
+        return report
+
+    def reset_stats(self):
+        """통계 카운터를 초기화합니다."""
+        with self._stats_lock:
+            self._counts = {
+                name: 0 for name in (
+                    "rag_sufficient", "fallback", "web_used", "web_failed", "timeout",
+                    "circuit_open", "budget_exhausted", "speculative_started", "speculative_cancelled",
+                )
+            }
+
+
+# 프로세스 전체에서 공유하는 Fallback 실행기 (서킷 브레이커 상태를 요청 간에 공유)
+_shared_fallback = WebFallback()
+
+
+def get_web_fallback() -> WebFallback:
+    """공유 Fallback 실행기를 반환합니다."""
+    return _shared_fallback
+
+
+def configure_web_fallback(**kwargs) -> WebFallback:
+    """
+    공유 Fallback 실행기를 새 설정으로 교체합니다.
+
+    Args:
+        **kwargs: WebFallback 생성 인자 (budget_seconds, speculative, failure_threshold, ...)
+
+    Returns:
+        새 WebFallback
+    """
+    global _shared_fallback
+    _shared_fallback = WebFallback(**kwargs)
+    return _shared_fallback
+
+
+def fallback_stats() -> Dict[str, float]:
+    """공유 Fallback 실행기의 통계를 반환합니다."""
+    return _shared_fallback.stats()
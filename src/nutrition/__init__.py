@@ -0,0 +1,37 @@
+"""Nutrition 모듈: 식품성분표 기반 로컬 영양성분 계산"""
+
+from .quantity import ParsedIngredient, parse_ingredient
+from .engine import (
+    DEFAULT_FOOD_DB_PATH,
+    NUTRIENT_COLUMNS,
+    FoodMatch,
+    NutrientEngine,
+    ResolvedIngredient,
+)
+from .scoring import STAGES, NutrientScore, daily_limits, score_dishes
+from .recipes import DEFAULT_RECIPE_TABLE_PATH, RecipeNutrients, RecipeNutrientTable
+from .range_index import NutrientQuery, NutrientRangeIndex, RangeMatch, parse_nutrient_query
+from .substitutes import Substitute, SubstituteFinder
+
+__all__ = [
+    "ParsedIngredient",
+    "parse_ingredient",
+    "DEFAULT_FOOD_DB_PATH",
+    "NUTRIENT_COLUMNS",
+    "FoodMatch",
+    "NutrientEngine",
+    "ResolvedIngredient",
+    "STAGES",
+    "NutrientScore",
+    "daily_limits",
+    "score_dishes",
+    "DEFAULT_RECIPE_TABLE_PATH",
+    "RecipeNutrients",
+    "RecipeNutrientTable",
+    "NutrientQuery",
+    "NutrientRangeIndex",
+    "RangeMatch",
+    "parse_nutrient_query",
+    "Substitute",
+    "SubstituteFinder",
+]
@@ -0,0 +1,320 @@
+"""
+영양성분 조회 엔진 모듈
+식품성분표(food_database_cleaned_df.csv)를 NumPy 열 배열로 메모리에 올리고,
+식품명 글자 trigram 색인으로 "두부 300g" 같은 재료 문자열을 성분표 행에 대응시켜
+영양성분을 LLM 없이 계산합니다.
+
+조회 순서:
+    1. 식품명 정확 일치
+    2. 대표명('_' 앞부분) 일치 → 같은 대표명 중 가장 짧은 식품명
+    3. trigram 유사도 최댓값 (min_score 이상)
+       성분표 식품명은 "닭고기_가슴살_생것"처럼 수식어가 길기 때문에
+       쿼리 trigram 포함률을 중심으로 하고 Dice 계수로 짧은 식품명을 우선합니다.
+"""
+
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .quantity import DEFAULT_GRAMS, parse_ingredient
+
+# 기본 식품성분표 경로 (src/preprocess/food_data_processor.py 출력)
+DEFAULT_FOOD_DB_PATH = "data/preprocess/food_database_cleaned_df.csv"
+
+# 영양성분 열 (성분표 기준량 100g당)
+NUTRIENT_COLUMNS = ("에너지(kcal)", "단백질(mg)", "인(mg)", "칼륨(mg)", "나트륨(mg)")
+
+# 프롬프트/출력용 짧은 이름과 단위
+NUTRIENT_LABELS = ("에너지", "단백질", "인", "칼륨", "나트륨")
+NUTRIENT_UNITS = ("kcal", "mg", "mg", "mg", "mg")
+
+# 전처리 CSV의 '단백질(mg)' 열은 단백질(g) × 100으로 저장되어 있어 불러올 때 실제 mg으로 맞춤
+# (src/preprocess/food_data_processor.py 참고, NUTRIENT_COLUMNS 순서)
+CSV_UNIT_SCALE = (1.0, 10.0, 1.0, 1.0, 1.0)
+
+
+def normalize_food_name(name: str) -> str:
+    """식품명을 비교용으로 정규화합니다. (NFC, 소문자, '_'와 공백 통일)"""
+    name = unicodedata.normalize("NFC", str(name)).lower().replace("_", " ")
+    return " ".join(name.split())
+
+
+def _trigrams(name: str) -> List[str]:
+    """앞뒤에 공백을 붙인 글자 trigram (두 글자 식품명도 trigram이 생기도록)"""
+    padded = f" {name} "
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def format_amounts(amounts: Sequence[float]) -> str:
+    """영양성분 값을 '에너지 120kcal, 단백질 8000mg, ...' 형식으로 만듭니다."""
+    return ", ".join(
+        f"{label} {value:,.0f}{unit}"
+        for label, value, unit in zip(NUTRIENT_LABELS, amounts, NUTRIENT_UNITS)
+    )
+
+
+def format_ingredient_line(name: str, grams: float, food_name: str, amounts: Sequence[float]) -> str:
+    """재료 한 줄을 '- 재료 분량g [성분표 식품명]: 영양성분' 형식으로 만듭니다."""
+    return f"- {name} {round(grams, 1):g}g [{food_name}]: {format_amounts(amounts)}"
+
+
+@dataclass
+class FoodMatch:
+    """식품명 조회 결과"""
+    index: int  # 성분표 행 번호
+    food_name: str
+    score: float  # 1.0: 정확/대표명 일치, 그 외 trigram 유사도
+
+
+@dataclass
+class ResolvedIngredient:
+    """성분표 행에 대응된 재료"""
+    text: str  # 원본 재료 문자열
+    name: str  # 분량을 뗀 재료명
+    grams: float  # 환산 그램
+    food_index: int
+    food_name: str
+    food_group: str
+    score: float
+    amounts: np.ndarray  # (영양성분 수,) 해당 분량의 영양성분
+
+
+class TrigramIndex:
+    """식품명 글자 trigram → 행 번호 역색인"""
+
+    def __init__(self, names: Sequence[str], containment_weight: float = 0.8):
+        """
+        Args:
+            names: 정규화된 식품명 리스트 (행 번호 순서)
+            containment_weight: 유사도에서 쿼리 trigram 포함률의 비중 (나머지는 Dice 계수)
+        """
+        self.containment_weight = containment_weight
+        postings: Dict[str, List[int]] = {}
+        self.lengths = np.zeros(len(names), dtype=np.float32)
+        for row, name in enumerate(names):
+            grams = _trigrams(name)
+            self.lengths[row] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}
+        self.size = len(names)
+
+    def scores(self, name: str) -> np.ndarray:
+        """
+        모든 행에 대한 유사도
+        (w × 공유 trigram / 쿼리 trigram + (1 - w) × 2 × 공유 trigram / (쿼리 trigram + 행 trigram))
+
+        Args:
+            name: 정규화된 쿼리 식품명
+
+        Returns:
+            (행 수,) float32 배열
+        """
+        grams = _trigrams(name)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return np.zeros(self.size, dtype=np.float32)
+        shared = np.bincount(np.concatenate(hits), minlength=self.size).astype(np.float32)
+        containment = shared / len(grams)
+        dice = 2.0 * shared / (len(grams) + self.lengths)
+        return self.containment_weight * containment + (1.0 - self.containment_weight) * dice
+
+
+class NutrientEngine:
+    """식품성분표 열 배열 + 식품명 색인"""
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        groups: Sequence[str],
+        values: np.ndarray,
+        min_score: float = 0.4,
+        max_memo: int = 4096
+    ):
+        """
+        Args:
+            names: 식품명 (행 번호 순서)
+            groups: 식품군
+            values: (행 수, 영양성분 수) 100g당 영양성분 (NUTRIENT_COLUMNS 순서)
+            min_score: trigram 유사도가 이보다 낮으면 대응 실패
+            max_memo: 재료명 조회 결과를 기억할 개수
+        """
+        self.names = list(names)
+        self.groups = np.asarray([str(group) for group in groups], dtype=object)
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.min_score = min_score
+        self.max_memo = max_memo
+
+        normalized = [normalize_food_name(name) for name in self.names]
+        self._exact: Dict[str, int] = {}
+        self._base: Dict[str, int] = {}
+        for row, name in enumerate(normalized):
+            self._exact.setdefault(name, row)
+            base = normalize_food_name(self.names[row].split("_")[0])
+            best = self._base.get(base)
+            if best is None or len(normalized[row]) < len(normalized[best]):
+                self._base[base] = row
+        self._trigram_index = TrigramIndex(normalized)
+        self._memo: "OrderedDict[str, Optional[FoodMatch]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, **kwargs) -> "NutrientEngine":
+        """
+        정제된 식품성분표 DataFrame으로 엔진을 만듭니다.
+        숫자가 아닌 값('-', 'Tr' 등)은 0으로 취급합니다.
+
+        Args:
+            df: 식품군, 식품명, NUTRIENT_COLUMNS 열을 가진 DataFrame
+            **kwargs: NutrientEngine 생성 인자
+
+        Returns:
+            NutrientEngine
+        """
+        df = df.dropna(subset=["식품명"])
+        values = np.column_stack([
+            pd.to_numeric(df[column], errors="coerce").fillna(0.0).to_numpy(dtype=np.float32)
+            for column in NUTRIENT_COLUMNS
+        ])
+        return cls(df["식품명"].astype(str).tolist(), df["식품군"].fillna("").tolist(), values, **kwargs)
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_FOOD_DB_PATH, **kwargs) -> "NutrientEngine":
+        """
+        정제된 식품성분표 CSV로 엔진을 만듭니다.
+        CSV_UNIT_SCALE로 단백질을 실제 mg 단위로 바꿉니다.
+
+        Args:
+            path: food_data_processor.py가 저장한 CSV 경로
+            **kwargs: NutrientEngine 생성 인자
+
+        Returns:
+            NutrientEngine
+        """
+        df = pd.read_csv(path)
+        if df.columns[0].startswith("Unnamed"):
+            df = df.drop(columns=df.columns[0])
+        engine = cls.from_dataframe(df, **kwargs)
+        engine.values *= np.asarray(CSV_UNIT_SCALE, dtype=np.float32)
+        return engine
+
+    def _match(self, name: str) -> Optional[FoodMatch]:
+        """정확 일치 → 대표명 일치 → trigram 유사도 순으로 행을 찾습니다."""
+        row = self._exact.get(name, self._base.get(name))
+        if row is not None:
+            return FoodMatch(row, self.names[row], 1.0)
+        scores = self._trigram_index.scores(name)
+        row = int(np.argmax(scores))
+        if scores[row] < self.min_score:
+            return None
+        return FoodMatch(row, self.names[row], float(scores[row]))
+
+    def find(self, name: str) -> Optional[FoodMatch]:
+        """
+        재료명에 대응하는 성분표 행을 찾습니다. (결과는 기억해 두고 재사용)
+
+        Args:
+            name: 재료명 (분량 제외)
+
+        Returns:
+            FoodMatch (대응하는 행이 없으면 None)
+        """
+        key = normalize_food_name(name)
+        if not key:
+            return None
+        with self._memo_lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        match = self._match(key)
+        with self._memo_lock:
+            self._memo[key] = match
+            if len(self._memo) > self.max_memo:
+                self._memo.popitem(last=False)
+        return match
+
+    def nutrients(self, index: int, grams: float = DEFAULT_GRAMS) -> Dict[str, float]:
+        """
+        행의 영양성분을 분량에 맞춰 반환합니다.
+
+        Args:
+            index: 성분표 행 번호
+            grams: 분량 (그램)
+
+        Returns:
+            {영양성분 열 이름: 값}
+        """
+        amounts = self.values[index] * (grams / DEFAULT_GRAMS)
+        return dict(zip(NUTRIENT_COLUMNS, amounts.tolist()))
+
+    def resolve(self, text: str) -> Optional[ResolvedIngredient]:
+        """
+        "두부 300g" 같은 재료 문자열을 성분표 행과 분량별 영양성분으로 바꿉니다.
+
+        Args:
+            text: 재료 문자열
+
+        Returns:
+            ResolvedIngredient (대응하는 행이 없으면 None)
+        """
+        parsed = parse_ingredient(text)
+        match = self.find(parsed.name)
+        if match is None:
+            return None
+        return ResolvedIngredient(
+            text=text,
+            name=parsed.name,
+            grams=parsed.grams,
+            food_index=match.index,
+            food_name=match.food_name,
+            food_group=self.groups[match.index],
+            score=match.score,
+            amounts=self.values[match.index] * (parsed.grams / DEFAULT_GRAMS),
+        )
+
+    def resolve_many(self, texts: Iterable[str]) -> Tuple[List[Optional[ResolvedIngredient]], np.ndarray]:
+        """
+        여러 재료를 한 번에 대응시킵니다.
+
+        Args:
+            texts: 재료 문자열들
+
+        Returns:
+            (ResolvedIngredient 또는 None 리스트, (재료 수, 영양성분 수) 분량별 영양성분 행렬 - 실패한 재료는 0)
+        """
+        resolved = [self.resolve(text) for text in texts]
+        matrix = np.zeros((len(resolved), len(NUTRIENT_COLUMNS)), dtype=np.float32)
+        for row, item in enumerate(resolved):
+            if item is not None:
+                matrix[row] = item.amounts
+        return resolved, matrix
+
+    @staticmethod
+    def format_amounts(amounts: Sequence[float]) -> str:
+        """영양성분 값을 '에너지 120kcal, 단백질 8000mg, ...' 형식으로 만듭니다."""
+        return format_amounts(amounts)
+
+    def format_ingredients(self, texts: Sequence[str], resolved: Sequence[Optional[ResolvedIngredient]]) -> str:
+        """
+        재료별 영양성분을 프롬프트에 넣을 짧은 표로 만듭니다.
+
+        Args:
+            texts: 재료 문자열들
+            resolved: resolve_many 결과
+
+        Returns:
+            한 줄에 재료 하나씩 ("재료 (분량) [성분표 식품명]: 영양성분")
+        """
+        return "\n".join(
+            f"- {text}: 식품성분표에 없음" if item is None
+            else format_ingredient_line(item.name, item.grams, item.food_name, item.amounts)
+            for text, item in zip(texts, resolved)
+        )
@@ -0,0 +1,103 @@
+"""
+재료 분량 파싱 모듈
+"두부 300g", "대파 1/2대", "간장 2큰술", "소금 약간" 같은 재료 문자열을 (재료명, 그램)으로 나눕니다.
+부피/개수 단위는 대략적인 그램 환산표를 사용합니다.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# 무게/부피 단위 → 그램 (물 기준 부피 = 무게)
+UNIT_GRAMS = {
+    "kg": 1000.0, "g": 1.0, "mg": 0.001, "그램": 1.0,
+    "l": 1000.0, "L": 1000.0, "ml": 1.0, "cc": 1.0, "리터": 1000.0,
+    "컵": 200.0, "큰술": 15.0, "스푼": 15.0, "숟가락": 15.0, "밥숟가락": 15.0, "T": 15.0,
+    "작은술": 5.0, "티스푼": 5.0, "찻숟가락": 5.0, "t": 5.0, "꼬집": 0.5,
+}
+
+# 개수 단위 → 그램 (재료별 차이가 크므로 대략적인 1단위 무게)
+PIECE_GRAMS = {
+    "개": 100.0, "모": 300.0, "대": 50.0, "쪽": 5.0, "톨": 5.0, "알": 10.0, "장": 3.0,
+    "줌": 30.0, "뿌리": 20.0, "송이": 20.0, "마리": 200.0, "공기": 210.0, "봉지": 100.0,
+    "봉": 100.0, "팩": 200.0, "캔": 200.0, "병": 200.0, "토막": 50.0, "조각": 30.0, "인분": 150.0,
+}
+
+# 분량이 정해지지 않은 표현 → 그램
+VAGUE_GRAMS = {"약간": 2.0, "조금": 2.0, "소량": 2.0, "적당량": 5.0, "적당히": 5.0, "취향껏": 5.0}
+
+# 분량이 없을 때 기본값 (성분표 기준량)
+DEFAULT_GRAMS = 100.0
+
+_FRACTIONS = {"½": 0.5, "⅓": 1 / 3, "⅔": 2 / 3, "¼": 0.25, "¾": 0.75}
+
+_NUMBER = r"\d+(?:\.\d+)?(?:/\d+)?|[½⅓⅔¼¾]"
+_UNITS = "|".join(sorted(map(re.escape, {**UNIT_GRAMS, **PIECE_GRAMS}), key=len, reverse=True))
+_QUANTITY = rf"(?P<number>{{number}})(?:\s*[~\-]\s*(?P<upper>{_NUMBER}))?\s*(?P<unit>{_UNITS})?"
+# 분량은 공백(또는 문자열 처음) 뒤에서 시작해 글자 없이 끝나는 숫자/단위 묶음 ("비타500 1병"의 "1병", "오이 반개")
+_QUANTITY_PATTERN = re.compile(rf"(?<!\S){_QUANTITY.format(number=_NUMBER + '|반')}(?!\w)")
+# 위 형태가 없을 때 ("대파1/2대") 쓰는 느슨한 패턴 - 마지막 일치를 사용
+_LOOSE_QUANTITY_PATTERN = re.compile(_QUANTITY.format(number=_NUMBER))
+_VAGUE_PATTERN = re.compile("|".join(VAGUE_GRAMS))
+
+
+@dataclass
+class ParsedIngredient:
+    """분량을 분리한 재료"""
+    text: str  # 원본 문자열
+    name: str  # 재료명 (괄호 설명 제거)
+    grams: float  # 환산 그램
+    has_quantity: bool  # 분량이 명시되었는지 여부
+
+
+def _to_number(token: str) -> float:
+    """'1/2', '1.5', '½', '반'을 숫자로 변환합니다."""
+    if token == "반":
+        return 0.5
+    if token in _FRACTIONS:
+        return _FRACTIONS[token]
+    if "/" in token:
+        numerator, denominator = token.split("/")
+        return float(numerator) / float(denominator) if float(denominator) else 0.0
+    return float(token)
+
+
+def parse_ingredient(text: str, default_grams: float = DEFAULT_GRAMS) -> ParsedIngredient:
+    """
+    재료 문자열을 재료명과 그램으로 나눕니다.
+
+    Args:
+        text: 재료 문자열 (예: "두부 300g", "돼지고기(앞다리살) 200g", "대파 1/2대")
+        default_grams: 분량이 없을 때 사용할 그램
+
+    Returns:
+        ParsedIngredient
+    """
+    normalized = unicodedata.normalize("NFC", text).strip()
+    match = _QUANTITY_PATTERN.search(normalized)
+    if match is None:
+        match = next(reversed(list(_LOOSE_QUANTITY_PATTERN.finditer(normalized))), None)
+    vague = _VAGUE_PATTERN.search(normalized)
+
+    if match and (vague is None or match.start() < vague.start()):
+        number = _to_number(match.group("number"))
+        if match.group("upper"):
+            number = (number + _to_number(match.group("upper"))) / 2
+        unit = match.group("unit")
+        if unit is None:
+            # 단위 없는 숫자는 개수로 취급
+            grams = number * PIECE_GRAMS["개"]
+        else:
+            grams = number * UNIT_GRAMS.get(unit, PIECE_GRAMS.get(unit, 1.0))
+        name, has_quantity = normalized[:match.start()], True
+    elif vague is not None:
+        grams = VAGUE_GRAMS[vague.group()]
+        name, has_quantity = normalized[:vague.start()], True
+    else:
+        grams = default_grams
+        name, has_quantity = normalized, False
+
+    name = re.sub(r"\([^)]*\)|\[[^\]]*\]", " ", name)
+    name = re.sub(r"[^\w\s]", " ", name)
+    name = re.sub(r"\s+", " ", name).strip()
+    return ParsedIngredient(text=text, name=name, grams=grams, has_quantity=has_quantity)
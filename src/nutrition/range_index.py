@@ -0,0 +1,317 @@
+"""
+영양성분 범위 검색 모듈
+"칼륨 300mg 이하, 인 200mg 이하 찌개" 같은 조건을 식품/레시피 영양성분 열에 대한 범위 검색으로 처리합니다.
+
+색인 구조:
+    - 영양성분 열마다 정렬된 값 + 행 번호 (이진 탐색으로 범위의 행 구간을 바로 찾음)
+    - 가장 좁은 범위의 행들을 후보로 잡고, 나머지 범위/식품군 조건을 불리언 비트맵으로 교집합
+    - 이름 부분 문자열 조건은 숫자 조건을 통과한 후보에만 적용
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import NUTRIENT_COLUMNS, NUTRIENT_LABELS, format_amounts, normalize_food_name
+
+# 쿼리에서 인식하는 영양성분 이름 → NUTRIENT_COLUMNS 번호
+NUTRIENT_ALIASES = {
+    "에너지": 0, "열량": 0, "칼로리": 0,
+    "단백질": 1,
+    "인": 2,
+    "칼륨": 3, "포타슘": 3,
+    "나트륨": 4,
+}
+
+# 단위 → 열 단위(kcal 또는 mg) 배율, 단위가 없으면 영양성분별 기본 단위 사용
+_UNIT_SCALE = {"mg": 1.0, "밀리그램": 1.0, "g": 1000.0, "그램": 1000.0, "kcal": 1.0, "칼로리": 1.0}
+_DEFAULT_UNIT_SCALE = (1.0, 1000.0, 1.0, 1.0, 1.0)  # 단백질은 g, 나머지는 kcal/mg
+
+# 검색 대상을 정하는 단어
+RECIPE_WORDS = ("레시피", "요리", "음식", "메뉴", "반찬")
+FOOD_WORDS = ("식품", "식재료", "재료")
+
+# 조건/대상 외에 무시할 단어
+_STOPWORDS = {
+    "알려줘", "알려주세요", "추천", "추천해줘", "추천해주세요", "찾아줘", "찾아주세요", "보여줘", "검색",
+    "뭐", "뭐가", "무엇", "어떤", "있어", "있나요", "좀", "중", "중에", "중에서", "목록", "리스트",
+    "그리고", "및", "또는", "이면서", "면서", "저칼륨", "저인", "저나트륨", "저염",
+    "하루", "한끼", "매일", "어떻게", "얼마나", "정도", "먹을", "먹는", "먹어도",
+}
+# 동사/형용사 활용 어미로 끝나는 단어 ("먹으려면", "해야", "하나요", "짜줘")는 대상 조건이 아님
+_VERB_ENDING_PATTERN = re.compile(r"(려면|으면|하면|해야|나요|까요|세요|어요|아요|해요|니다|는데|지만|려고|싶어|줘)$")
+_PARTICLE_PATTERN = re.compile(r"(으로|에서|이나|이고|하고|을|를|은|는|이|가|로|와|과|의|도|만)$")
+
+_NUMBER = r"\d+(?:[.,]\d+)*"
+_UNIT = r"kcal|mg|밀리그램|그램|칼로리|g"
+_ALIAS = "|".join(sorted(NUTRIENT_ALIASES, key=len, reverse=True))
+_CONDITION_PATTERN = re.compile(
+    rf"(?<![가-힣])(?P<nutrient>{_ALIAS})\s*(?:이|가|은|는)?\s*"
+    rf"(?:(?P<low>{_NUMBER})\s*(?P<low_unit>{_UNIT})?\s*[~\-]\s*)?"
+    rf"(?P<value>{_NUMBER})\s*(?P<unit>{_UNIT})?\s*"
+    rf"(?P<op>이하|미만|이상|초과|까지|보다\s*적은|보다\s*낮은|보다\s*많은|보다\s*높은)?"
+    rf"(?:인|의|이고|이며|이면서|면서|으로|로)?(?![가-힣])"
+)
+_TOP_N_PATTERN = re.compile(r"(?P<n>\d+)\s*(?:개|가지)")
+
+
+@dataclass
+class NutrientQuery:
+    """영양성분 범위 검색 조건"""
+    ranges: Dict[int, Tuple[float, float]] = field(default_factory=dict)  # 열 번호 → (하한, 상한)
+    terms: List[str] = field(default_factory=list)  # 식품군 또는 이름 부분 문자열
+    target: Optional[str] = None  # 'recipe', 'food' 또는 None (자동)
+    top_n: Optional[int] = None
+
+    def describe(self) -> str:
+        """조건을 '칼륨 ≤ 300mg, 인 ≤ 200mg, 찌개' 형식으로 만듭니다."""
+        parts = []
+        for column, (low, high) in sorted(self.ranges.items()):
+            unit = "kcal" if column == 0 else "mg"
+            if np.isfinite(low) and np.isfinite(high):
+                parts.append(f"{NUTRIENT_LABELS[column]} {low:,.0f}~{high:,.0f}{unit}")
+            elif np.isfinite(high):
+                parts.append(f"{NUTRIENT_LABELS[column]} ≤ {high:,.0f}{unit}")
+            else:
+                parts.append(f"{NUTRIENT_LABELS[column]} ≥ {low:,.0f}{unit}")
+        return ", ".join(parts + [f"'{term}'" for term in self.terms])
+
+
+def _to_amount(number: str, unit: Optional[str], column: int) -> float:
+    """숫자와 단위를 열 단위(kcal/mg) 값으로 바꿉니다."""
+    value = float(number.replace(",", ""))
+    return value * (_UNIT_SCALE[unit] if unit else _DEFAULT_UNIT_SCALE[column])
+
+
+def parse_nutrient_query(text: str) -> Optional[NutrientQuery]:
+    """
+    자연어 쿼리에서 영양성분 범위 조건을 추출합니다.
+
+    예: "칼륨 300mg 이하, 인 200mg 이하 찌개" → 칼륨 ≤ 300, 인 ≤ 200, 이름에 '찌개'
+        "단백질 10~20g 어패류 5개" → 단백질 10000~20000mg, '어패류', 상위 5개
+    비교 표현이 없으면 상한(이하)으로 취급합니다.
+
+    Args:
+        text: 사용자 쿼리
+
+    Returns:
+        NutrientQuery (영양성분 조건이 하나도 없으면 None)
+    """
+    text = unicodedata.normalize("NFC", text)
+    query = NutrientQuery()
+    for match in _CONDITION_PATTERN.finditer(text):
+        column = NUTRIENT_ALIASES[match.group("nutrient")]
+        value = _to_amount(match.group("value"), match.group("unit"), column)
+        op = re.sub(r"\s+", "", match.group("op") or "이하")
+        if match.group("low"):
+            low = _to_amount(match.group("low"), match.group("low_unit") or match.group("unit"), column)
+            bounds = (low, value)
+        elif op in ("이상", "보다많은", "보다높은"):
+            bounds = (value, np.inf)
+        elif op in ("초과",):
+            bounds = (np.nextafter(value, np.inf), np.inf)
+        elif op in ("미만", "보다적은", "보다낮은"):
+            bounds = (-np.inf, np.nextafter(value, -np.inf))
+        else:
+            bounds = (-np.inf, value)
+        previous = query.ranges.get(column, (-np.inf, np.inf))
+        query.ranges[column] = (float(max(previous[0], bounds[0])), float(min(previous[1], bounds[1])))
+    if not query.ranges:
+        return None
+
+    rest = _CONDITION_PATTERN.sub(" ", text)
+    top_n = _TOP_N_PATTERN.search(rest)
+    if top_n:
+        query.top_n = int(top_n.group("n"))
+        rest = _TOP_N_PATTERN.sub(" ", rest)
+
+    for token in re.findall(r"[\w]+", rest):
+        token = _PARTICLE_PATTERN.sub("", token) if len(token) > 2 else token
+        if not token or token in _STOPWORDS or token.isdigit() or _VERB_ENDING_PATTERN.search(token):
+            continue
+        if token in RECIPE_WORDS:
+            query.target = "recipe"
+        elif token in FOOD_WORDS:
+            query.target = "food"
+        else:
+            query.terms.append(token)
+    return query
+
+
+@dataclass
+class RangeMatch:
+    """범위 검색 결과 한 건"""
+    row: int
+    name: str
+    group: str
+    amounts: np.ndarray  # (영양성분 수,) NUTRIENT_COLUMNS 순서
+
+    def format(self) -> str:
+        """'이름 [식품군]: 에너지 ..., 단백질 ...' 한 줄"""
+        group = f" [{self.group}]" if self.group else ""
+        return f"{self.name}{group}: {format_amounts(self.amounts)}"
+
+
+class NutrientRangeIndex:
+    """영양성분 열 범위 색인 (정렬된 열 + 비트맵 교집합)"""
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        values: np.ndarray,
+        groups: Optional[Sequence[str]] = None,
+        basis: str = "100g"
+    ):
+        """
+        Args:
+            names: 식품명 또는 요리명 (행 번호 순서)
+            values: (행 수, 영양성분 수) 영양성분 (NUTRIENT_COLUMNS 순서)
+            groups: 식품군 (없으면 식품군 조건은 항상 불일치)
+            basis: 영양성분 기준량 설명 (예: '100g', '1인분')
+        """
+        self.names = list(names)
+        self.values = np.ascontiguousarray(values, dtype=np.float32).reshape(-1, len(NUTRIENT_COLUMNS))
+        self.basis = basis
+        self._normalized = [normalize_food_name(name).replace(" ", "") for name in self.names]
+        # 이름 부분 문자열 존재 여부를 한 번에 확인하기 위한 연결 문자열
+        self._name_blob = "\x00".join(self._normalized)
+
+        group_names = [str(group) for group in groups] if groups is not None else [""] * len(self.names)
+        self.group_names, self.group_codes = np.unique(np.asarray(group_names, dtype=object), return_inverse=True)
+        self.group_codes = self.group_codes.astype(np.int32)
+
+        # 열별 정렬 (NaN은 맨 뒤로 가므로 범위 검색에 걸리지 않음)
+        self._order = np.argsort(self.values, axis=0, kind="stable").T.copy()
+        self._sorted = np.take_along_axis(self.values, self._order.T, axis=0).T.copy()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_engine(cls, engine) -> "NutrientRangeIndex":
+        """NutrientEngine의 식품성분표(100g당)로 색인을 만듭니다."""
+        return cls(engine.names, engine.values, engine.groups, basis="100g")
+
+    @classmethod
+    def from_recipe_table(cls, table) -> "NutrientRangeIndex":
+        """RecipeNutrientTable의 레시피별 1인분 합계로 색인을 만듭니다."""
+        names = [table.dish_name(row) for row in range(len(table))]
+        return cls(names, table.totals, basis="1인분")
+
+    def group_mask(self, term: str) -> Optional[np.ndarray]:
+        """
+        식품군 이름에 term이 들어 있는 행의 비트맵을 반환합니다.
+
+        Returns:
+            (행 수,) bool 배열 (일치하는 식품군이 없으면 None)
+        """
+        codes = [code for code, name in enumerate(self.group_names) if name and term in name]
+        if not codes:
+            return None
+        return np.isin(self.group_codes, codes)
+
+    def has_term(self, term: str) -> bool:
+        """term이 식품군 이름이거나 어떤 행 이름에 들어 있는지 확인합니다. (범위 검색 대상 단어인지 판단)"""
+        if self.group_mask(term) is not None:
+            return True
+        term = normalize_food_name(term).replace(" ", "")
+        return bool(term) and term in self._name_blob
+
+    def _range_rows(self, column: int, low: float, high: float) -> np.ndarray:
+        """열 값이 [low, high]인 행 번호 (정렬된 열 이진 탐색)"""
+        start = np.searchsorted(self._sorted[column], low, side="left")
+        stop = np.searchsorted(self._sorted[column], high, side="right")
+        return self._order[column, start:stop]
+
+    def search(
+        self,
+        ranges: Dict[int, Tuple[float, float]],
+        groups: Sequence[str] = (),
+        name_contains: Sequence[str] = (),
+        top_n: int = 10
+    ) -> List[RangeMatch]:
+        """
+        범위 조건을 모두 만족하는 행을 찾습니다.
+
+        Args:
+            ranges: 열 번호 → (하한, 상한) (경계 포함)
+            groups: 식품군 조건 (하나라도 일치하면 통과)
+            name_contains: 이름 부분 문자열 조건 (모두 포함해야 통과, 공백 무시)
+            top_n: 반환할 최대 개수
+
+        Returns:
+            RangeMatch 리스트 (상한 대비 비율 합이 작은 순, 하한만 있으면 값이 큰 순)
+        """
+        # 가장 좁은 범위의 행 구간을 후보로 시작
+        spans = {column: self._range_rows(column, low, high) for column, (low, high) in ranges.items()}
+        if spans:
+            first = min(spans, key=lambda column: len(spans[column]))
+            candidates = np.sort(spans[first])
+        else:
+            candidates = np.arange(len(self))
+
+        # 나머지 범위 조건과 식품군 조건을 비트맵으로 교집합
+        keep = np.ones(len(candidates), dtype=bool)
+        for column, (low, high) in ranges.items():
+            if spans and column == first:
+                continue
+            values = self.values[candidates, column]
+            keep &= (values >= low) & (values <= high)
+        if groups:
+            masks = [mask for mask in (self.group_mask(group) for group in groups) if mask is not None]
+            if not masks:
+                return []
+            keep &= np.logical_or.reduce(masks)[candidates]
+        candidates = candidates[keep]
+
+        # 이름 조건은 숫자 조건을 통과한 후보에만 적용
+        terms = [normalize_food_name(term).replace(" ", "") for term in name_contains]
+        if terms:
+            candidates = np.asarray(
+                [row for row in candidates if all(term in self._normalized[row] for term in terms)],
+                dtype=np.intp,
+            )
+        if len(candidates) == 0:
+            return []
+
+        # 상한 대비 비율 합이 작을수록 (여유가 클수록), 하한 대비 비율이 클수록 앞에 배치
+        score = np.zeros(len(candidates), dtype=np.float64)
+        for column, (low, high) in ranges.items():
+            values = self.values[candidates, column]
+            if np.isfinite(high) and high > 0:
+                score += values / high
+            elif np.isfinite(low) and low > 0:
+                score -= values / low
+        if len(candidates) > top_n:
+            top = np.argpartition(score, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.lexsort((candidates[top], score[top]))]
+
+        return [
+            RangeMatch(
+                row=int(row),
+                name=self.names[row],
+                group=str(self.group_names[self.group_codes[row]]),
+                amounts=self.values[row],
+            )
+            for row in candidates[top]
+        ]
+
+    def query(self, query: NutrientQuery, top_n: int = 10) -> List[RangeMatch]:
+        """
+        parse_nutrient_query 결과로 검색합니다. 식품군과 일치하는 단어는 식품군 조건, 나머지는 이름 조건으로 사용합니다.
+
+        Args:
+            query: NutrientQuery
+            top_n: 쿼리에 개수가 없을 때 반환할 최대 개수
+
+        Returns:
+            RangeMatch 리스트
+        """
+        groups = [term for term in query.terms if self.group_mask(term) is not None]
+        names = [term for term in query.terms if term not in groups]
+        return self.search(query.ranges, groups=groups, name_contains=names, top_n=query.top_n or top_n)
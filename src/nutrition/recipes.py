@@ -0,0 +1,251 @@
+"""
+레시피 영양성분 테이블 모듈
+src/preprocess/recipe_nutrient_builder.py가 미리 계산한 레시피별(1인분) 재료와 영양성분 합계를
+하나의 .npz 파일로 저장하고, 요리명 해시 색인(정렬된 uint64 + 이진 탐색)으로 조회합니다.
+알려진 요리는 재료 추출 LLM 호출 없이 재료 목록과 영양성분을 바로 얻을 수 있습니다.
+
+파일 구성 (모든 행은 요리명 해시 순으로 정렬):
+    key_hashes (n,) uint64          요리명 키 해시
+    dish_blob/dish_offsets          요리명 (UTF-8 바이트 + 오프셋)
+    totals (n, 5) float32           1인분 영양성분 합계 (NUTRIENT_COLUMNS 순서)
+    servings, coverage (n,) float32 인분 수, 성분표에 대응된 재료 비율
+    ingredient_offsets (n + 1,)     요리별 재료 범위 (CSR)
+    ingredient_codes (전체 재료 수,) 재료 사전 번호
+    vocab_*                         재료 사전 (재료명, 레시피 전체 분량, 대응 식품 번호, 100g당 영양성분)
+    food_blob/food_offsets          대응된 식품명
+"""
+
+import hashlib
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import NUTRIENT_COLUMNS, format_amounts, format_ingredient_line
+from .quantity import DEFAULT_GRAMS
+from .scoring import score_dishes
+
+# 기본 레시피 영양성분 테이블 경로
+DEFAULT_RECIPE_TABLE_PATH = "data/preprocess/recipe_nutrients.npz"
+
+
+def recipe_key(dish_name: str) -> str:
+    """요리명을 조회 키로 정규화합니다. (NFC, 소문자, 공백과 '_' 제거)"""
+    name = unicodedata.normalize("NFC", str(dish_name)).lower().replace("_", "")
+    return "".join(name.split())
+
+
+def recipe_key_hash(dish_name: str) -> int:
+    """요리명 키의 64비트 해시"""
+    digest = hashlib.blake2b(recipe_key(dish_name).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def pack_strings(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문자열 리스트를 UTF-8 바이트 배열 하나와 오프셋 배열로 압축합니다.
+    (고정 길이 유니코드 배열은 가장 긴 문자열 기준으로 공간을 잡으므로 사용하지 않음)
+
+    Returns:
+        (uint8 바이트 배열, (문자열 수 + 1,) int64 오프셋)
+    """
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets
+
+
+def unpack_string(blob: np.ndarray, offsets: np.ndarray, index: int) -> str:
+    """pack_strings로 압축한 문자열 하나를 꺼냅니다."""
+    return blob[offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
+
+
+@dataclass
+class RecipeNutrients:
+    """요리 하나의 1인분 재료와 영양성분"""
+    dish_name: str
+    names: List[str]  # 재료명
+    grams: np.ndarray  # (재료 수,) 1인분 분량
+    food_names: List[Optional[str]]  # 대응된 식품명 (없으면 None)
+    amounts: np.ndarray  # (재료 수, 영양성분 수) 1인분 분량별 영양성분
+    totals: np.ndarray  # (영양성분 수,) 1인분 합계
+    servings: float
+    coverage: float
+
+    def format(self) -> str:
+        """재료별 영양성분을 NutrientEngine.format_ingredients와 같은 형식으로 만듭니다."""
+        return "\n".join(
+            f"- {name} {round(grams, 1):g}g: 식품성분표에 없음" if food_name is None
+            else format_ingredient_line(name, grams, food_name, amounts)
+            for name, grams, food_name, amounts in zip(self.names, self.grams, self.food_names, self.amounts)
+        )
+
+    def format_totals(self) -> str:
+        """1인분 합계를 '에너지 ..., 단백질 ...' 형식으로 만듭니다."""
+        return format_amounts(self.totals)
+
+
+class RecipeNutrientTable:
+    """요리명 → 1인분 재료/영양성분 조회 테이블"""
+
+    _ARRAYS = (
+        "key_hashes", "dish_blob", "dish_offsets", "totals", "servings", "coverage",
+        "ingredient_offsets", "ingredient_codes",
+        "vocab_blob", "vocab_offsets", "vocab_grams", "vocab_food", "vocab_values",
+        "food_blob", "food_offsets",
+    )
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            arrays: _ARRAYS 이름의 배열들 (행은 key_hashes 순으로 정렬되어 있어야 함)
+        """
+        missing = set(self._ARRAYS) - set(arrays)
+        if missing:
+            raise ValueError(f"Recipe nutrient table is missing arrays: {sorted(missing)}")
+        for name in self._ARRAYS:
+            setattr(self, name, np.asarray(arrays[name]))
+
+    def __len__(self) -> int:
+        return len(self.key_hashes)
+
+    def __contains__(self, dish_name: str) -> bool:
+        return self._row(dish_name) is not None
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_RECIPE_TABLE_PATH) -> "RecipeNutrientTable":
+        """저장된 .npz 테이블을 불러옵니다."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in cls._ARRAYS})
+
+    def save(self, path: str = DEFAULT_RECIPE_TABLE_PATH):
+        """테이블을 압축된 .npz 파일 하나로 저장합니다."""
+        np.savez_compressed(path, **{name: getattr(self, name) for name in self._ARRAYS})
+
+    def dish_name(self, row: int) -> str:
+        """행의 요리명"""
+        return unpack_string(self.dish_blob, self.dish_offsets, row)
+
+    def _row(self, dish_name: str) -> Optional[int]:
+        """요리명 해시를 이진 탐색하고 요리명 키로 충돌을 확인합니다."""
+        key = recipe_key(dish_name)
+        if not key:
+            return None
+        target = np.uint64(recipe_key_hash(dish_name))
+        row = int(np.searchsorted(self.key_hashes, target))
+        while row < len(self.key_hashes) and self.key_hashes[row] == target:
+            if recipe_key(self.dish_name(row)) == key:
+                return row
+            row += 1
+        return None
+
+    def lookup(self, dish_name: str) -> Optional[RecipeNutrients]:
+        """
+        요리의 1인분 재료와 영양성분을 조회합니다.
+
+        Args:
+            dish_name: 요리명 (공백/대소문자 무시)
+
+        Returns:
+            RecipeNutrients (모르는 요리면 None)
+        """
+        row = self._row(dish_name)
+        if row is None:
+            return None
+        codes = self.ingredient_codes[self.ingredient_offsets[row]:self.ingredient_offsets[row + 1]]
+        servings = float(self.servings[row])
+        grams = self.vocab_grams[codes].astype(np.float64) / servings
+        foods = self.vocab_food[codes]
+        return RecipeNutrients(
+            dish_name=self.dish_name(row),
+            names=[unpack_string(self.vocab_blob, self.vocab_offsets, code) for code in codes],
+            grams=grams,
+            food_names=[
+                unpack_string(self.food_blob, self.food_offsets, food) if food >= 0 else None
+                for food in foods
+            ],
+            amounts=self.vocab_values[codes] * (grams[:, None] / DEFAULT_GRAMS),
+            totals=self.totals[row].astype(np.float64),
+            servings=servings,
+            coverage=float(self.coverage[row]),
+        )
+
+
+def build_table_arrays(
+    dish_names: Sequence[str],
+    servings: Sequence[float],
+    ingredient_offsets: np.ndarray,
+    ingredient_codes: np.ndarray,
+    vocab_names: Sequence[str],
+    vocab_grams: np.ndarray,
+    vocab_food: np.ndarray,
+    vocab_values: np.ndarray,
+    food_names: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """
+    요리별 재료 (CSR)와 재료 사전으로 합계/대응 비율을 계산하고 요리명 해시 순으로 정렬한 배열을 만듭니다.
+
+    Args:
+        dish_names: 요리명 (요리명 키가 서로 달라야 함)
+        servings: (요리 수,) 인분 수
+        ingredient_offsets: (요리 수 + 1,) 요리별 재료 범위
+        ingredient_codes: (전체 재료 수,) 재료 사전 번호
+        vocab_names: 재료 사전의 재료명
+        vocab_grams: (사전 크기,) 레시피에 적힌 분량 (그램)
+        vocab_food: (사전 크기,) 대응된 식품 번호 (food_names 안의 번호, 대응 실패는 -1)
+        vocab_values: (사전 크기, 영양성분 수) 대응된 식품의 100g당 영양성분 (대응 실패는 0)
+        food_names: 대응된 식품명
+
+    Returns:
+        RecipeNutrientTable 생성 인자
+    """
+    n_dishes = len(dish_names)
+    servings = np.asarray(servings, dtype=np.float32)
+    ingredient_offsets = np.asarray(ingredient_offsets, dtype=np.int64)
+    ingredient_codes = np.asarray(ingredient_codes, dtype=np.int32)
+    vocab_grams = np.asarray(vocab_grams, dtype=np.float32)
+    vocab_food = np.asarray(vocab_food, dtype=np.int32)
+    vocab_values = np.asarray(vocab_values, dtype=np.float32).reshape(-1, len(NUTRIENT_COLUMNS))
+
+    # 요리별 1인분 합계 (모든 요리를 한 번에)
+    counts = np.diff(ingredient_offsets)
+    dish_ids = np.repeat(np.arange(n_dishes), counts)
+    per_serving = vocab_grams[ingredient_codes] / servings[dish_ids]
+    totals = score_dishes(
+        vocab_values[ingredient_codes], per_serving, dish_ids, n_dishes=n_dishes
+    ).totals.astype(np.float32)
+    matched = np.bincount(dish_ids, weights=vocab_food[ingredient_codes] >= 0, minlength=n_dishes)
+    coverage = (matched / np.maximum(counts, 1)).astype(np.float32)
+
+    # 요리명 해시 순으로 행 정렬 (재료 범위도 함께 재배치)
+    hashes = np.fromiter((recipe_key_hash(name) for name in dish_names), dtype=np.uint64, count=n_dishes)
+    order = np.argsort(hashes, kind="stable")
+    sorted_counts = counts[order]
+    sorted_offsets = np.zeros(n_dishes + 1, dtype=np.int64)
+    np.cumsum(sorted_counts, out=sorted_offsets[1:])
+    gather = (
+        np.repeat(ingredient_offsets[:-1][order] - sorted_offsets[:-1], sorted_counts)
+        + np.arange(sorted_offsets[-1])
+    )
+
+    dish_blob, dish_offsets = pack_strings([dish_names[row] for row in order])
+    vocab_blob, vocab_offsets = pack_strings(vocab_names)
+    food_blob, food_offsets = pack_strings(food_names)
+    return {
+        "key_hashes": hashes[order],
+        "dish_blob": dish_blob,
+        "dish_offsets": dish_offsets,
+        "totals": totals[order],
+        "servings": servings[order],
+        "coverage": coverage[order],
+        "ingredient_offsets": sorted_offsets,
+        "ingredient_codes": ingredient_codes[gather],
+        "vocab_blob": vocab_blob,
+        "vocab_offsets": vocab_offsets,
+        "vocab_grams": vocab_grams,
+        "vocab_food": vocab_food,
+        "vocab_values": vocab_values,
+        "food_blob": food_blob,
+        "food_offsets": food_offsets,
+    }
@@ -0,0 +1,193 @@
+"""
+영양성분 신호등 판정 모듈
+CKD_NUTRITION_GUIDELINES 조건 1~6을 수치로 옮겨, 요리별 영양성분 합계를 투석 단계별 1일 권장량과 비교하고
+0~80% 녹색, 80~100% 노란색, 100% 초과 빨간색으로 구분합니다.
+여러 요리를 (재료 수, 영양성분 수) 행렬 하나로 받아 NumPy 연산으로 한 번에 계산합니다.
+
+권장량 (NUTRIENT_COLUMNS 순서, 범위는 상한 기준):
+    에너지: 투석 전/중 35kcal/kg, 이식 후 30kcal/kg
+    단백질: 투석 전 0.8g/kg, 투석 중 1.3g/kg, 이식 후 1.0g/kg
+    인: 투석 전 800mg, 투석 중 1000mg, 이식 후 1200mg
+    칼륨: 2000mg
+    나트륨: 소금 투석 전 5g, 투석 중/이식 후 6g (나트륨 = 소금 / 2.54)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .engine import NUTRIENT_COLUMNS, NUTRIENT_LABELS, NUTRIENT_UNITS
+from .quantity import DEFAULT_GRAMS
+
+# 투석 단계
+STAGES = ("투석 전", "투석 중", "이식 후")
+
+# 체중을 모를 때 사용하는 기본 체중 (kg)
+DEFAULT_WEIGHT_KG = 60.0
+
+# 소금 → 나트륨 환산 (소금 1g = 나트륨 약 393mg)
+SALT_TO_SODIUM_MG = 1000.0 / 2.54
+
+# 단계별 체중 1kg당 권장량 (에너지 kcal/kg, 단백질 mg/kg), 나머지는 0
+_PER_KG_LIMITS = np.array([
+    [35.0, 800.0, 0.0, 0.0, 0.0],
+    [35.0, 1300.0, 0.0, 0.0, 0.0],
+    [30.0, 1000.0, 0.0, 0.0, 0.0],
+], dtype=np.float64)
+
+# 단계별 고정 권장량 (인, 칼륨, 나트륨 mg), 나머지는 0
+_FIXED_LIMITS = np.array([
+    [0.0, 0.0, 800.0, 2000.0, 5.0 * SALT_TO_SODIUM_MG],
+    [0.0, 0.0, 1000.0, 2000.0, 6.0 * SALT_TO_SODIUM_MG],
+    [0.0, 0.0, 1200.0, 2000.0, 6.0 * SALT_TO_SODIUM_MG],
+], dtype=np.float64)
+
+# 구간 경계 (권장량 대비 비율)와 이름
+BAND_EDGES = (0.8, 1.0)
+BAND_NAMES = ("녹색", "노란색", "빨간색")
+GREEN, YELLOW, RED = 0, 1, 2
+
+
+def stage_index(stage: str) -> int:
+    """
+    투석 단계 이름을 STAGES 번호로 바꿉니다. (공백 무시, '투석전'/'투석 전' 모두 허용)
+
+    Args:
+        stage: 투석 단계 ('투석 전', '투석 중', '이식 후')
+
+    Returns:
+        STAGES 안의 번호
+    """
+    compact = "".join(str(stage).split())
+    for index, name in enumerate(STAGES):
+        if compact == name.replace(" ", ""):
+            return index
+    raise ValueError(f"Unknown stage: {stage} (choose from {STAGES})")
+
+
+def daily_limits(stage: str = STAGES[0], weight_kg: Union[float, Sequence[float]] = DEFAULT_WEIGHT_KG) -> np.ndarray:
+    """
+    투석 단계와 체중에 따른 1일 권장량을 계산합니다.
+
+    Args:
+        stage: 투석 단계
+        weight_kg: 체중 (kg), 요리마다 다르면 (요리 수,) 배열
+
+    Returns:
+        (영양성분 수,) 또는 (요리 수, 영양성분 수) 권장량 배열 (NUTRIENT_COLUMNS 순서)
+    """
+    index = stage_index(stage)
+    weight = np.asarray(weight_kg, dtype=np.float64)
+    return weight[..., None] * _PER_KG_LIMITS[index] + _FIXED_LIMITS[index]
+
+
+@dataclass
+class NutrientScore:
+    """요리별 영양성분 합계와 신호등 판정"""
+    stage: str
+    totals: np.ndarray  # (요리 수, 영양성분 수) 합계
+    limits: np.ndarray  # (요리 수, 영양성분 수) 1일 권장량
+    ratios: np.ndarray  # (요리 수, 영양성분 수) 권장량 대비 비율
+    bands: np.ndarray  # (요리 수, 영양성분 수) GREEN/YELLOW/RED
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def band_names(self) -> np.ndarray:
+        """bands를 '녹색'/'노란색'/'빨간색' 문자열 배열로 반환합니다."""
+        return np.asarray(BAND_NAMES, dtype=object)[self.bands]
+
+    def to_dicts(self) -> List[Dict[str, dict]]:
+        """
+        요리별 판정을 딕셔너리로 반환합니다.
+
+        Returns:
+            [{영양성분 열 이름: {"total", "limit", "ratio", "band"}}, ...]
+        """
+        names = self.band_names()
+        return [
+            {
+                column: {
+                    "total": float(self.totals[dish, col]),
+                    "limit": float(self.limits[dish, col]),
+                    "ratio": float(self.ratios[dish, col]),
+                    "band": names[dish, col],
+                }
+                for col, column in enumerate(NUTRIENT_COLUMNS)
+            }
+            for dish in range(len(self))
+        ]
+
+    def format(self, dish: int = 0) -> str:
+        """
+        요리 하나의 판정을 프롬프트/출력용 한 줄로 만듭니다.
+
+        Args:
+            dish: 요리 번호
+
+        Returns:
+            "에너지 456kcal (22%, 녹색), 단백질 ... " 형식 문자열
+        """
+        names = self.band_names()
+        return ", ".join(
+            f"{label} {total:,.0f}{unit} ({ratio:.0%}, {band})"
+            for label, unit, total, ratio, band in zip(
+                NUTRIENT_LABELS, NUTRIENT_UNITS, self.totals[dish], self.ratios[dish], names[dish]
+            )
+        )
+
+
+def classify(ratios: np.ndarray) -> np.ndarray:
+    """권장량 대비 비율을 GREEN(≤80%)/YELLOW(≤100%)/RED(>100%)로 구분합니다."""
+    return np.digitize(ratios, BAND_EDGES, right=True).astype(np.int8)
+
+
+def score_dishes(
+    values: np.ndarray,
+    grams: Optional[Sequence[float]] = None,
+    dish_ids: Optional[Sequence[int]] = None,
+    n_dishes: Optional[int] = None,
+    stage: str = STAGES[0],
+    weight_kg: Union[float, Sequence[float]] = DEFAULT_WEIGHT_KG
+) -> NutrientScore:
+    """
+    재료별 영양성분 행렬로 요리별 합계와 신호등을 계산합니다.
+
+    Args:
+        values: (재료 수, 영양성분 수) 영양성분 행렬 (NUTRIENT_COLUMNS 순서)
+            grams가 있으면 100g당 값, 없으면 이미 분량이 반영된 값
+        grams: (재료 수,) 재료별 분량 (그램)
+        dish_ids: (재료 수,) 재료가 속한 요리 번호 (None이면 모든 재료가 한 요리)
+        n_dishes: 요리 수 (None이면 dish_ids 최댓값 + 1, 재료가 없는 요리도 포함하려면 지정)
+        stage: 투석 단계
+        weight_kg: 체중 (kg), 요리마다 다르면 (요리 수,) 배열
+
+    Returns:
+        NutrientScore
+    """
+    amounts = np.asarray(values, dtype=np.float64).reshape(-1, len(NUTRIENT_COLUMNS))
+    if grams is not None:
+        amounts = amounts * (np.asarray(grams, dtype=np.float64)[:, None] / DEFAULT_GRAMS)
+
+    if dish_ids is None:
+        totals = amounts.sum(axis=0, keepdims=True)
+    else:
+        dish_ids = np.asarray(dish_ids, dtype=np.intp)
+        if n_dishes is None:
+            n_dishes = int(dish_ids.max()) + 1 if dish_ids.size else 0
+        # 영양성분 열마다 bincount로 요리별 합계 (np.add.at보다 빠름)
+        totals = np.column_stack([
+            np.bincount(dish_ids, weights=amounts[:, col], minlength=n_dishes)
+            for col in range(amounts.shape[1])
+        ]) if n_dishes else np.zeros((0, amounts.shape[1]), dtype=np.float64)
+
+    limits = np.broadcast_to(daily_limits(stage, weight_kg), totals.shape)
+    ratios = totals / limits
+    return NutrientScore(
+        stage=STAGES[stage_index(stage)],
+        totals=totals,
+        limits=limits,
+        ratios=ratios,
+        bands=classify(ratios),
+    )
@@ -0,0 +1,204 @@
+"""
+대체재 탐색 모듈
+식품성분표에서 고칼륨/고인 재료의 대체재를 찾습니다.
+
+같은 식품군 안에서 칼륨과 인이 모두 원재료 이하이고 (칼륨+인)이 min_reduction 이상 줄어드는 식품만 후보로 두고,
+정규화한 영양성분 벡터 공간에서 "원재료의 에너지·단백질 + 칼륨·인·나트륨 0" 목표점까지의
+가중 거리가 가까운 순으로 정렬합니다. (에너지·단백질은 비슷할수록, 칼륨·인·나트륨은 낮을수록 앞)
+요리 재료 전체를 (재료 수, 식품 수) 거리 행렬 한 번으로 계산합니다.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .engine import NUTRIENT_COLUMNS, NutrientEngine
+from .quantity import DEFAULT_GRAMS
+
+# 영양성분별 거리 가중치 (NUTRIENT_COLUMNS 순서: 에너지, 단백질, 인, 칼륨, 나트륨)
+DEFAULT_WEIGHTS = (1.0, 1.0, 0.5, 0.5, 0.25)
+
+# 대체가 필요한 재료 기준 (100g당 mg)
+HIGH_POTASSIUM_MG = 200.0
+HIGH_PHOSPHORUS_MG = 150.0
+
+_ENERGY, _PROTEIN, _PHOSPHORUS, _POTASSIUM, _SODIUM = range(len(NUTRIENT_COLUMNS))
+
+
+@dataclass
+class Substitute:
+    """대체재 후보"""
+    row: int  # 성분표 행 번호
+    food_name: str
+    food_group: str
+    values: np.ndarray  # (영양성분 수,) 100g당 영양성분
+    distance: float  # 가중 거리 (작을수록 좋음)
+    potassium_reduction: float  # 원재료 대비 칼륨 감소율 (0~1)
+    phosphorus_reduction: float  # 원재료 대비 인 감소율 (0~1)
+
+
+class SubstituteFinder:
+    """식품성분표 기반 저칼륨/저인 대체재 탐색기"""
+
+    def __init__(
+        self,
+        engine: NutrientEngine,
+        weights: Sequence[float] = DEFAULT_WEIGHTS,
+        min_reduction: float = 0.2,
+        high_potassium: float = HIGH_POTASSIUM_MG,
+        high_phosphorus: float = HIGH_PHOSPHORUS_MG
+    ):
+        """
+        Args:
+            engine: 식품성분표 영양성분 엔진
+            weights: 영양성분별 거리 가중치 (NUTRIENT_COLUMNS 순서)
+            min_reduction: 정규화한 (칼륨+인)이 원재료보다 최소 이 비율만큼 줄어야 후보
+            high_potassium: 100g당 칼륨이 이 값 이상이면 대체 대상
+            high_phosphorus: 100g당 인이 이 값 이상이면 대체 대상
+        """
+        self.engine = engine
+        self.min_reduction = min_reduction
+        self.high_potassium = high_potassium
+        self.high_phosphorus = high_phosphorus
+
+        values = engine.values.astype(np.float64)
+        # 열마다 표준편차로 정규화 (단위가 다른 kcal/mg 값을 같은 척도로)
+        scale = values.std(axis=0)
+        self._scale = np.where(scale > 0, scale, 1.0)
+        self._normalized = values / self._scale
+        self._weights = np.sqrt(np.asarray(weights, dtype=np.float64))
+        self._weighted = self._normalized * self._weights
+        self._mineral = self._normalized[:, _PHOSPHORUS] + self._normalized[:, _POTASSIUM]
+
+        _, self._group_codes = np.unique(np.asarray(engine.groups, dtype=object), return_inverse=True)
+
+    def needs_substitute(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        100g당 칼륨 또는 인이 기준 이상인 재료인지 확인합니다.
+
+        Args:
+            rows: 성분표 행 번호 (대응 실패는 -1)
+
+        Returns:
+            (재료 수,) bool 배열
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        valid = rows >= 0
+        values = self.engine.values[np.where(valid, rows, 0)]
+        high = (values[:, _POTASSIUM] >= self.high_potassium) | (values[:, _PHOSPHORUS] >= self.high_phosphorus)
+        return valid & high
+
+    def find_batch(self, rows: Sequence[int], top_k: int = 3) -> List[List[Substitute]]:
+        """
+        여러 재료의 대체재를 한 번에 찾습니다.
+
+        Args:
+            rows: 원재료의 성분표 행 번호 (대응 실패는 -1 → 빈 리스트)
+            top_k: 재료마다 반환할 후보 수
+
+        Returns:
+            재료별 Substitute 리스트 (가까운 순)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        results: List[List[Substitute]] = [[] for _ in rows]
+        valid = np.flatnonzero(rows >= 0)
+        if len(valid) == 0:
+            return results
+        query_rows = rows[valid]
+
+        # 목표점: 원재료의 에너지·단백질은 그대로, 칼륨·인·나트륨은 0
+        targets = self._weighted[query_rows].copy()
+        targets[:, _PHOSPHORUS:] = 0.0
+        distances = (
+            np.einsum("ij,ij->i", self._weighted, self._weighted)[None, :]
+            - 2.0 * targets @ self._weighted.T
+            + np.einsum("ij,ij->i", targets, targets)[:, None]
+        )
+
+        # 후보 조건: 같은 식품군, 원재료가 아님, 칼륨·인 모두 이하, (칼륨+인) min_reduction 이상 감소
+        values = self.engine.values
+        candidates = (
+            (self._group_codes[None, :] == self._group_codes[query_rows][:, None])
+            & (np.arange(len(values))[None, :] != query_rows[:, None])
+            & (values[None, :, _POTASSIUM] <= values[query_rows, _POTASSIUM][:, None])
+            & (values[None, :, _PHOSPHORUS] <= values[query_rows, _PHOSPHORUS][:, None])
+            & (self._mineral[None, :] <= (1.0 - self.min_reduction) * self._mineral[query_rows][:, None])
+        )
+        distances = np.where(candidates, distances, np.inf)
+
+        k = min(top_k, distances.shape[1])
+        top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        top_distances = np.take_along_axis(distances, top, axis=1)
+        order = np.argsort(top_distances, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+
+        for query, (position, query_row) in enumerate(zip(valid, query_rows)):
+            original = values[query_row]
+            for row in top[query]:
+                distance = distances[query, row]
+                if not np.isfinite(distance):
+                    break
+                results[position].append(Substitute(
+                    row=int(row),
+                    food_name=self.engine.names[row],
+                    food_group=str(self.engine.groups[row]),
+                    values=values[row],
+                    distance=float(np.sqrt(max(distance, 0.0))),
+                    potassium_reduction=float(1.0 - values[row, _POTASSIUM] / original[_POTASSIUM])
+                    if original[_POTASSIUM] > 0 else 0.0,
+                    phosphorus_reduction=float(1.0 - values[row, _PHOSPHORUS] / original[_PHOSPHORUS])
+                    if original[_PHOSPHORUS] > 0 else 0.0,
+                ))
+        return results
+
+    def format_for_ingredients(
+        self,
+        names: Sequence[str],
+        rows: Sequence[int],
+        grams: Sequence[float],
+        top_k: int = 3
+    ) -> Optional[str]:
+        """
+        요리 재료 중 고칼륨/고인 재료의 대체재 후보를 프롬프트에 넣을 목록으로 만듭니다.
+        (해당 분량의 칼륨+인이 많은 재료부터)
+
+        Args:
+            names: 재료명
+            rows: 재료의 성분표 행 번호 (대응 실패는 -1)
+            grams: 재료 분량 (그램)
+            top_k: 재료마다 나열할 후보 수
+
+        Returns:
+            한 줄에 재료 하나씩 "- 재료 분량 [식품명] 칼륨/인 → 후보1 (칼륨/인), ..." (대체할 재료가 없으면 None)
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        grams = np.asarray(grams, dtype=np.float64)
+        targets = np.flatnonzero(self.needs_substitute(rows))
+        if len(targets) == 0:
+            return None
+
+        found = self.find_batch(rows[targets], top_k=top_k)
+        portion = grams[targets] / DEFAULT_GRAMS
+        values = self.engine.values[rows[targets]]
+        burden = (values[:, _POTASSIUM] + values[:, _PHOSPHORUS]) * portion
+
+        lines = []
+        for index in np.argsort(-burden, kind="stable"):
+            if not found[index]:
+                continue
+            item = targets[index]
+            scale = portion[index]
+            original = values[index] * scale
+            options = ", ".join(
+                f"{option.food_name} (칼륨 {option.values[_POTASSIUM] * scale:,.0f}mg, "
+                f"인 {option.values[_PHOSPHORUS] * scale:,.0f}mg, "
+                f"에너지 {option.values[_ENERGY] * scale:,.0f}kcal, "
+                f"단백질 {option.values[_PROTEIN] * scale:,.0f}mg)"
+                for option in found[index]
+            )
+            lines.append(
+                f"- {names[item]} {round(grams[item], 1):g}g [{self.engine.names[rows[item]]}] "
+                f"(칼륨 {original[_POTASSIUM]:,.0f}mg, 인 {original[_PHOSPHORUS]:,.0f}mg) → {options}"
+            )
+        return "\n".join(lines) or None
@@ -20,6 +20,7 @@ def process_food_database(file_path: str) -> pd.DataFrame:
     food_database_cleaned_df = food_database_df[use_column_list_food].copy()
     food_database_cleaned_df = food_database_cleaned_df.loc[1:]
     food_database_cleaned_df['영양성분함량기준량'] = '100g'
+    # Stored as protein(g) * 100; NutrientEngine.from_csv rescales it to real mg (CSV_UNIT_SCALE)
     food_database_cleaned_df['단백질(mg)'] = food_database_cleaned_df['단백질'] * 100
     food_database_cleaned_df = food_database_cleaned_df.drop('단백질', axis=1)
 
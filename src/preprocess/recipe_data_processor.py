@@ -32,7 +32,8 @@ def process_recipe_data(file_paths: list) -> pd.DataFrame:
         file_paths: A list of absolute paths to the raw recipe CSV files.
 
     Returns:
-        A cleaned pandas DataFrame containing recipe names and processed ingredients.
+        A cleaned pandas DataFrame containing recipe names, processed ingredients
+        and, when the dump has it, the servings text.
     """
     all_recipe_dfs = []
     for file_path in file_paths:
@@ -49,9 +50,14 @@ def process_recipe_data(file_paths: list) -> pd.DataFrame:
     recipe_df = pd.concat(all_recipe_dfs)
 
     use_column_list_recipe = ['CKG_NM', 'CKG_MTRL_CN']
-    recipe_df = recipe_df[use_column_list_recipe]
-    recipe_df.dropna(inplace=True)
-    recipe_df.columns = ['요리명', '재료']
+    recipe_df = recipe_df.dropna(subset=use_column_list_recipe)
+    if 'CKG_INBUN_NM' in recipe_df.columns:
+        # Servings text (e.g. '2인분'), used to compute per-serving nutrients
+        recipe_df = recipe_df[use_column_list_recipe + ['CKG_INBUN_NM']]
+        recipe_df.columns = ['요리명', '재료', '인분']
+    else:
+        recipe_df = recipe_df[use_column_list_recipe]
+        recipe_df.columns = ['요리명', '재료']
     recipe_df.reset_index(drop=True, inplace=True)
     recipe_df['재료'] = recipe_df['재료'].apply(clean_and_split_ingredients)
     
@@ -0,0 +1,135 @@
+import ast
+import re
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.nutrition.engine import DEFAULT_FOOD_DB_PATH, NUTRIENT_COLUMNS, NutrientEngine
+from src.nutrition.quantity import parse_ingredient
+from src.nutrition.recipes import DEFAULT_RECIPE_TABLE_PATH, RecipeNutrientTable, build_table_arrays, recipe_key
+
+# Default recipe CSV written by recipe_data_processor (relative to the repository root)
+DEFAULT_RECIPE_CSV_PATH = 'data/preprocess/recipe_df.csv'
+
+
+def parse_ingredient_list(value) -> List[str]:
+    """
+    Returns the ingredient list of a recipe row.
+    The '재료' column is a list after process_recipe_data, and its string repr after a CSV round trip.
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(item) for item in value if str(item).strip()]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        parsed = value.split('|')
+    if isinstance(parsed, str):
+        parsed = [parsed]
+    return [str(item).strip() for item in parsed if str(item).strip()]
+
+
+def parse_servings(value) -> float:
+    """Parses a servings text such as '2인분' or '6인분 이상' (defaults to 1)."""
+    match = re.search(r'\d+(?:\.\d+)?', str(value)) if value is not None else None
+    return max(float(match.group()), 1.0) if match else 1.0
+
+
+def build_recipe_nutrient_table(
+    recipe_df: pd.DataFrame,
+    engine: NutrientEngine,
+    min_coverage: float = 0.5,
+    servings_column: Optional[str] = '인분'
+) -> RecipeNutrientTable:
+    """
+    Joins every recipe's ingredients against the food composition table and computes
+    per-serving energy/protein/P/K/Na totals for each dish.
+
+    Each distinct ingredient string is resolved only once across the whole corpus.
+    When several recipes share a dish name, the recipe with the highest share of
+    resolved ingredients is kept (ties keep the first one).
+
+    Args:
+        recipe_df: Output of process_recipe_data ('요리명', '재료' and optionally '인분' columns).
+        engine: NutrientEngine over the cleaned food database.
+        min_coverage: Minimum share of ingredients that must resolve to a food for a recipe to be kept.
+        servings_column: Column with the servings text (ignored when missing; recipes then count as 1 serving).
+
+    Returns:
+        A RecipeNutrientTable indexed by dish-name hash.
+    """
+    has_servings = servings_column is not None and servings_column in recipe_df.columns
+
+    # 1️⃣ Ingredient vocabulary: distinct ingredient text -> code
+    vocab = {}
+    recipes = []
+    for row in recipe_df.itertuples(index=False):
+        dish_name = str(getattr(row, '요리명')).strip()
+        codes = [vocab.setdefault(text, len(vocab)) for text in parse_ingredient_list(getattr(row, '재료'))]
+        if not recipe_key(dish_name) or not codes:
+            continue
+        servings = parse_servings(getattr(row, servings_column)) if has_servings else 1.0
+        recipes.append((dish_name, servings, codes))
+
+    # 2️⃣ Resolve each distinct ingredient once
+    vocab_texts = list(vocab)
+    parsed = [parse_ingredient(text) for text in vocab_texts]
+    matches = [engine.find(item.name) for item in parsed]
+    matched = np.array([match is not None for match in matches], dtype=bool)
+
+    # 3️⃣ Keep the best-covered recipe per dish name
+    best = {}
+    for index, (dish_name, _, codes) in enumerate(recipes):
+        coverage = matched[codes].mean()
+        if coverage < min_coverage:
+            continue
+        key = recipe_key(dish_name)
+        if key not in best or coverage > best[key][0]:
+            best[key] = (coverage, index)
+    kept = [recipes[index] for _, index in sorted(best.values(), key=lambda item: item[1])]
+
+    # 4️⃣ Compact the vocabulary and food list to what the kept recipes use
+    used_codes = np.unique(np.concatenate([np.asarray(codes, dtype=np.int64) for _, _, codes in kept])) \
+        if kept else np.zeros(0, dtype=np.int64)
+    remap = np.full(len(vocab_texts), -1, dtype=np.int64)
+    remap[used_codes] = np.arange(len(used_codes))
+
+    food_rows = {}
+    vocab_food = np.full(len(used_codes), -1, dtype=np.int32)
+    vocab_values = np.zeros((len(used_codes), len(NUTRIENT_COLUMNS)), dtype=np.float32)
+    for new_code, code in enumerate(used_codes):
+        match = matches[code]
+        if match is not None:
+            vocab_food[new_code] = food_rows.setdefault(match.index, len(food_rows))
+            vocab_values[new_code] = engine.values[match.index]
+
+    ingredient_offsets = np.zeros(len(kept) + 1, dtype=np.int64)
+    np.cumsum([len(codes) for _, _, codes in kept], out=ingredient_offsets[1:])
+    ingredient_codes = remap[np.concatenate([np.asarray(codes, dtype=np.int64) for _, _, codes in kept])] \
+        if kept else np.zeros(0, dtype=np.int64)
+
+    arrays = build_table_arrays(
+        dish_names=[dish_name for dish_name, _, _ in kept],
+        servings=[servings for _, servings, _ in kept],
+        ingredient_offsets=ingredient_offsets,
+        ingredient_codes=ingredient_codes,
+        vocab_names=[parsed[code].name for code in used_codes],
+        vocab_grams=np.array([parsed[code].grams for code in used_codes], dtype=np.float32),
+        vocab_food=vocab_food,
+        vocab_values=vocab_values,
+        food_names=[engine.names[row] for row in food_rows],
+    )
+    return RecipeNutrientTable(arrays)
+
+
+if __name__ == '__main__':
+    # Example usage (assuming the preprocessed CSV files exist)
+    # Run from the repository root so that the `src` package and the data paths resolve:
+    #     python -m src.preprocess.recipe_nutrient_builder
+    food_engine = NutrientEngine.from_csv(DEFAULT_FOOD_DB_PATH)
+    recipe_df = pd.read_csv(DEFAULT_RECIPE_CSV_PATH)
+    table = build_recipe_nutrient_table(recipe_df, food_engine)
+    print(f'{len(table)} dishes (from {len(recipe_df)} recipes)')
+    table.save(DEFAULT_RECIPE_TABLE_PATH)
@@ -0,0 +1,223 @@
+"""
+오프셋 인덱스 기반 Docstore 모듈
+청크 텍스트와 메타데이터를 각각 하나의 연속 파일에 저장하고,
+오프셋 배열로 필요한 청크만 읽어옵니다. (pickle 역직렬화 없음)
+
+저장 파일 (faiss_index 디렉토리):
+    docstore_text.bin   : 청크 텍스트 UTF-8 바이트를 이어붙인 파일
+    docstore_meta.jsonl : 청크 메타데이터 JSON을 한 줄씩 이어붙인 파일
+    docstore_offsets.npy: (N + 1, 2) int64 오프셋 [텍스트 시작, 메타데이터 시작]
+    docstore.json       : 청크 ID 목록 (행 번호 = FAISS 인덱스 위치)
+
+OffsetDocstore는 저장된 파일을 읽고, OffsetDocstoreWriter는 청크를 추가하는 즉시 파일에 기록합니다.
+"""
+
+import json
+import mmap
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from langchain.schema import Document
+from langchain_community.docstore.base import AddableMixin, Docstore
+
+DOCSTORE_VERSION = 1
+TEXT_FILENAME = "docstore_text.bin"
+META_FILENAME = "docstore_meta.jsonl"
+OFFSETS_FILENAME = "docstore_offsets.npy"
+INDEX_FILENAME = "docstore.json"
+DOCSTORE_FILENAMES = (TEXT_FILENAME, META_FILENAME, OFFSETS_FILENAME, INDEX_FILENAME)
+
+
+def docstore_exists(folder: Union[str, Path]) -> bool:
+    """폴더에 오프셋 Docstore 파일이 모두 있는지 확인합니다."""
+    folder = Path(folder)
+    return all((folder / name).exists() for name in DOCSTORE_FILENAMES)
+
+
+def _open_mmap(path: Path) -> Optional[mmap.mmap]:
+    """파일을 읽기 전용 mmap으로 엽니다 (빈 파일이면 None)."""
+    if path.stat().st_size == 0:
+        return None
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class OffsetDocstore(Docstore, AddableMixin):
+    """디스크의 청크를 요청 시점에만 읽는 Docstore"""
+
+    def __init__(self, folder: Union[str, Path]):
+        """
+        Args:
+            folder: Docstore 파일이 있는 디렉토리
+        """
+        folder = Path(folder)
+        with open(folder / INDEX_FILENAME, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != DOCSTORE_VERSION:
+            raise ValueError(f"Unsupported docstore version: {index.get('version')}")
+
+        self.folder = folder
+        self.ids: List[str] = index["ids"]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self._offsets = np.load(folder / OFFSETS_FILENAME, mmap_mode="r")
+        self._text = _open_mmap(folder / TEXT_FILENAME)
+        self._meta = _open_mmap(folder / META_FILENAME)
+
+        # 로드 이후 추가/삭제된 항목 (저장 시 파일에 반영)
+        self._added: Dict[str, Document] = {}
+        self._deleted: set = set()
+
+    def __len__(self) -> int:
+        return len(self._row_of) - len(self._deleted) + len(self._added)
+
+    def _read_row(self, row: int, doc_id: str) -> Document:
+        """행 번호의 텍스트/메타데이터만 파일에서 읽습니다."""
+        text_start, meta_start = (int(v) for v in self._offsets[row])
+        text_end, meta_end = (int(v) for v in self._offsets[row + 1])
+        text = self._text[text_start:text_end].decode("utf-8") if self._text else ""
+        metadata = json.loads(self._meta[meta_start:meta_end]) if self._meta else {}
+        return Document(id=doc_id, page_content=text, metadata=metadata)
+
+    def search(self, search: str) -> Union[str, Document]:
+        """
+        ID로 청크를 찾습니다.
+
+        Args:
+            search: 청크 ID
+
+        Returns:
+            Document (없으면 InMemoryDocstore와 같은 안내 문자열)
+        """
+        if search in self._added:
+            return self._added[search]
+        row = self._row_of.get(search)
+        if row is None or search in self._deleted:
+            return f"ID {search} not found."
+        return self._read_row(row, search)
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """청크를 추가합니다. (기존 ID와 겹치면 ValueError)"""
+        overlapping = [
+            doc_id for doc_id in texts
+            if doc_id in self._added or (doc_id in self._row_of and doc_id not in self._deleted)
+        ]
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        self._added.update(texts)
+
+    def delete(self, ids: List) -> None:
+        """청크를 삭제합니다. (없는 ID가 있으면 ValueError)"""
+        missing = [doc_id for doc_id in ids if isinstance(self.search(doc_id), str)]
+        if missing:
+            raise ValueError(f"Tried to delete ids that does not exist: {missing}")
+        for doc_id in ids:
+            if self._added.pop(doc_id, None) is None:
+                self._deleted.add(doc_id)
+
+    @staticmethod
+    def write(
+        folder: Union[str, Path],
+        docstore: Docstore,
+        index_to_docstore_id: Dict[int, str]
+    ) -> None:
+        """
+        Docstore를 FAISS 인덱스 위치 순서대로 오프셋 형식 파일에 기록합니다.
+
+        Args:
+            folder: 저장할 디렉토리
+            docstore: 기록할 Docstore (InMemoryDocstore 또는 OffsetDocstore)
+            index_to_docstore_id: FAISS 인덱스 위치 → 청크 ID
+        """
+        writer = OffsetDocstoreWriter(folder)
+        try:
+            for i in range(len(index_to_docstore_id)):
+                doc_id = index_to_docstore_id[i]
+                doc = docstore.search(doc_id)
+                if isinstance(doc, str):
+                    raise ValueError(f"Could not find document for id {doc_id}, got {doc}")
+                writer.add({doc_id: doc})
+        finally:
+            writer.close()
+
+
+class OffsetDocstoreWriter(Docstore, AddableMixin):
+    """
+    추가하는 즉시 청크를 오프셋 형식 파일 끝에 기록하는 Docstore (스트리밍 생성용)
+    추가한 순서가 행 번호가 되므로 FAISS 인덱스에 벡터를 넣는 순서대로 add해야 합니다.
+    close() 이후에는 OffsetDocstore(folder)로 읽습니다.
+    """
+
+    def __init__(self, folder: Union[str, Path]):
+        """
+        Args:
+            folder: Docstore 파일을 기록할 디렉토리
+        """
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._offsets: List[Tuple[int, int]] = [(0, 0)]
+        self._text_file = open(self.folder / TEXT_FILENAME, "w+b")
+        self._meta_file = open(self.folder / META_FILENAME, "w+b")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, search: str) -> Union[str, Document]:
+        """
+        ID로 이미 기록한 청크를 찾습니다.
+
+        Args:
+            search: 청크 ID
+
+        Returns:
+            Document (없으면 InMemoryDocstore와 같은 안내 문자열)
+        """
+        row = self._row_of.get(search)
+        if row is None:
+            return f"ID {search} not found."
+        (text_start, meta_start), (text_end, meta_end) = self._offsets[row], self._offsets[row + 1]
+        text = self._read(self._text_file, text_start, text_end).decode("utf-8")
+        metadata = json.loads(self._read(self._meta_file, meta_start, meta_end))
+        return Document(id=search, page_content=text, metadata=metadata)
+
+    @staticmethod
+    def _read(file, start: int, end: int) -> bytes:
+        """쓰는 중인 파일의 [start, end) 바이트를 읽고 쓰기 위치를 끝으로 되돌립니다."""
+        file.flush()
+        file.seek(start)
+        data = file.read(end - start)
+        file.seek(0, 2)
+        return data
+
+    def add(self, texts: Dict[str, Document]) -> None:
+        """청크를 추가 순서대로 파일 끝에 기록합니다. (기존 ID와 겹치면 ValueError)"""
+        overlapping = [doc_id for doc_id in texts if doc_id in self._row_of]
+        if overlapping:
+            raise ValueError(f"Tried to add ids that already exist: {overlapping}")
+        text_pos, meta_pos = self._offsets[-1]
+        for doc_id, doc in texts.items():
+            text_bytes = doc.page_content.encode("utf-8")
+            meta_bytes = (json.dumps(doc.metadata, ensure_ascii=False) + "\n").encode("utf-8")
+            self._text_file.write(text_bytes)
+            self._meta_file.write(meta_bytes)
+            text_pos += len(text_bytes)
+            meta_pos += len(meta_bytes)
+            self._row_of[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+            self._offsets.append((text_pos, meta_pos))
+
+    def delete(self, ids: List) -> None:
+        """기록한 파일은 덧붙이기만 하므로 삭제는 지원하지 않습니다."""
+        raise NotImplementedError("OffsetDocstoreWriter is append-only")
+
+    def close(self) -> None:
+        """파일을 닫고 오프셋 배열과 청크 ID 목록을 기록합니다."""
+        if self._text_file.closed:
+            return
+        self._text_file.close()
+        self._meta_file.close()
+        np.save(self.folder / OFFSETS_FILENAME, np.asarray(self._offsets, dtype=np.int64).reshape(-1, 2))
+        with open(self.folder / INDEX_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"version": DOCSTORE_VERSION, "ids": self.ids}, f, ensure_ascii=False)
@@ -0,0 +1,227 @@
+"""
+임베딩 캐시 모듈
+(모델명, 정규화된 텍스트 해시)를 키로 임베딩 벡터를 SQLite에 저장하여
+인덱스 생성과 쿼리 검색에서 같은 텍스트를 다시 임베딩하지 않도록 합니다.
+"""
+
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 생성을 위해 텍스트를 정규화합니다 (NFC, 공백 정리)."""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class EmbeddingCache:
+    """SQLite 기반 임베딩 저장소 (float32 BLOB, LRU 크기 제한)"""
+
+    def __init__(self, cache_path: str, max_entries: int = 100_000):
+        """
+        Args:
+            cache_path: SQLite 파일 경로
+            max_entries: 최대 저장 벡터 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """(모델명, 정규화된 텍스트) 해시 키를 만듭니다."""
+        return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        여러 키의 벡터를 조회하고 사용 시각을 갱신합니다.
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            {키: 벡터} (없는 키는 포함되지 않음)
+        """
+        found: Dict[str, List[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]):
+        """
+        벡터를 저장하고 크기 제한을 넘으면 LRU 순으로 삭제합니다.
+
+        Args:
+            model: 임베딩 모델명
+            items: {키: 벡터}
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (key, model, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+            self._conn.commit()
+
+    def clear(self):
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 모델을 감싸 캐시에 없는 텍스트만 실제로 임베딩하는 클래스"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache_path: str,
+        max_entries: int = 100_000
+    ):
+        """
+        Args:
+            embeddings: 실제 임베딩 모델 (예: OpenAIEmbeddings)
+            model_name: 캐시 키에 포함할 모델명
+            cache_path: SQLite 캐시 파일 경로
+            max_entries: 최대 캐시 항목 수
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = EmbeddingCache(cache_path, max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _lookup(self, texts: List[str]):
+        """캐시를 조회하고 (키 리스트, 캐시 결과, 임베딩이 필요한 텍스트)를 반환합니다."""
+        keys = [self.cache.make_key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # 같은 배치 안의 중복 텍스트는 한 번만 임베딩
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        with self._stats_lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+        return keys, cached, missing
+
+    def _store(self, keys, cached, missing, vectors) -> List[List[float]]:
+        """새로 임베딩한 벡터를 저장하고 입력 순서대로 결과를 조립합니다."""
+        new_items = dict(zip(missing.keys(), vectors))
+        self.cache.put_many(self.model_name, new_items)
+        cached.update(new_items)
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._lookup(texts)
+        vectors = self.embeddings.embed_documents(list(missing.values())) if missing else []
+        return self._store(keys, cached, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, cached, missing = self._lookup([text])
+        vectors = [self.embeddings.embed_query(text)] if missing else []
+        return self._store(keys, cached, missing, vectors)[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._lookup(texts)
+        vectors = await self.embeddings.aembed_documents(list(missing.values())) if missing else []
+        return self._store(keys, cached, missing, vectors)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, cached, missing = self._lookup([text])
+        vectors = [await self.embeddings.aembed_query(text)] if missing else []
+        return self._store(keys, cached, missing, vectors)[0]
+
+    def stats(self) -> dict:
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            hits, misses, hit_rate, entries를 담은 딕셔너리
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.cache),
+        }
+
+    def reset_stats(self):
+        """적중 카운터를 초기화합니다."""
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,254 @@
+"""
+임베딩 스케줄러 모듈
+청크를 토큰 예산 단위 배치로 묶어 asyncio로 동시에 요청하고,
+토큰 버킷으로 분당 토큰/요청 한도를 지키며 429 응답 시 백오프합니다.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+def _default_token_counter() -> Callable[[str], int]:
+    """tiktoken이 있으면 cl100k_base로, 없으면 글자 수로 토큰 수를 추정합니다."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        # 한글은 대략 글자당 1토큰 이하이므로 글자 수를 상한으로 사용
+        return len
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """429 (Rate limit) 응답인지 확인합니다."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """응답 헤더의 Retry-After 값을 초 단위로 반환합니다."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    분당 한도를 초당 보충량으로 나누어 적용하는 토큰 버킷
+    여러 스레드의 이벤트 루프가 같은 버킷을 공유할 수 있도록 threading.Lock으로 보호하고,
+    모자란 양은 미리 차감(예약)한 뒤 보충될 때까지 기다립니다. (요청 순서대로 발급)
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: 분당 허용량 (토큰 또는 요청 수)
+            capacity: 버킷 최대 용량 (None이면 per_minute)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float):
+        """amount만큼 사용할 수 있을 때까지 기다린 뒤 차감합니다."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            # 음수가 되면 그만큼 앞으로 보충될 양을 예약한 것
+            self.tokens -= amount
+            wait = max(self.blocked_until - time.monotonic(), -self.tokens / self.rate)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            # 기다리는 동안 다른 요청이 429를 받았으면 막힌 시간만큼 더 대기
+            with self._lock:
+                wait = self.blocked_until - time.monotonic()
+
+    def penalize(self, seconds: float):
+        """429를 받으면 버킷을 비우고 지정 시간 동안 발급을 멈춥니다."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+@dataclass
+class EmbeddingThroughput:
+    """임베딩 처리량 통계"""
+    chunks: int = 0
+    tokens: int = 0
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.chunks} chunks / {self.tokens} tokens in {self.seconds:.1f}s "
+            f"({self.chunks_per_second:.1f} chunks/s, {self.tokens_per_second:.0f} tokens/s, "
+            f"{self.requests} requests, {self.retries} retries, {self.rate_limited} rate limited)"
+        )
+
+
+class EmbeddingScheduler:
+    """
+    토큰 예산 배치 + 동시 요청 + 429 백오프를 적용하는 임베딩 스케줄러
+    TPM/RPM 버킷은 스케줄러 하나에 하나씩 있으므로, 여러 스레드에서 embed를 동시에 호출해도
+    한도와 429 대기 상태를 함께 씁니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_tokens_per_batch: int = 8000,
+        max_texts_per_batch: int = 256,
+        max_concurrency: int = 4,
+        tokens_per_minute: int = 1_000_000,
+        requests_per_minute: int = 3000,
+        max_retries: int = 6,
+        backoff_seconds: float = 1.0,
+        token_counter: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Args:
+            embeddings: 임베딩 모델 (aembed_documents 사용)
+            max_tokens_per_batch: 한 요청에 담을 최대 토큰 수
+            max_texts_per_batch: 한 요청에 담을 최대 텍스트 수
+            max_concurrency: 동시에 진행할 요청 수
+            tokens_per_minute: 분당 토큰 한도 (TPM)
+            requests_per_minute: 분당 요청 한도 (RPM)
+            max_retries: 429/일시 오류 시 최대 재시도 횟수
+            backoff_seconds: 지수 백오프 기본 대기 시간
+            token_counter: 텍스트의 토큰 수를 세는 함수 (None이면 tiktoken/글자 수)
+        """
+        self.embeddings = embeddings
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_texts_per_batch = max_texts_per_batch
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.count_tokens = token_counter or _default_token_counter()
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.last_stats = EmbeddingThroughput()
+
+    def make_batches(self, token_counts: List[int]) -> List[List[int]]:
+        """
+        입력 순서를 유지하며 토큰 예산과 텍스트 수 한도 안에서 인덱스를 배치로 묶습니다.
+
+        Args:
+            token_counts: 텍스트별 토큰 수
+
+        Returns:
+            배치별 텍스트 인덱스 리스트
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i, tokens in enumerate(token_counts):
+            full = (
+                len(current) >= self.max_texts_per_batch
+                or current_tokens + tokens > self.max_tokens_per_batch
+            )
+            if current and full:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트를 배치로 나누어 동시에 임베딩합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+
+        Returns:
+            입력 순서와 같은 벡터 리스트
+        """
+        stats = EmbeddingThroughput(chunks=len(texts))
+        started = time.perf_counter()
+
+        token_counts = [self.count_tokens(text) for text in texts]
+        stats.tokens = sum(token_counts)
+        batches = self.make_batches(token_counts)
+
+        token_bucket = self.token_bucket
+        request_bucket = self.request_bucket
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        async def run_batch(indices: List[int]):
+            batch_texts = [texts[i] for i in indices]
+            batch_tokens = sum(token_counts[i] for i in indices)
+            async with semaphore:
+                for attempt in range(self.max_retries + 1):
+                    await request_bucket.acquire(1)
+                    await token_bucket.acquire(batch_tokens)
+                    stats.requests += 1
+                    try:
+                        vectors = await self.embeddings.aembed_documents(batch_texts)
+                        break
+                    except Exception as e:
+                        if attempt == self.max_retries:
+                            raise
+                        stats.retries += 1
+                        delay = self.backoff_seconds * (2 ** attempt) * (1 + random.random())
+                        if _is_rate_limit_error(e):
+                            stats.rate_limited += 1
+                            delay = _retry_after_seconds(e) or delay
+                            # 모든 동시 요청이 함께 쉬도록 버킷 자체를 막음
+                            token_bucket.penalize(delay)
+                            request_bucket.penalize(delay)
+                        await asyncio.sleep(delay)
+            for i, vector in zip(indices, vectors):
+                results[i] = vector
+
+        await asyncio.gather(*(run_batch(indices) for indices in batches))
+
+        stats.seconds = time.perf_counter() - started
+        self.last_stats = stats
+        return results
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        aembed의 동기 버전입니다. 이미 이벤트 루프가 도는 환경(Jupyter 등)에서는
+        별도 스레드에서 실행합니다.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aembed(texts))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aembed(texts)).result()
@@ -0,0 +1,118 @@
+"""
+인덱스 벤치마크 모듈
+flat(정확 검색) 결과를 기준으로 ANN 인덱스 설정별 recall@k와 검색 지연시간을 비교합니다.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+
+from .index_factory import create_faiss_index, set_search_params
+
+# 기본 비교 설정: (이름, 인덱스 유형, 생성 파라미터, 검색 파라미터)
+DEFAULT_CONFIGS = [
+    {"name": "flat", "index_type": "flat"},
+    {"name": "ivf (nprobe=1)", "index_type": "ivf", "search": {"nprobe": 1}},
+    {"name": "ivf (nprobe=8)", "index_type": "ivf", "search": {"nprobe": 8}},
+    {"name": "hnsw32 (efSearch=16)", "index_type": "hnsw", "search": {"ef_search": 16}},
+    {"name": "hnsw32 (efSearch=64)", "index_type": "hnsw", "search": {"ef_search": 64}},
+    {"name": "ivfpq (nprobe=8)", "index_type": "ivfpq", "search": {"nprobe": 8}},
+    {"name": "sq8", "index_type": "sq8"},
+]
+
+
+def benchmark_index_types(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    configs: Optional[List[dict]] = None,
+    k: int = 4,
+) -> List[Dict]:
+    """
+    설정별로 인덱스를 만들어 recall@k, 지연시간, 인덱스 크기를 측정합니다.
+
+    Args:
+        vectors: (N, dim) 인덱싱할 벡터
+        queries: (Q, dim) 검색 쿼리 벡터
+        configs: 비교할 설정 리스트 (None이면 DEFAULT_CONFIGS)
+            {"name", "index_type", "params": 생성 파라미터, "search": 검색 파라미터}
+        k: 검색할 이웃 수
+
+    Returns:
+        설정별 측정 결과 딕셔너리 리스트
+    """
+    faiss = dependable_faiss_import()
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+    # 기준 결과: 정확 검색
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    results = []
+    for config in configs or DEFAULT_CONFIGS:
+        started = time.perf_counter()
+        index = create_faiss_index(config["index_type"], vectors, **config.get("params", {}))
+        index.add(vectors)
+        build_seconds = time.perf_counter() - started
+        set_search_params(index, **config.get("search", {}))
+
+        # 쿼리를 하나씩 검색하여 요청 단위 지연시간 측정
+        latencies = []
+        found = np.empty_like(truth)
+        for i, query in enumerate(queries):
+            started = time.perf_counter()
+            _, ids = index.search(query[None, :], k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found[i] = ids[0]
+
+        recall = np.mean([
+            len(set(found[i]) & set(truth[i])) / k for i in range(len(queries))
+        ])
+        results.append({
+            "name": config["name"],
+            "recall_at_k": float(recall),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "build_s": build_seconds,
+            "size_mb": len(faiss.serialize_index(index)) / 1e6,
+        })
+    return results
+
+
+def format_report(results: List[Dict], k: int = 4) -> str:
+    """벤치마크 결과를 표 형태 문자열로 만듭니다."""
+    lines = [
+        f"{'config':<24}{f'recall@{k}':>10}{'p50 ms':>10}{'p95 ms':>10}{'build s':>10}{'size MB':>10}",
+        "-" * 74,
+    ]
+    for r in results:
+        lines.append(
+            f"{r['name']:<24}{r['recall_at_k']:>10.3f}{r['p50_ms']:>10.3f}"
+            f"{r['p95_ms']:>10.3f}{r['build_s']:>10.2f}{r['size_mb']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from .rag_setup import RAGSetup
+
+    load_dotenv()
+
+    # 저장된 벡터스토어의 벡터를 그대로 사용 (API 호출 없음)
+    rag_setup = RAGSetup()
+    vectorstore = rag_setup.load_vectorstore()
+    index = vectorstore.index
+    vectors = index.reconstruct_n(0, index.ntotal)
+
+    # 저장된 벡터에 약간의 잡음을 더해 쿼리로 사용
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(len(vectors), size=min(200, len(vectors)), replace=False)]
+    queries = sample + rng.normal(scale=0.01, size=sample.shape).astype(np.float32)
+
+    k = 4
+    print(f"Vectors: {len(vectors)}, queries: {len(queries)}, dim: {vectors.shape[1]}\n")
+    print(format_report(benchmark_index_types(vectors, queries, k=k), k=k))
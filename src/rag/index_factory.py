@@ -0,0 +1,119 @@
+"""
+FAISS 인덱스 생성 모듈
+정확 검색(flat) 외에 IVF, HNSW, IVF-PQ, 스칼라 양자화(SQ8) 인덱스를 만들고
+검색 파라미터(nprobe, efSearch)를 설정합니다.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+
+# 지원하는 인덱스 유형
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq", "sq8")
+
+
+def default_nlist(n_vectors: int) -> int:
+    """벡터 수에 맞는 IVF 클러스터 수 (약 4·√N, 클러스터당 학습 벡터 39개 이상)"""
+    return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39 or 1))
+
+
+def index_factory_string(
+    index_type: str,
+    dim: int,
+    n_vectors: int,
+    nlist: Optional[int] = None,
+    hnsw_m: int = 32,
+    pq_m: Optional[int] = None,
+    pq_nbits: int = 8,
+) -> str:
+    """
+    인덱스 유형을 faiss.index_factory 문자열로 변환합니다.
+
+    Args:
+        index_type: 'flat', 'ivf', 'hnsw', 'ivfpq', 'sq8' 중 하나
+        dim: 벡터 차원
+        n_vectors: 학습/추가할 벡터 수 (nlist 기본값 계산용)
+        nlist: IVF 클러스터 수 (None이면 default_nlist)
+        hnsw_m: HNSW 그래프 이웃 수
+        pq_m: PQ 서브벡터 수 (None이면 dim을 나누는 값 중 dim/16에 가까운 값)
+        pq_nbits: PQ 서브벡터당 비트 수
+
+    Returns:
+        index_factory 문자열
+    """
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{hnsw_m}"
+    if index_type == "sq8":
+        return "SQ8"
+
+    nlist = min(nlist or default_nlist(n_vectors), max(1, n_vectors))
+    if index_type == "ivf":
+        return f"IVF{nlist},Flat"
+    if index_type == "ivfpq":
+        if pq_m is None:
+            pq_m = max(m for m in range(1, dim // 16 + 1) if dim % m == 0)
+        if dim % pq_m != 0:
+            raise ValueError(f"pq_m ({pq_m}) must divide the vector dimension ({dim})")
+        return f"IVF{nlist},PQ{pq_m}x{pq_nbits}"
+
+    raise ValueError(f"Unknown index type: {index_type} (choose from {INDEX_TYPES})")
+
+
+def create_faiss_index(
+    index_type: str,
+    training_vectors: np.ndarray,
+    ef_construction: Optional[int] = None,
+    **params,
+):
+    """
+    인덱스를 만들고 필요하면 학습까지 수행합니다. (벡터 추가는 하지 않음)
+
+    Args:
+        index_type: 인덱스 유형
+        training_vectors: (N, dim) float32 학습용 벡터 (flat/hnsw는 차원 확인에만 사용)
+        ef_construction: HNSW 생성 시 탐색 폭
+        **params: index_factory_string에 넘길 파라미터 (nlist, hnsw_m, pq_m, pq_nbits)
+
+    Returns:
+        faiss.Index
+    """
+    faiss = dependable_faiss_import()
+    training_vectors = np.ascontiguousarray(training_vectors, dtype=np.float32)
+    n_vectors, dim = training_vectors.shape
+
+    index = faiss.index_factory(dim, index_factory_string(index_type, dim, n_vectors, **params))
+    if ef_construction is not None and hasattr(index, "hnsw"):
+        index.hnsw.efConstruction = ef_construction
+    if hasattr(index, "do_polysemous_training"):
+        # polysemous 학습은 해밍 거리 필터링용으로 매우 느리고 여기서는 사용하지 않음
+        index.do_polysemous_training = False
+    if not index.is_trained:
+        index.train(training_vectors)
+    return index
+
+
+def set_search_params(
+    index,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+):
+    """
+    검색 파라미터를 인덱스에 적용합니다. (해당 파라미터가 없는 인덱스는 무시)
+
+    Args:
+        index: faiss.Index
+        nprobe: IVF 계열에서 탐색할 클러스터 수 (클수록 정확하고 느림)
+        ef_search: HNSW 탐색 폭 (클수록 정확하고 느림)
+    """
+    faiss = dependable_faiss_import()
+    if nprobe is not None:
+        try:
+            faiss.extract_index_ivf(index).nprobe = nprobe
+        except RuntimeError:
+            pass
+    if ef_search is not None and hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
@@ -0,0 +1,193 @@
+"""
+메타데이터 필터 검색 모듈
+청크 메타데이터(source_file, page 등)를 FAISS 인덱스 위치 순서의 열(column)로 저장해 두고,
+조건에 맞는 위치만 비트맵 ID 셀렉터로 FAISS 검색에 넘겨 필터를 검색 단계에서 적용합니다.
+
+저장 파일 (faiss_index 디렉토리):
+    metadata_index.json: 청크 ID 목록과 키별 메타데이터 열 (행 번호 = FAISS 인덱스 위치)
+"""
+
+import json
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+
+METADATA_INDEX_FILENAME = "metadata_index.json"
+
+# 기본으로 열을 만드는 메타데이터 키
+DEFAULT_FILTER_KEYS = ("source_file", "page")
+
+
+def _normalize(value: Any) -> Any:
+    """문자열 값은 NFC로 정규화합니다. (macOS에서 만든 파일명은 NFD로 저장되어 있을 수 있음)"""
+    return unicodedata.normalize("NFC", value) if isinstance(value, str) else value
+
+
+class MetadataIndex:
+    """FAISS 인덱스 위치별 메타데이터 열과 조건별 위치 마스크"""
+
+    def __init__(self, ids: List[str], columns: Dict[str, List[Any]]):
+        """
+        Args:
+            ids: 행 번호별 청크 ID
+            columns: 메타데이터 키 → 행 번호별 값 리스트 (값이 없으면 None)
+        """
+        self.ids = ids
+        self.columns = columns
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._value_masks: Dict[Tuple[str, Any], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, vectorstore, keys: Sequence[str] = DEFAULT_FILTER_KEYS) -> "MetadataIndex":
+        """
+        벡터스토어의 Docstore에서 메타데이터 열을 만듭니다.
+
+        Args:
+            vectorstore: FAISS 벡터스토어
+            keys: 열로 만들 메타데이터 키
+
+        Returns:
+            MetadataIndex
+        """
+        ids = [vectorstore.index_to_docstore_id[i] for i in range(len(vectorstore.index_to_docstore_id))]
+        columns: Dict[str, List[Any]] = {key: [] for key in keys}
+        for doc_id in ids:
+            doc = vectorstore.docstore.search(doc_id)
+            metadata = {} if isinstance(doc, str) else doc.metadata
+            for key in keys:
+                columns[key].append(metadata.get(key))
+        return cls(ids, columns)
+
+    def _array(self, key: str) -> np.ndarray:
+        """열을 numpy 배열로 변환합니다. (숫자 열은 범위 비교가 가능하도록 float)"""
+        if key not in self._arrays:
+            if key not in self.columns:
+                raise KeyError(f"Metadata key '{key}' is not indexed (indexed: {list(self.columns)})")
+            values = self.columns[key]
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values if v is not None):
+                array = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                array = np.array([_normalize(v) for v in values], dtype=object)
+            self._arrays[key] = array
+        return self._arrays[key]
+
+    def _equals(self, key: str, value: Any) -> np.ndarray:
+        """key == value 인 행의 마스크 (값별로 한 번만 계산)"""
+        value = _normalize(value)
+        cache_key = (key, value)
+        if cache_key not in self._value_masks:
+            self._value_masks[cache_key] = self._array(key) == value
+        return self._value_masks[cache_key]
+
+    def mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        조건을 모두 만족하는 행의 불리언 마스크를 만듭니다.
+
+        Args:
+            where: 메타데이터 키 → 조건
+                스칼라: 값이 같은 행
+                list/set: 값이 그 중 하나인 행
+                tuple (최소, 최대): 값이 범위 안(양 끝 포함)인 행, None이면 그 쪽 제한 없음
+
+        Returns:
+            (N,) bool 배열
+        """
+        mask = np.ones(len(self.ids), dtype=bool)
+        for key, condition in where.items():
+            if isinstance(condition, tuple):
+                low, high = condition
+                array = self._array(key)
+                if low is not None:
+                    mask &= array >= low
+                if high is not None:
+                    mask &= array <= high
+            elif isinstance(condition, (list, set, frozenset)):
+                matched = np.zeros(len(self.ids), dtype=bool)
+                for value in condition:
+                    matched |= self._equals(key, value)
+                mask &= matched
+            else:
+                mask &= self._equals(key, condition)
+        return mask
+
+    def save(self, folder: Union[str, Path]) -> None:
+        """메타데이터 열을 json 파일로 저장합니다."""
+        with open(Path(folder) / METADATA_INDEX_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "columns": self.columns}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, folder: Union[str, Path]) -> "MetadataIndex":
+        """저장된 메타데이터 열을 로드합니다."""
+        with open(Path(folder) / METADATA_INDEX_FILENAME, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["ids"], data["columns"])
+
+    @staticmethod
+    def exists(folder: Union[str, Path]) -> bool:
+        """폴더에 저장된 메타데이터 열이 있는지 확인합니다."""
+        return (Path(folder) / METADATA_INDEX_FILENAME).exists()
+
+
+def _search_parameters(index, selector, exhaustive: bool = False):
+    """
+    인덱스 유형에 맞는 SearchParameters를 만듭니다.
+    파라미터 객체의 nprobe/efSearch 기본값이 인덱스 설정을 덮어쓰므로 현재 설정을 복사합니다.
+    """
+    faiss = dependable_faiss_import()
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        ivf = None
+    if ivf is not None:
+        nprobe = ivf.nlist if exhaustive else ivf.nprobe
+        return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+    if hasattr(index, "hnsw"):
+        ef_search = max(index.hnsw.efSearch, index.ntotal if exhaustive else 0)
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+    return faiss.SearchParameters(sel=selector)
+
+
+def filtered_search(
+    index,
+    query_vector: Sequence[float],
+    k: int,
+    mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    마스크에 해당하는 위치만 대상으로 FAISS 검색을 수행합니다.
+    ANN 인덱스(IVF/HNSW)가 필터 때문에 k개를 채우지 못하면
+    전체 클러스터/그래프를 탐색하도록 넓혀 한 번 더 검색합니다.
+
+    Args:
+        index: faiss.Index
+        query_vector: 쿼리 벡터
+        k: 반환할 개수 (조건에 맞는 행이 더 적으면 그 수만큼)
+        mask: (ntotal,) bool 위치 마스크
+
+    Returns:
+        (거리 배열, 위치 배열) - 유효한 결과만 포함
+    """
+    faiss = dependable_faiss_import()
+    k = min(k, int(np.count_nonzero(mask)))
+    if k == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    query = np.asarray([query_vector], dtype=np.float32)
+    # 셀렉터는 비트맵 메모리를 참조하므로 검색이 끝날 때까지 배열을 유지
+    bitmap = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bitmap))
+
+    distances, positions = index.search(query, k, params=_search_parameters(index, selector))
+    if np.count_nonzero(positions[0] >= 0) < k:
+        distances, positions = index.search(
+            query, k, params=_search_parameters(index, selector, exhaustive=True)
+        )
+
+    found = positions[0] >= 0
+    return distances[0][found], positions[0][found]
@@ -0,0 +1,164 @@
+"""
+영양성분 범위 검색 Retriever 모듈
+"칼륨 300mg 이하, 인 200mg 이하 찌개" 같은 쿼리를 임베딩/FAISS 대신
+식품성분표·레시피 영양성분 범위 색인(NutrientRangeIndex)으로 검색합니다.
+"""
+
+from typing import List, Optional, Tuple
+
+from langchain.schema import Document
+
+from src.nutrition.engine import NUTRIENT_COLUMNS
+from src.nutrition.range_index import NutrientQuery, NutrientRangeIndex, RangeMatch, parse_nutrient_query
+
+
+class NutrientRangeRetriever:
+    """영양성분 범위 조건으로 식품/레시피를 검색하는 클래스"""
+
+    def __init__(
+        self,
+        food_index: Optional[NutrientRangeIndex] = None,
+        recipe_index: Optional[NutrientRangeIndex] = None,
+        k: int = 10
+    ):
+        """
+        Args:
+            food_index: 식품성분표(100g당) 범위 색인
+            recipe_index: 레시피(1인분) 범위 색인
+            k: 반환할 최대 개수 (쿼리에 "5개"처럼 개수가 있으면 그 값 사용)
+        """
+        if food_index is None and recipe_index is None:
+            raise ValueError("NutrientRangeRetriever requires a food_index or a recipe_index")
+        self.indexes = {"food": food_index, "recipe": recipe_index}
+        self.k = k
+
+    @staticmethod
+    def parse(query: str) -> Optional[NutrientQuery]:
+        """쿼리에서 영양성분 범위 조건을 추출합니다. (조건이 없으면 None)"""
+        return parse_nutrient_query(query)
+
+    def is_range_query(self, query: str) -> bool:
+        """
+        범위 검색으로 답할 쿼리인지 확인합니다.
+        영양성분 조건이 있고, 검색 대상('레시피', '식품' 등)이나 식품군/요리·식품 이름 단어가 있어야 합니다.
+        ("하루 나트륨 2000mg 이하로 먹으려면 어떻게 해야 하나요?"처럼 조건만 있는 일반 질문은 제외)
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            범위 검색 대상이면 True
+        """
+        parsed = self.parse(query)
+        if parsed is None:
+            return False
+        if parsed.target is not None:
+            return True
+        indexes = [index for index in self.indexes.values() if index is not None]
+        return any(index.has_term(term) for term in parsed.terms for index in indexes)
+
+    def _choose(self, parsed: NutrientQuery) -> Tuple[str, NutrientRangeIndex]:
+        """
+        검색할 색인을 고릅니다.
+        '레시피/요리' 또는 '식품/재료' 단어가 있으면 그 색인, 식품군 이름이 있으면 식품 색인, 그 외에는 레시피 색인 우선
+        """
+        available = {name: index for name, index in self.indexes.items() if index is not None}
+        if parsed.target in available:
+            return parsed.target, available[parsed.target]
+        food_index = available.get("food")
+        if food_index is not None and any(food_index.group_mask(term) is not None for term in parsed.terms):
+            return "food", food_index
+        name = "recipe" if "recipe" in available else "food"
+        return name, available[name]
+
+    def search(self, query: str) -> Tuple[Optional[NutrientQuery], str, List[RangeMatch]]:
+        """
+        쿼리를 해석하고 범위 검색을 수행합니다.
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            (해석된 조건 또는 None, 검색한 색인 이름 'food'/'recipe', RangeMatch 리스트)
+        """
+        parsed = self.parse(query)
+        if parsed is None:
+            return None, "", []
+        name, index = self._choose(parsed)
+        return parsed, name, index.query(parsed, top_n=self.k)
+
+    def retrieve(self, query: str) -> List[Document]:
+        """
+        쿼리에 맞는 식품/레시피를 Document로 반환합니다. (영양성분 조건이 없으면 빈 리스트)
+
+        Args:
+            query: 검색 쿼리
+
+        Returns:
+            Document 리스트 (page_content: "이름 [식품군]: 영양성분", metadata: 영양성분 값)
+        """
+        _, name, matches = self.search(query)
+        index = self.indexes.get(name)
+        return [
+            Document(
+                page_content=match.format(),
+                metadata={
+                    "source": f"nutrient_range:{name}",
+                    "name": match.name,
+                    "group": match.group,
+                    "basis": index.basis,
+                    **{column: float(value) for column, value in zip(NUTRIENT_COLUMNS, match.amounts)},
+                },
+            )
+            for match in matches
+        ]
+
+    async def aretrieve(self, query: str) -> List[Document]:
+        """retrieve의 비동기 버전 (메모리 안에서 끝나므로 그대로 실행)"""
+        return self.retrieve(query)
+
+    def format_answer(self, query: str) -> Optional[str]:
+        """
+        범위 검색 결과를 사용자 응답 형식으로 만듭니다.
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            응답 문자열 (조건이 없거나 결과가 없으면 None)
+        """
+        parsed, name, matches = self.search(query)
+        if not matches:
+            return None
+        index = self.indexes[name]
+        kind = "레시피" if name == "recipe" else "식품"
+        lines = [
+            f"## 영양성분 조건 검색 결과 ({kind}, {index.basis} 기준)",
+            f"조건: {parsed.describe()}",
+            "",
+        ]
+        lines += [f"{rank}. {match.format()}" for rank, match in enumerate(matches, 1)]
+        return "\n".join(lines)
+
+
+def build_nutrient_range_retriever(
+    nutrient_engine=None,
+    recipe_table=None,
+    k: int = 10
+) -> NutrientRangeRetriever:
+    """
+    식품 영양성분 엔진과 레시피 영양성분 테이블로 범위 검색 Retriever를 만듭니다.
+
+    Args:
+        nutrient_engine: NutrientEngine (식품성분표 색인)
+        recipe_table: RecipeNutrientTable (레시피 색인)
+        k: 반환할 최대 개수
+
+    Returns:
+        NutrientRangeRetriever
+    """
+    return NutrientRangeRetriever(
+        food_index=NutrientRangeIndex.from_engine(nutrient_engine) if nutrient_engine is not None else None,
+        recipe_index=NutrientRangeIndex.from_recipe_table(recipe_table) if recipe_table is not None else None,
+        k=k,
+    )
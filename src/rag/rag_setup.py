@@ -4,15 +4,90 @@ PDF 문서를 로드하고 벡터스토어를 생성합니다.
 """
 
 import os
-from typing import List
+import json
+import time
+import shutil
+import tempfile
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+import numpy as np
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
+from langchain_community.docstore.base import Docstore
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+from .embedding_cache import CachedEmbeddings
+from .embedding_scheduler import EmbeddingScheduler
+from .docstore import OffsetDocstore, OffsetDocstoreWriter, docstore_exists
+from .index_factory import INDEX_TYPES, create_faiss_index, set_search_params
+from .sparse_index import SparseIndex
+from .metadata_filter import MetadataIndex
+
+
+# 벡터스토어 옆에 저장되는 파일/청크 해시 매니페스트
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 벡터를 추가하기 전에 학습이 필요한 인덱스 유형
+TRAINED_INDEX_TYPES = ("ivf", "ivfpq", "sq8")
+
+
+def _hash_file(path: Path) -> str:
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_text(text: str) -> str:
+    """청크 텍스트의 SHA-256 해시를 계산합니다."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_pdf_pages(pdf_path: str, start: int, end: int) -> List[Document]:
+    """
+    PDF의 [start, end) 페이지를 Document로 변환합니다. (프로세스 풀 작업 단위)
+
+    PyPDFLoader(PyPDFParser)와 같은 방식으로 페이지 텍스트를 추출하고,
+    문서 메타데이터(producer, creator, creationdate 등)까지 같은 키와 값으로 채웁니다.
+    """
+    from pypdf import PdfReader
+    from langchain_community.document_loaders.parsers.pdf import _purge_metadata
+
+    reader = PdfReader(pdf_path)
+    total_pages = len(reader.pages)
+    page_labels = reader.page_labels
+    source_file = Path(pdf_path).name
+    doc_metadata = _purge_metadata(
+        {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+        | dict(reader.metadata or {})
+        | {"source": pdf_path, "total_pages": total_pages}
+    )
+
+    documents = []
+    for page_number in range(start, min(end, total_pages)):
+        text = reader.pages[page_number].extract_text(extraction_mode="plain")
+        documents.append(Document(
+            page_content=text.strip(),
+            metadata={
+                **doc_metadata,
+                "page": page_number,
+                "page_label": page_labels[page_number],
+                "source_file": source_file,
+            }
+        ))
+    return documents
+
 
 class RAGSetup:
     """PDF 문서를 로드하고 벡터스토어를 생성하는 클래스"""
@@ -23,7 +98,26 @@ class RAGSetup:
         vectorstore_path: str = "./data/vectorstore",
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
-        embedding_model: str = 'text-embedding-3-small'
+        embedding_model: str = 'text-embedding-3-small',
+        use_embedding_cache: bool = True,
+        embedding_cache_path: Optional[str] = None,
+        embedding_cache_size: int = 100_000,
+        ingest_workers: int = 1,
+        pages_per_task: int = 50,
+        streaming: bool = False,
+        embed_batch_size: int = 256,
+        max_in_flight_embeddings: int = 2,
+        embedding_concurrency: int = 4,
+        embedding_tokens_per_batch: int = 8000,
+        embedding_tokens_per_minute: int = 1_000_000,
+        embedding_requests_per_minute: int = 3000,
+        mmap_index: bool = True,
+        index_type: str = "flat",
+        index_params: Optional[dict] = None,
+        index_train_size: int = 20000,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        use_sparse_index: bool = True
     ):
         """
         Args:
@@ -31,11 +125,56 @@ class RAGSetup:
             vectorstore_path: 벡터스토어를 저장할 경로
             chunk_size: 텍스트 청크 크기
             chunk_overlap: 청크 간 오버랩 크기
+            embedding_model: 임베딩 모델명
+            use_embedding_cache: 임베딩 디스크 캐시 사용 여부 (인덱스 생성/쿼리 검색 공용)
+            embedding_cache_path: 캐시 파일 경로 (None이면 vectorstore_path/embedding_cache.sqlite)
+            embedding_cache_size: 캐시에 보관할 최대 벡터 수 (LRU 삭제)
+            ingest_workers: PDF 파싱 프로세스 수 (1이면 PyPDFLoader로 순차 로드)
+            pages_per_task: 병렬 파싱 시 큰 PDF를 나누는 페이지 범위 크기
+            streaming: True면 로드→분할→임베딩→인덱스 추가를 배치 단위로 흘려보내며 생성
+                (청크는 배치마다 Docstore 파일에 기록하여 전체 페이지/청크를 메모리에 올리지 않음)
+            embed_batch_size: 스트리밍 생성 시 한 번에 임베딩하는 청크 수
+            max_in_flight_embeddings: 스트리밍 생성 시 동시에 임베딩하는 배치 수
+                (동시 HTTP 요청은 최대 max_in_flight_embeddings × embedding_concurrency)
+            embedding_concurrency: 임베딩 스케줄러의 동시 요청 수
+            embedding_tokens_per_batch: 임베딩 요청 하나에 담을 최대 토큰 수
+            embedding_tokens_per_minute: 임베딩 API 분당 토큰 한도 (TPM)
+            embedding_requests_per_minute: 임베딩 API 분당 요청 한도 (RPM)
+            mmap_index: 인덱스를 읽기 전용 mmap으로 로드 (여러 워커가 같은 페이지를 공유)
+            index_type: FAISS 인덱스 유형 ('flat', 'ivf', 'hnsw', 'ivfpq', 'sq8')
+                flat 외의 유형은 변경 시 증분 갱신 대신 전체 재생성 (임베딩 캐시로 재임베딩 없음)
+            index_params: 인덱스 파라미터 (nlist, hnsw_m, ef_construction, pq_m, pq_nbits)
+            index_train_size: 스트리밍 생성 시 IVF/PQ/SQ 학습에 모을 벡터 수
+            nprobe: IVF 계열 인덱스에서 탐색할 클러스터 수 (None이면 인덱스 기본값)
+            ef_search: HNSW 인덱스 탐색 폭 (None이면 인덱스 기본값)
+                검색 파라미터는 인덱스를 만들거나 로드할 때 한 번만 적용하므로,
+                같은 벡터스토어를 쓰는 모든 retriever가 같은 값을 사용합니다.
+            use_sparse_index: 벡터스토어를 저장할 때 BM25 희소 인덱스도 함께 생성 (하이브리드 검색용)
         """
         self.pdf_directory = Path(pdf_directory)
         self.vectorstore_path = Path(vectorstore_path)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.embedding_model = embedding_model
+        self.ingest_workers = max(1, ingest_workers)
+        self.pages_per_task = max(1, pages_per_task)
+        self.streaming = streaming
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.max_in_flight_embeddings = max(1, max_in_flight_embeddings)
+        self.mmap_index = mmap_index
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type} (choose from {INDEX_TYPES})")
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.index_train_size = index_train_size
+        self.search_params = {"nprobe": nprobe, "ef_search": ef_search}
+        self.use_sparse_index = use_sparse_index
+        self.scheduler_config = {
+            "max_concurrency": embedding_concurrency,
+            "max_tokens_per_batch": embedding_tokens_per_batch,
+            "tokens_per_minute": embedding_tokens_per_minute,
+            "requests_per_minute": embedding_requests_per_minute,
+        }
 
         # 텍스트 분할기 초기화
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -44,40 +183,119 @@ class RAGSetup:
             separators=["\n\n", "\n", ".", " ", ""]
         )
 
-        # 임베딩 모델 초기화
+        # 임베딩 모델 초기화 (캐시를 감싸면 load_local로 넘긴 쿼리 임베딩에도 적용됨)
         self.embeddings = OpenAIEmbeddings(model=embedding_model)
+        if use_embedding_cache:
+            cache_path = embedding_cache_path or str(self.vectorstore_path / "embedding_cache.sqlite")
+            self.embeddings = CachedEmbeddings(
+                self.embeddings,
+                model_name=embedding_model,
+                cache_path=cache_path,
+                max_entries=embedding_cache_size,
+            )
+        # 스트리밍 생성의 동시 배치들이 TPM/RPM 한도와 429 대기 상태를 함께 쓰도록 스케줄러는 하나만 둠
+        self.embedding_scheduler = EmbeddingScheduler(self.embeddings, **self.scheduler_config)
+
+    @property
+    def index_path(self) -> Path:
+        """FAISS 인덱스 디렉토리 경로"""
+        return self.vectorstore_path / "faiss_index"
+
+    @property
+    def manifest_path(self) -> Path:
+        """파일/청크 해시 매니페스트 경로"""
+        return self.index_path / MANIFEST_FILENAME
+
+    def list_pdf_files(self) -> List[Path]:
+        """
+        PDF 디렉토리의 PDF 파일 목록을 이름순으로 반환합니다.
+
+        Returns:
+            PDF 파일 경로 리스트
+        """
+        return sorted(self.pdf_directory.glob("*.pdf"))
 
-    def load_pdfs(self) -> List[Document]:
+    def load_pdfs(self, pdf_files: Optional[List[Path]] = None) -> List[Document]:
         """
-        PDF 디렉토리에서 모든 PDF 파일을 로드합니다.
+        PDF 디렉토리에서 PDF 파일을 로드합니다.
+
+        Args:
+            pdf_files: 로드할 PDF 파일 목록 (None이면 디렉토리의 모든 PDF)
 
         Returns:
             Document 객체 리스트
         """
-        documents = []
+        documents = list(self.iter_pages(pdf_files))
+        print(f"Loaded {len(documents)} pages total")
+        return documents
+
+    def iter_pages(self, pdf_files: Optional[List[Path]] = None) -> Iterator[Document]:
+        """
+        PDF 페이지를 (파일 순서, 페이지 순서)대로 하나씩 생성합니다.
 
+        Args:
+            pdf_files: 로드할 PDF 파일 목록 (None이면 디렉토리의 모든 PDF)
+
+        Yields:
+            페이지 단위 Document 객체
+        """
         # PDF 파일 찾기
-        pdf_files = list(self.pdf_directory.glob("*.pdf"))
+        if pdf_files is None:
+            pdf_files = self.list_pdf_files()
 
         if not pdf_files:
             raise FileNotFoundError(f"No PDF files found in {self.pdf_directory}")
 
         print(f"Found {len(pdf_files)} PDF files")
 
+        if self.ingest_workers > 1:
+            yield from self._iter_pages_parallel(pdf_files)
+            return
+
         # 각 PDF 로드
         for pdf_path in pdf_files:
             print(f"Loading: {pdf_path.name}")
             loader = PyPDFLoader(str(pdf_path))
-            docs = loader.load()
 
             # 메타데이터에 파일명 추가
-            for doc in docs:
+            for doc in loader.lazy_load():
                 doc.metadata["source_file"] = pdf_path.name
+                yield doc
 
-            documents.extend(docs)
+    def _iter_pages_parallel(self, pdf_files: List[Path]) -> Iterator[Document]:
+        """
+        프로세스 풀로 PDF를 페이지 범위 단위로 나누어 병렬 파싱합니다.
+        결과는 (파일 순서, 페이지 순서)로 항상 동일하게 정렬되며,
+        미리 제출하는 작업 수를 워커 수의 2배로 제한하여 메모리 사용량을 묶어둡니다.
 
-        print(f"Loaded {len(documents)} pages total")
-        return documents
+        Args:
+            pdf_files: 로드할 PDF 파일 목록
+
+        Yields:
+            페이지 단위 Document 객체
+        """
+        from pypdf import PdfReader
+
+        # (파일, 시작 페이지, 끝 페이지) 작업 목록 생성
+        tasks: List[Tuple[str, int, int]] = []
+        for pdf_path in pdf_files:
+            total_pages = len(PdfReader(str(pdf_path)).pages)
+            print(f"Loading: {pdf_path.name} ({total_pages} pages)")
+            for start in range(0, total_pages, self.pages_per_task):
+                tasks.append((str(pdf_path), start, start + self.pages_per_task))
+
+        workers = min(self.ingest_workers, len(tasks)) or 1
+        print(f"Parsing {len(tasks)} page ranges with {workers} workers")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 제출 순서대로 결과를 꺼내므로 출력 순서가 결정적
+            pending: Deque[Future] = deque()
+            for task in tasks:
+                pending.append(executor.submit(_load_pdf_pages, *task))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
 
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -94,6 +312,55 @@ class RAGSetup:
         print(f"Created {len(chunks)} chunks")
         return chunks
 
+    def assign_chunk_ids(
+        self,
+        chunks: List[Document],
+        ordinals: Optional[Dict[str, int]] = None
+    ) -> List[str]:
+        """
+        청크마다 (파일명, 파일 내 순번, 내용 해시) 기반의 결정적 ID를 부여합니다.
+
+        Args:
+            chunks: 분할된 Document 객체 리스트 (파일 순서대로 정렬된 상태)
+            ordinals: 파일별 다음 순번 (스트리밍 처리 시 호출 간 공유)
+
+        Returns:
+            청크 ID 리스트 (chunks와 같은 순서)
+        """
+        if ordinals is None:
+            ordinals = {}
+        ids = []
+        for chunk in chunks:
+            source_file = chunk.metadata.get("source_file", "")
+            ordinal = ordinals.get(source_file, 0)
+            ordinals[source_file] = ordinal + 1
+
+            text_hash = _hash_text(chunk.page_content)
+            chunk.metadata["chunk_hash"] = text_hash
+            chunk_id = hashlib.sha256(
+                f"{source_file}\x00{ordinal}\x00{text_hash}".encode("utf-8")
+            ).hexdigest()[:32]
+            chunk.id = chunk_id
+            ids.append(chunk_id)
+        return ids
+
+    def iter_chunks(self, pdf_files: Optional[List[Path]] = None) -> Iterator[Document]:
+        """
+        페이지를 읽는 즉시 청크로 분할하여 ID와 함께 하나씩 생성합니다.
+        페이지마다 독립적으로 분할하므로 split_documents와 같은 청크가 만들어집니다.
+
+        Args:
+            pdf_files: 로드할 PDF 파일 목록 (None이면 디렉토리의 모든 PDF)
+
+        Yields:
+            ID가 부여된 청크 Document
+        """
+        ordinals: Dict[str, int] = {}
+        for page in self.iter_pages(pdf_files):
+            chunks = self.text_splitter.split_documents([page])
+            self.assign_chunk_ids(chunks, ordinals)
+            yield from chunks
+
     def create_vectorstore(self, chunks: List[Document]) -> FAISS:
         """
         청크로부터 벡터스토어를 생성합니다.
@@ -105,80 +372,572 @@ class RAGSetup:
             FAISS 벡터스토어
         """
         print("Creating vector store...")
-        vectorstore = FAISS.from_documents(
-            documents=chunks,
-            embedding=self.embeddings
+        ids = [chunk.id for chunk in chunks] if all(chunk.id for chunk in chunks) else None
+        texts = [chunk.page_content for chunk in chunks]
+        vectors = self.embed_texts(texts, report=True)
+        vectorstore = self.create_empty_vectorstore(vectors)
+        vectorstore.add_embeddings(
+            text_embeddings=list(zip(texts, vectors)),
+            metadatas=[chunk.metadata for chunk in chunks],
+            ids=ids
         )
         print("Vector store created successfully")
+        self._print_cache_stats()
         return vectorstore
 
+    def create_empty_vectorstore(
+        self,
+        training_vectors: Union[List[List[float]], np.ndarray],
+        docstore: Optional[Docstore] = None
+    ) -> FAISS:
+        """
+        index_type에 맞는 빈 FAISS 벡터스토어를 만듭니다. (IVF/PQ/SQ는 학습까지 수행)
+
+        Args:
+            training_vectors: 학습용 벡터 (flat/hnsw는 차원 확인에만 사용)
+            docstore: 청크를 담을 Docstore (None이면 InMemoryDocstore)
+
+        Returns:
+            벡터가 없는 FAISS 벡터스토어
+        """
+        index = create_faiss_index(
+            self.index_type,
+            np.asarray(training_vectors, dtype=np.float32),
+            **self.index_params
+        )
+        set_search_params(index, **self.search_params)
+        print(f"Created {self.index_type} index ({type(index).__name__})")
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore if docstore is not None else InMemoryDocstore(),
+            index_to_docstore_id={},
+        )
+
+    def embed_texts(self, texts: List[str], report: bool = False) -> List[List[float]]:
+        """
+        임베딩 스케줄러로 텍스트를 토큰 예산 배치로 나누어 동시에 임베딩합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            report: True면 처리량(chunks/s, tokens/s)을 출력
+
+        Returns:
+            입력 순서와 같은 벡터 리스트
+        """
+        if not texts:
+            return []
+        vectors = self.embedding_scheduler.embed(texts)
+        if report:
+            print(f"Embedding throughput: {self.embedding_scheduler.last_stats}")
+        return vectors
+
+    def create_vectorstore_streaming(
+        self,
+        chunks: Iterable[Document],
+        chunk_refs: Optional[List[Tuple[str, str, str]]] = None
+    ) -> FAISS:
+        """
+        청크 스트림을 고정 크기 배치로 임베딩하면서 FAISS 인덱스에 바로 추가합니다.
+        청크 텍스트/메타데이터는 배치가 끝나는 즉시 vectorstore_path 아래 임시 디렉토리의
+        오프셋 Docstore 파일에 기록하므로, 메모리에는 임베딩 중인 배치(최대 max_in_flight_embeddings개)와
+        학습이 필요한 인덱스의 학습용 벡터(최대 index_train_size개, float32)만 남습니다.
+        동시에 임베딩하는 배치가 max_in_flight_embeddings개이고 배치마다 스케줄러가
+        embedding_concurrency개 요청을 보내므로, 동시 HTTP 요청은 최대 두 값의 곱입니다.
+        (TPM/RPM 한도는 공유 스케줄러가 전체에 적용)
+
+        Args:
+            chunks: ID가 부여된 청크 이터러블 (예: iter_chunks())
+            chunk_refs: 전달하면 (파일명, 청크 ID, 청크 해시)를 기록 (매니페스트용)
+
+        Returns:
+            FAISS 벡터스토어 (Docstore는 임시 디렉토리의 OffsetDocstore)
+        """
+        print(
+            f"Creating vector store (streaming, batch_size={self.embed_batch_size}, "
+            f"max_in_flight={self.max_in_flight_embeddings})..."
+        )
+        vectorstore: Optional[FAISS] = None
+        total = 0
+        started = time.perf_counter()
+
+        self.vectorstore_path.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix="streaming_docstore_", dir=self.vectorstore_path))
+        docstore = OffsetDocstoreWriter(staging)
+
+        # 학습이 필요한 인덱스는 index_train_size개가 모일 때까지 벡터만 보관 (청크는 이미 파일에 기록)
+        needs_training = self.index_type in TRAINED_INDEX_TYPES
+        training_vectors: List[np.ndarray] = []
+
+        def add_vectors(vectors: np.ndarray):
+            # Docstore 행 순서와 FAISS 인덱스 위치가 같도록 기록한 순서대로 추가
+            start = vectorstore.index.ntotal
+            vectorstore.index.add(vectors)
+            vectorstore.index_to_docstore_id.update(
+                (position, docstore.ids[position]) for position in range(start, vectorstore.index.ntotal)
+            )
+
+        def init_vectorstore():
+            nonlocal vectorstore
+            vectors = np.concatenate(training_vectors)
+            training_vectors.clear()
+            vectorstore = self.create_empty_vectorstore(vectors, docstore=docstore)
+            add_vectors(vectors)
+
+        def add_batch(batch: List[Document], vectors: List[List[float]]):
+            nonlocal total
+            docstore.add({c.id: c for c in batch})
+            if chunk_refs is not None:
+                chunk_refs.extend(self._chunk_ref(c) for c in batch)
+            total += len(batch)
+            print(f"Indexed {total} chunks")
+
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if vectorstore is not None:
+                add_vectors(vectors)
+                return
+            training_vectors.append(vectors)
+            collected = sum(len(v) for v in training_vectors)
+            if not needs_training or collected >= self.index_train_size:
+                init_vectorstore()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight_embeddings) as executor:
+                # 배치 순서대로 인덱스에 추가하여 결과가 결정적이도록 유지
+                pending: Deque[Tuple[List[Document], Future]] = deque()
+                batch: List[Document] = []
+
+                def submit(batch: List[Document]):
+                    texts = [c.page_content for c in batch]
+                    pending.append((batch, executor.submit(self.embed_texts, texts)))
+                    if len(pending) >= self.max_in_flight_embeddings:
+                        done_batch, future = pending.popleft()
+                        add_batch(done_batch, future.result())
+
+                for chunk in chunks:
+                    batch.append(chunk)
+                    if len(batch) >= self.embed_batch_size:
+                        submit(batch)
+                        batch = []
+                if batch:
+                    submit(batch)
+                while pending:
+                    done_batch, future = pending.popleft()
+                    add_batch(done_batch, future.result())
+
+            if vectorstore is None and training_vectors:
+                init_vectorstore()
+            if vectorstore is None:
+                raise ValueError("No chunks were produced from the PDF files")
+        except BaseException:
+            docstore.close()
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        docstore.close()
+        vectorstore.docstore = OffsetDocstore(staging)
+
+        elapsed = time.perf_counter() - started
+        print(f"Vector store created successfully ({total / elapsed:.1f} chunks/s)")
+        self._print_cache_stats()
+        return vectorstore
+
+    def _print_cache_stats(self):
+        """임베딩 캐시 적중 통계를 출력합니다."""
+        if isinstance(self.embeddings, CachedEmbeddings):
+            stats = self.embeddings.stats()
+            print(
+                f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"(hit rate {stats['hit_rate']:.1%}, {stats['entries']} entries)"
+            )
+
     def save_vectorstore(self, vectorstore: FAISS):
         """
-        벡터스토어를 디스크에 저장합니다.
+        벡터스토어를 디스크에 저장합니다. (index.faiss + 오프셋 Docstore, pickle 미사용)
+        임시 디렉토리에 쓴 뒤 파일을 교체하므로, 기존 인덱스를 mmap으로 열어 둔
+        다른 프로세스는 교체 전 파일을 계속 안전하게 읽습니다.
 
         Args:
             vectorstore: FAISS 벡터스토어
         """
+        faiss = dependable_faiss_import()
+
         # 디렉토리 생성
-        self.vectorstore_path.mkdir(parents=True, exist_ok=True)
+        self.index_path.mkdir(parents=True, exist_ok=True)
 
         # 벡터스토어 저장
-        save_path = str(self.vectorstore_path / "faiss_index")
-        vectorstore.save_local(save_path)
+        save_path = str(self.index_path)
+        with tempfile.TemporaryDirectory(dir=self.vectorstore_path) as tmp_dir:
+            faiss.write_index(vectorstore.index, str(Path(tmp_dir) / "index.faiss"))
+            OffsetDocstore.write(tmp_dir, vectorstore.docstore, vectorstore.index_to_docstore_id)
+            for tmp_file in Path(tmp_dir).iterdir():
+                os.replace(tmp_file, self.index_path / tmp_file.name)
+
+        # 이전 pickle 형식 Docstore 제거
+        legacy_path = self.index_path / "index.pkl"
+        if legacy_path.exists():
+            legacy_path.unlink()
         print(f"Vector store saved to {save_path}")
 
-    def load_vectorstore(self) -> FAISS:
+        # 메타데이터 필터 검색용 열 인덱스 (source_file, page)
+        MetadataIndex.build(vectorstore).save(self.index_path)
+
+        if self.use_sparse_index:
+            self.build_sparse_index(vectorstore)
+
+    def build_sparse_index(self, vectorstore: FAISS) -> SparseIndex:
+        """
+        벡터스토어의 청크로 BM25 희소 인덱스를 만들어 FAISS 인덱스 옆에 저장합니다.
+        임베딩이 필요 없으므로 벡터스토어가 바뀔 때마다 전체를 다시 만듭니다.
+
+        Args:
+            vectorstore: FAISS 벡터스토어
+
+        Returns:
+            SparseIndex
+        """
+        ids = [vectorstore.index_to_docstore_id[i] for i in range(len(vectorstore.index_to_docstore_id))]
+        texts = [vectorstore.docstore.search(doc_id).page_content for doc_id in ids]
+        sparse_index = SparseIndex.build(ids, texts)
+        sparse_index.save(self.index_path)
+        print(f"Sparse index saved ({len(sparse_index.vocab)} terms)")
+        return sparse_index
+
+    def load_sparse_index(self) -> Optional[SparseIndex]:
+        """
+        저장된 BM25 희소 인덱스를 로드합니다.
+
+        Returns:
+            SparseIndex (없으면 None)
+        """
+        if not SparseIndex.exists(self.index_path):
+            return None
+        return SparseIndex.load(self.index_path)
+
+    def load_metadata_index(self) -> Optional[MetadataIndex]:
+        """
+        저장된 메타데이터 열 인덱스를 로드합니다.
+
+        Returns:
+            MetadataIndex (없으면 None)
+        """
+        if not MetadataIndex.exists(self.index_path):
+            return None
+        return MetadataIndex.load(self.index_path)
+
+    def load_vectorstore(self, mmap: Optional[bool] = None) -> FAISS:
         """
         저장된 벡터스토어를 로드합니다.
+        Docstore는 오프셋 인덱스만 읽고, 청크 텍스트는 검색 결과로 필요할 때 읽습니다.
+
+        Args:
+            mmap: True면 index.faiss를 읽기 전용 mmap으로 열어 프로세스 간 페이지를 공유
+                (None이면 생성자의 mmap_index 설정 사용).
+                mmap으로 연 인덱스에는 벡터를 추가/삭제할 수 없습니다.
 
         Returns:
             FAISS 벡터스토어
         """
-        load_path = str(self.vectorstore_path / "faiss_index")
+        load_path = str(self.index_path)
 
         if not Path(load_path).exists():
             raise FileNotFoundError(f"Vector store not found at {load_path}")
 
+        if not docstore_exists(self.index_path):
+            if (self.index_path / "index.pkl").exists():
+                raise FileNotFoundError(
+                    f"Vector store at {load_path} uses the legacy pickle docstore. "
+                    "Run RAGSetup.migrate_legacy_vectorstore() once to convert it."
+                )
+            raise FileNotFoundError(f"Docstore not found at {load_path}")
+
+        if mmap is None:
+            mmap = self.mmap_index
+
+        faiss = dependable_faiss_import()
+        flags = 0
+        if mmap:
+            # IO_FLAG_MMAP_IFC: 벡터 코드를 복사하지 않고 파일 매핑을 그대로 사용 (faiss >= 1.8)
+            flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+        index = faiss.read_index(str(self.index_path / "index.faiss"), flags)
+        set_search_params(index, **self.search_params)
+
+        docstore = OffsetDocstore(self.index_path)
+        vectorstore = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=dict(enumerate(docstore.ids)),
+        )
+        print(f"Vector store loaded from {load_path}{' (mmap)' if mmap else ''}")
+        return vectorstore
+
+    def migrate_legacy_vectorstore(self) -> FAISS:
+        """
+        이전 형식(index.pkl)으로 저장된 벡터스토어를 오프셋 Docstore 형식으로 변환합니다.
+        pickle을 역직렬화하므로 이 프로젝트에서 직접 만든 신뢰할 수 있는 파일에만 사용하세요.
+
+        Returns:
+            변환된 FAISS 벡터스토어
+        """
         vectorstore = FAISS.load_local(
-            load_path,
+            str(self.index_path),
             self.embeddings,
             allow_dangerous_deserialization=True
         )
-        print(f"Vector store loaded from {load_path}")
+        self.save_vectorstore(vectorstore)
+        print("Legacy pickle docstore migrated")
         return vectorstore
 
-    def setup_rag(self, force_rebuild: bool = False) -> FAISS:
+    def load_manifest(self) -> Optional[dict]:
         """
-        RAG 시스템을 설정합니다. 벡터스토어가 없으면 생성하고, 있으면 로드합니다.
+        저장된 매니페스트를 로드합니다.
+
+        Returns:
+            매니페스트 딕셔너리 (없거나 현재 설정과 호환되지 않으면 None)
+        """
+        if not self.manifest_path.exists():
+            return None
+
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        compatible = (
+            manifest.get("version") == MANIFEST_VERSION
+            and manifest.get("embedding_model") == self.embedding_model
+            and manifest.get("chunk_size") == self.chunk_size
+            and manifest.get("chunk_overlap") == self.chunk_overlap
+            and manifest.get("index_type", "flat") == self.index_type
+        )
+        if not compatible:
+            print("Manifest does not match current settings, ignoring it")
+            return None
+        return manifest
+
+    def save_manifest(self, files: Dict[str, dict]):
+        """
+        파일/청크 해시 매니페스트를 벡터스토어 옆에 저장합니다.
 
         Args:
-            force_rebuild: True면 기존 벡터스토어를 무시하고 새로 생성
+            files: {파일명: {"sha256": 파일 해시, "chunks": [{"id", "hash"}, ...]}}
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "embedding_model": self.embedding_model,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "index_type": self.index_type,
+            "files": files,
+        }
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _chunk_ref(chunk: Document) -> Tuple[str, str, str]:
+        """매니페스트 기록용 (파일명, 청크 ID, 청크 해시)"""
+        return chunk.metadata["source_file"], chunk.id, chunk.metadata["chunk_hash"]
+
+    @staticmethod
+    def _manifest_entries(
+        chunk_refs: Iterable[Tuple[str, str, str]],
+        file_hashes: Dict[str, str]
+    ) -> Dict[str, dict]:
+        """(파일명, 청크 ID, 청크 해시) 목록으로부터 파일별 매니페스트 항목을 만듭니다."""
+        files = {
+            name: {"sha256": file_hash, "chunks": []}
+            for name, file_hash in file_hashes.items()
+        }
+        for source_file, chunk_id, chunk_hash in chunk_refs:
+            files[source_file]["chunks"].append({"id": chunk_id, "hash": chunk_hash})
+        return files
+
+    def build_vectorstore(self) -> FAISS:
+        """
+        모든 PDF로부터 벡터스토어를 새로 만들고 매니페스트와 함께 저장합니다.
 
         Returns:
             FAISS 벡터스토어
         """
-        vectorstore_exists = (self.vectorstore_path / "faiss_index").exists()
+        pdf_files = self.list_pdf_files()
+        file_hashes = {path.name: _hash_file(path) for path in pdf_files}
+
+        if self.streaming:
+            # 로드→분할→임베딩→인덱스 추가를 배치 단위로 처리
+            chunk_refs: List[Tuple[str, str, str]] = []
+            vectorstore = self.create_vectorstore_streaming(self.iter_chunks(pdf_files), chunk_refs)
+            staging = vectorstore.docstore.folder
+        else:
+            # PDF 로드
+            documents = self.load_pdfs(pdf_files)
+
+            # 문서 분할
+            chunks = self.split_documents(documents)
+            self.assign_chunk_ids(chunks)
+            chunk_refs = [self._chunk_ref(c) for c in chunks]
+
+            # 벡터스토어 생성
+            vectorstore = self.create_vectorstore(chunks)
 
-        if vectorstore_exists and not force_rebuild:
-            print("Loading existing vector store...")
-            return self.load_vectorstore()
+        # 저장
+        self.save_vectorstore(vectorstore)
+        self.save_manifest(self._manifest_entries(chunk_refs, file_hashes))
 
-        print("Building new vector store...")
+        if self.streaming:
+            # 임시 Docstore 대신 저장된 파일을 읽도록 바꾸고 임시 디렉토리 정리
+            vectorstore.docstore = OffsetDocstore(self.index_path)
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return vectorstore
+
+    def _reusable_vectors(
+        self,
+        vectorstore: FAISS,
+        manifest: dict,
+        chunks: List[Document]
+    ) -> Dict[str, List[float]]:
+        """
+        기존 인덱스에 같은 내용의 청크가 있으면 그 벡터를 재사용합니다.
 
-        # PDF 로드
-        documents = self.load_pdfs()
+        Returns:
+            {청크 해시: 벡터}
+        """
+        id_to_position = {
+            doc_id: position
+            for position, doc_id in vectorstore.index_to_docstore_id.items()
+        }
+        hash_to_position = {}
+        for entry in manifest["files"].values():
+            for chunk in entry["chunks"]:
+                if chunk["id"] in id_to_position:
+                    hash_to_position[chunk["hash"]] = id_to_position[chunk["id"]]
+
+        vectors = {}
+        for chunk in chunks:
+            text_hash = chunk.metadata["chunk_hash"]
+            position = hash_to_position.get(text_hash)
+            if position is None or text_hash in vectors:
+                continue
+            try:
+                vectors[text_hash] = vectorstore.index.reconstruct(int(position)).tolist()
+            except RuntimeError:
+                # 벡터 복원을 지원하지 않는 인덱스는 다시 임베딩
+                return {}
+        return vectors
+
+    def update_vectorstore(self, manifest: dict) -> FAISS:
+        """
+        매니페스트와 비교하여 변경된 PDF만 다시 처리합니다.
+        새로 생기거나 바뀐 청크만 임베딩하고, 삭제된 파일의 벡터는 인덱스에서 제거합니다.
 
-        # 문서 분할
-        chunks = self.split_documents(documents)
+        Args:
+            manifest: load_manifest()로 읽은 기존 매니페스트
 
-        # 벡터스토어 생성
-        vectorstore = self.create_vectorstore(chunks)
+        Returns:
+            갱신된 FAISS 벡터스토어
+        """
+        # 벡터를 추가/삭제해야 하므로 mmap 없이 메모리로 로드
+        vectorstore = self.load_vectorstore(mmap=False)
+
+        pdf_files = self.list_pdf_files()
+        file_hashes = {path.name: _hash_file(path) for path in pdf_files}
+        old_files = manifest["files"]
+
+        changed_files = [
+            path for path in pdf_files
+            if old_files.get(path.name, {}).get("sha256") != file_hashes[path.name]
+        ]
+        deleted_files = [name for name in old_files if name not in file_hashes]
+
+        if not changed_files and not deleted_files:
+            print("No PDF changes detected, vector store is up to date")
+            return vectorstore
+
+        print(
+            f"Incremental update: {len(changed_files)} changed/new, "
+            f"{len(deleted_files)} deleted PDF files"
+        )
+
+        # 변경된 PDF만 로드 및 분할
+        chunks: List[Document] = []
+        if changed_files:
+            chunks = self.split_documents(self.load_pdfs(changed_files))
+            self.assign_chunk_ids(chunks)
+
+        # 기존 벡터 재사용 (삭제 전에 복원)
+        reused = self._reusable_vectors(vectorstore, manifest, chunks)
+
+        # 변경/삭제된 파일의 기존 벡터 제거
+        stale_names = [path.name for path in changed_files if path.name in old_files]
+        stale_ids = [
+            chunk["id"]
+            for name in stale_names + deleted_files
+            for chunk in old_files[name]["chunks"]
+        ]
+        if stale_ids:
+            vectorstore.delete(stale_ids)
+            print(f"Removed {len(stale_ids)} stale vectors")
+
+        # 새 청크만 임베딩하여 추가
+        if chunks:
+            new_chunks = [c for c in chunks if c.metadata["chunk_hash"] not in reused]
+            new_vectors = self.embed_texts([c.page_content for c in new_chunks], report=True)
+            vectors = dict(zip((c.metadata["chunk_hash"] for c in new_chunks), new_vectors))
+            vectors.update(reused)
+
+            vectorstore.add_embeddings(
+                text_embeddings=[(c.page_content, vectors[c.metadata["chunk_hash"]]) for c in chunks],
+                metadatas=[c.metadata for c in chunks],
+                ids=[c.id for c in chunks],
+            )
+            print(
+                f"Added {len(chunks)} chunks "
+                f"({len(new_chunks)} embedded, {len(chunks) - len(new_chunks)} reused)"
+            )
+            self._print_cache_stats()
 
         # 저장
         self.save_vectorstore(vectorstore)
+        files = {
+            name: entry for name, entry in old_files.items()
+            if name in file_hashes and name not in stale_names
+        }
+        files.update(self._manifest_entries(
+            (self._chunk_ref(c) for c in chunks),
+            {path.name: file_hashes[path.name] for path in changed_files}
+        ))
+        self.save_manifest(files)
 
         return vectorstore
 
+    def setup_rag(self, force_rebuild: bool = False, incremental: bool = True) -> FAISS:
+        """
+        RAG 시스템을 설정합니다. 벡터스토어가 없으면 생성하고, 있으면 로드합니다.
+
+        Args:
+            force_rebuild: True면 PDF 변경사항을 반영하여 벡터스토어를 다시 생성
+            incremental: True면 매니페스트를 비교하여 변경된 PDF/청크만 다시 처리
+                (매니페스트가 없거나 설정이 바뀌었거나 flat 인덱스가 아니면 전체 재생성)
+
+        Returns:
+            FAISS 벡터스토어
+        """
+        vectorstore_exists = self.index_path.exists()
+
+        if vectorstore_exists and not force_rebuild:
+            print("Loading existing vector store...")
+            return self.load_vectorstore()
+
+        # 벡터 삭제/위치 재배치는 flat 인덱스에서만 안전하므로 나머지는 전체 재생성
+        incremental = incremental and self.index_type == "flat"
+        manifest = self.load_manifest() if vectorstore_exists and incremental else None
+        if manifest is not None:
+            print("Updating vector store incrementally...")
+            return self.update_vectorstore(manifest)
+
+        print("Building new vector store...")
+        return self.build_vectorstore()
+
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
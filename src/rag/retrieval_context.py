@@ -0,0 +1,90 @@
+"""
+요청 단위 검색 컨텍스트 모듈
+한 요청(워크플로우 실행) 안에서 필요한 검색 쿼리를 한 번에 임베딩/검색하고,
+결과를 쿼리 문자열로 기억하여 이후 노드에서 같은 쿼리를 다시 검색하지 않습니다.
+"""
+
+import threading
+from typing import Dict, Iterable, List
+
+from langchain.schema import Document
+
+
+class RetrievalContext:
+    """DocumentRetriever와 같은 retrieve/aretrieve 인터페이스를 가진 요청 단위 메모이즈 래퍼"""
+
+    def __init__(self, retriever):
+        """
+        Args:
+            retriever: DocumentRetriever
+        """
+        self.retriever = retriever
+        self._results: Dict[str, List[Document]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _missing(self, queries: Iterable[str]) -> List[str]:
+        """아직 검색하지 않은 쿼리 (순서 유지, 중복 제거)"""
+        with self._lock:
+            return [query for query in dict.fromkeys(queries) if query not in self._results]
+
+    def _remember(self, queries: List[str], results: List[List[Document]]):
+        with self._lock:
+            for query, docs in zip(queries, results):
+                self._results.setdefault(query, docs)
+
+    def prefetch(self, queries: Iterable[str]) -> None:
+        """
+        쿼리들을 한 번의 배치 임베딩과 다중 행 FAISS 검색으로 미리 검색합니다.
+
+        Args:
+            queries: 이번 요청에서 사용할 검색 쿼리
+        """
+        missing = self._missing(queries)
+        if missing:
+            self._remember(missing, self.retriever.retrieve_batch(missing))
+
+    async def aprefetch(self, queries: Iterable[str]) -> None:
+        """prefetch의 비동기 버전"""
+        missing = self._missing(queries)
+        if missing:
+            self._remember(missing, await self.retriever.aretrieve_batch(missing))
+
+    def has(self, query: str) -> bool:
+        """쿼리의 검색 결과가 이미 있는지 확인합니다."""
+        with self._lock:
+            return query in self._results
+
+    def _lookup(self, query: str):
+        with self._lock:
+            docs = self._results.get(query)
+            if docs is not None:
+                self.hits += 1
+                return list(docs)
+            self.misses += 1
+            return None
+
+    def retrieve(self, query: str) -> List[Document]:
+        """
+        기억된 결과가 있으면 반환하고, 없으면 검색 후 기억합니다.
+
+        Args:
+            query: 검색 쿼리
+
+        Returns:
+            관련 Document 객체 리스트
+        """
+        docs = self._lookup(query)
+        if docs is None:
+            docs = self.retriever.retrieve(query)
+            self._remember([query], [docs])
+        return docs
+
+    async def aretrieve(self, query: str) -> List[Document]:
+        """retrieve의 비동기 버전"""
+        docs = self._lookup(query)
+        if docs is None:
+            docs = await self.retriever.aretrieve(query)
+            self._remember([query], [docs])
+        return docs
@@ -3,13 +3,22 @@
 벡터스토어에서 관련 문서를 검색합니다.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
 from langchain.retrievers import ContextualCompressionRetriever
 from langchain.retrievers.document_compressors import LLMChainExtractor
 from langchain_openai import ChatOpenAI
 
+from .docstore import OffsetDocstore
+from .sparse_index import SparseIndex, reciprocal_rank_fusion
+from .metadata_filter import MetadataIndex, filtered_search
+
+if TYPE_CHECKING:
+    from .nutrient_retriever import NutrientRangeRetriever
+
 
 class DocumentRetriever:
     """문서 검색을 수행하는 클래스"""
@@ -19,19 +28,29 @@ class DocumentRetriever:
         vectorstore: FAISS,
         search_type: str = "similarity",
         k: int = 4,
-        use_compression: bool = False
+        use_compression: bool = False,
+        sparse_index: Optional[SparseIndex] = None,
+        metadata_index: Optional[MetadataIndex] = None
     ):
         """
         Args:
             vectorstore: FAISS 벡터스토어
-            search_type: 검색 유형 ('similarity' 또는 'mmr')
+            search_type: 검색 유형 ('similarity', 'mmr' 또는 'hybrid')
             k: 반환할 문서 개수
             use_compression: 압축 retriever 사용 여부
+            sparse_index: BM25 희소 인덱스 ('hybrid' 검색에 필요)
+            metadata_index: 메타데이터 열 인덱스 (None이면 필터 검색 시 인덱스 옆에 저장된 것을 로드,
+                없으면 Docstore에서 생성)
         """
+        if search_type == "hybrid" and sparse_index is None:
+            raise ValueError("Hybrid search requires a sparse_index")
+
         self.vectorstore = vectorstore
         self.search_type = search_type
         self.k = k
         self.use_compression = use_compression
+        self.sparse_index = sparse_index
+        self.metadata_index = metadata_index
 
         # 기본 retriever 생성
         self.base_retriever = self._create_base_retriever()
@@ -83,8 +102,135 @@ class DocumentRetriever:
         Returns:
             관련 Document 객체 리스트
         """
+        if self.search_type == "hybrid" and not self.use_compression:
+            return self.hybrid_search(query)
         return self.retriever.invoke(query)
 
+    async def aretrieve(self, query: str) -> List[Document]:
+        """
+        retrieve의 비동기 버전입니다.
+        쿼리 임베딩은 비동기 API 호출로 기다리고, FAISS/BM25 검색은 그대로 수행합니다.
+
+        Args:
+            query: 검색 쿼리
+
+        Returns:
+            관련 Document 객체 리스트
+        """
+        if self.search_type == "hybrid" and not self.use_compression:
+            return await self.ahybrid_search(query)
+        return await self.retriever.ainvoke(query)
+
+    def _supports_batch(self) -> bool:
+        """벡터로 직접 검색할 수 있는 설정인지 확인합니다. (MMR/압축 retriever는 쿼리별 검색)"""
+        return not self.use_compression and self.search_type in ("similarity", "hybrid")
+
+    def retrieve_batch(self, queries: List[str]) -> List[List[Document]]:
+        """
+        여러 쿼리를 한 번의 임베딩 요청과 한 번의 다중 행 FAISS 검색으로 검색합니다.
+
+        Args:
+            queries: 검색 쿼리 리스트
+
+        Returns:
+            쿼리 순서와 같은 Document 리스트의 리스트 (retrieve와 같은 결과)
+        """
+        if not queries:
+            return []
+        if not self._supports_batch():
+            return [self.retrieve(query) for query in queries]
+        vectors = self.vectorstore.embedding_function.embed_documents(queries)
+        return self._search_batch(queries, vectors)
+
+    async def aretrieve_batch(self, queries: List[str]) -> List[List[Document]]:
+        """retrieve_batch의 비동기 버전입니다."""
+        if not queries:
+            return []
+        if not self._supports_batch():
+            return [await self.aretrieve(query) for query in queries]
+        vectors = await self.vectorstore.embedding_function.aembed_documents(queries)
+        return self._search_batch(queries, vectors)
+
+    def _search_batch(self, queries: List[str], vectors: List[List[float]]) -> List[List[Document]]:
+        """쿼리 벡터 행렬로 FAISS를 한 번 검색하고, 하이브리드면 쿼리별로 BM25와 합칩니다."""
+        hybrid = self.search_type == "hybrid"
+        fetch_k = self.k * 4 if hybrid else self.k
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if getattr(self.vectorstore, "_normalize_L2", False):
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        _, positions = self.vectorstore.index.search(matrix, fetch_k)
+
+        results = []
+        for query, row in zip(queries, positions):
+            docs = []
+            for position in row:
+                if position < 0:
+                    continue
+                doc = self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[int(position)])
+                if isinstance(doc, Document):
+                    docs.append(doc)
+            results.append(self._fuse(query, docs, self.k, fetch_k) if hybrid else docs)
+        return results
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        """
+        벡터 검색과 BM25 검색 결과를 Reciprocal Rank Fusion으로 합쳐 검색합니다.
+        정확한 식품명("근대", "시금치")처럼 임베딩이 놓치기 쉬운 키워드를 보완합니다.
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 문서 개수 (None이면 기본값 사용)
+            fetch_k: 각 검색기에서 가져올 후보 수 (None이면 k * 4)
+
+        Returns:
+            관련 Document 객체 리스트
+        """
+        k = k or self.k
+        fetch_k = fetch_k or k * 4
+        dense_docs = self.vectorstore.similarity_search(query, k=fetch_k)
+        return self._fuse(query, dense_docs, k, fetch_k)
+
+    async def ahybrid_search(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        """hybrid_search의 비동기 버전입니다."""
+        k = k or self.k
+        fetch_k = fetch_k or k * 4
+        dense_docs = await self.vectorstore.asimilarity_search(query, k=fetch_k)
+        return self._fuse(query, dense_docs, k, fetch_k)
+
+    def _fuse(
+        self,
+        query: str,
+        dense_docs: List[Document],
+        k: int,
+        fetch_k: int
+    ) -> List[Document]:
+        """벡터 검색 결과와 BM25 검색 결과를 RRF로 합쳐 상위 k개를 반환합니다."""
+        sparse_hits = self.sparse_index.search(query, k=fetch_k)
+
+        docs_by_id = {doc.id: doc for doc in dense_docs}
+        fused = reciprocal_rank_fusion([
+            [doc.id for doc in dense_docs],
+            [doc_id for doc_id, _ in sparse_hits],
+        ])
+
+        results = []
+        for doc_id, _ in fused[:k]:
+            doc = docs_by_id.get(doc_id) or self.vectorstore.docstore.search(doc_id)
+            if isinstance(doc, Document):
+                results.append(doc)
+        return results
+
     def retrieve_with_scores(
         self,
         query: str,
@@ -103,6 +249,61 @@ class DocumentRetriever:
         k = k or self.k
         return self.vectorstore.similarity_search_with_score(query, k=k)
 
+    def _load_saved_metadata_index(self) -> Optional[MetadataIndex]:
+        """
+        save_vectorstore가 FAISS 인덱스 옆에 저장한 메타데이터 열 인덱스를 로드합니다.
+
+        Returns:
+            MetadataIndex (저장된 파일이 없거나 로드한 벡터스토어와 청크 순서가 다르면 None)
+        """
+        docstore = self.vectorstore.docstore
+        if not isinstance(docstore, OffsetDocstore) or not MetadataIndex.exists(docstore.folder):
+            return None
+        metadata_index = MetadataIndex.load(docstore.folder)
+        id_of = self.vectorstore.index_to_docstore_id
+        if metadata_index.ids != [id_of.get(position) for position in range(len(id_of))]:
+            return None
+        return metadata_index
+
+    def _get_metadata_index(self) -> MetadataIndex:
+        """메타데이터 열 인덱스를 반환합니다. (없으면 저장된 것을 로드, 그래도 없거나 크기가 다르면 새로 생성)"""
+        if self.metadata_index is None:
+            self.metadata_index = self._load_saved_metadata_index()
+        if self.metadata_index is None or len(self.metadata_index) != self.vectorstore.index.ntotal:
+            self.metadata_index = MetadataIndex.build(self.vectorstore)
+        return self.metadata_index
+
+    def search_with_filter(
+        self,
+        query: str,
+        where: Dict[str, Any],
+        k: Optional[int] = None
+    ) -> List[Document]:
+        """
+        메타데이터 조건에 맞는 청크 안에서만 검색합니다.
+        조건에 맞는 위치를 FAISS 검색에 직접 넘기므로, 맞는 청크가 k개 이상이면 항상 k개를 반환합니다.
+
+        Args:
+            query: 검색 쿼리
+            where: 메타데이터 조건 (예: {"source_file": "a.pdf"}, {"page": (10, 20)},
+                {"source_file": ["a.pdf", "b.pdf"]})
+            k: 반환할 문서 개수 (None이면 기본값 사용)
+
+        Returns:
+            관련 Document 객체 리스트 (유사도 순)
+        """
+        k = k or self.k
+        mask = self._get_metadata_index().mask(where)
+        query_vector = self.vectorstore.embedding_function.embed_query(query)
+        _, positions = filtered_search(self.vectorstore.index, query_vector, k, mask)
+
+        results = []
+        for position in positions:
+            doc = self.vectorstore.docstore.search(self.vectorstore.index_to_docstore_id[int(position)])
+            if isinstance(doc, Document):
+                results.append(doc)
+        return results
+
     def filter_by_source(
         self,
         query: str,
@@ -118,33 +319,30 @@ class DocumentRetriever:
         Returns:
             관련 Document 객체 리스트
         """
-        # 모든 문서 검색
-        all_docs = self.retrieve(query)
-
-        # 소스 파일로 필터링
-        filtered_docs = [
-            doc for doc in all_docs
-            if doc.metadata.get("source_file") == source_file
-        ]
-
-        return filtered_docs
+        return self.search_with_filter(query, {"source_file": source_file})
 
 
 def create_retriever(
     vectorstore: FAISS,
     retriever_type: str = "basic",
-    k: int = 4
-) -> DocumentRetriever:
+    k: int = 4,
+    sparse_index: Optional[SparseIndex] = None,
+    nutrient_engine=None,
+    recipe_table=None
+) -> Union[DocumentRetriever, "NutrientRangeRetriever"]:
     """
     Retriever 타입에 따라 적절한 retriever를 생성합니다.
 
     Args:
         vectorstore: FAISS 벡터스토어
-        retriever_type: retriever 타입 ('basic', 'mmr', 'compression')
+        retriever_type: retriever 타입 ('basic', 'mmr', 'compression', 'hybrid', 'nutrient_range')
         k: 반환할 문서 개수
+        sparse_index: BM25 희소 인덱스 ('hybrid' 타입에 필요)
+        nutrient_engine: 식품 영양성분 엔진 ('nutrient_range' 타입, recipe_table과 둘 중 하나 이상 필요)
+        recipe_table: 레시피 영양성분 테이블 ('nutrient_range' 타입)
 
     Returns:
-        DocumentRetriever 인스턴스
+        DocumentRetriever 인스턴스 ('nutrient_range'는 벡터스토어를 사용하지 않는 NutrientRangeRetriever)
     """
     if retriever_type == "basic":
         return DocumentRetriever(
@@ -167,6 +365,17 @@ def create_retriever(
             k=k,
             use_compression=True
         )
+    elif retriever_type == "hybrid":
+        return DocumentRetriever(
+            vectorstore=vectorstore,
+            search_type="hybrid",
+            k=k,
+            use_compression=False,
+            sparse_index=sparse_index
+        )
+    elif retriever_type == "nutrient_range":
+        from .nutrient_retriever import build_nutrient_range_retriever
+        return build_nutrient_range_retriever(nutrient_engine, recipe_table, k=k)
     else:
         raise ValueError(f"Unknown retriever type: {retriever_type}")
 
@@ -0,0 +1,196 @@
+"""
+희소(BM25) 검색 모듈
+한글은 글자 bigram, 그 외(숫자/영문)는 단어 단위로 토큰화한 역색인을 만들어
+"근대", "시금치" 같은 정확한 식품명을 밀리초 단위로 찾습니다.
+
+저장 파일 (faiss_index 디렉토리):
+    sparse_index.npz : CSR 형식 역색인 (indptr, rows, tfs)과 문서 길이
+    sparse_vocab.json: 토큰 목록과 청크 ID 목록 (행 번호 = FAISS 인덱스 위치)
+"""
+
+import re
+import json
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+SPARSE_INDEX_FILENAME = "sparse_index.npz"
+SPARSE_VOCAB_FILENAME = "sparse_vocab.json"
+
+_HANGUL = re.compile(r"[가-힣]")
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    텍스트를 토큰으로 나눕니다.
+    한글 단어는 글자 bigram("시금치는" → "시금", "금치", "치는"), 한 글자 단어는 그대로,
+    숫자/영문 단어는 소문자 단어 그대로 사용합니다.
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    tokens = []
+    for word in _WORD.findall(text):
+        if _HANGUL.search(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class SparseIndex:
+    """BM25 점수를 계산하는 CSR 역색인"""
+
+    def __init__(
+        self,
+        ids: List[str],
+        vocab: List[str],
+        indptr: np.ndarray,
+        rows: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """
+        Args:
+            ids: 행 번호별 청크 ID
+            vocab: 토큰 목록 (열 번호 순서)
+            indptr: 토큰별 포스팅 시작 위치 (len(vocab) + 1)
+            rows: 포스팅의 문서 행 번호
+            tfs: 포스팅의 토큰 빈도
+            doc_len: 문서별 토큰 수
+            k1: BM25 tf 포화 파라미터
+            b: BM25 문서 길이 정규화 파라미터
+        """
+        self.ids = ids
+        self.vocab = vocab
+        self.term_of: Dict[str, int] = {term: i for i, term in enumerate(vocab)}
+        self.indptr = indptr
+        self.rows = rows
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.k1 = k1
+        self.b = b
+
+        n_docs = len(ids)
+        doc_freq = np.diff(indptr).astype(np.float32)
+        self.idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        avg_len = float(doc_len.mean()) if n_docs else 1.0
+        # 문서 길이 정규화 항을 미리 계산
+        self._norm = (k1 * (1 - b + b * doc_len / max(avg_len, 1e-6))).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, ids: List[str], texts: List[str]) -> "SparseIndex":
+        """
+        청크 텍스트로 역색인을 만듭니다.
+
+        Args:
+            ids: 청크 ID 리스트 (FAISS 인덱스 위치 순서)
+            texts: 청크 텍스트 리스트
+
+        Returns:
+            SparseIndex
+        """
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_len = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_len[row] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((row, tf))
+
+        vocab = sorted(postings)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        rows, tfs = [], []
+        for i, term in enumerate(vocab):
+            entries = postings[term]
+            indptr[i + 1] = indptr[i] + len(entries)
+            rows.extend(row for row, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+
+        return cls(
+            ids, vocab, indptr,
+            np.asarray(rows, dtype=np.int32),
+            np.asarray(tfs, dtype=np.float32),
+            doc_len,
+        )
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[str, float]]:
+        """
+        BM25 점수 상위 k개 청크를 찾습니다.
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 개수
+
+        Returns:
+            (청크 ID, BM25 점수) 리스트 (점수 내림차순, 0점 제외)
+        """
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            col = self.term_of.get(term)
+            if col is None:
+                continue
+            start, end = self.indptr[col], self.indptr[col + 1]
+            rows = self.rows[start:end]
+            tfs = self.tfs[start:end]
+            scores[rows] += self.idf[col] * tfs * (self.k1 + 1) / (tfs + self._norm[rows])
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[row], float(scores[row])) for row in top]
+
+    def save(self, folder: Union[str, Path]) -> None:
+        """역색인을 npz/json 파일로 저장합니다. (pickle 미사용)"""
+        folder = Path(folder)
+        np.savez(
+            folder / SPARSE_INDEX_FILENAME,
+            indptr=self.indptr, rows=self.rows, tfs=self.tfs, doc_len=self.doc_len,
+        )
+        with open(folder / SPARSE_VOCAB_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "vocab": self.vocab}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, folder: Union[str, Path]) -> "SparseIndex":
+        """저장된 역색인을 로드합니다."""
+        folder = Path(folder)
+        with open(folder / SPARSE_VOCAB_FILENAME, encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = np.load(folder / SPARSE_INDEX_FILENAME, allow_pickle=False)
+        return cls(
+            meta["ids"], meta["vocab"],
+            arrays["indptr"], arrays["rows"], arrays["tfs"], arrays["doc_len"],
+        )
+
+    @staticmethod
+    def exists(folder: Union[str, Path]) -> bool:
+        """폴더에 저장된 역색인이 있는지 확인합니다."""
+        folder = Path(folder)
+        return (folder / SPARSE_INDEX_FILENAME).exists() and (folder / SPARSE_VOCAB_FILENAME).exists()
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    여러 검색 결과 순위를 Reciprocal Rank Fusion으로 합칩니다.
+
+    Args:
+        rankings: 검색기별 청크 ID 순위 리스트
+        k: RRF 상수 (클수록 하위 순위 영향이 커짐)
+
+    Returns:
+        (청크 ID, RRF 점수) 리스트 (점수 내림차순)
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
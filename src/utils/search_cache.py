@@ -0,0 +1,180 @@
+"""
+웹 검색 캐시 모듈
+(보강된 쿼리, 최대 결과 수, 도메인)을 키로 Tavily 검색 결과를 SQLite에 저장하여
+같은 요리의 웹 검색 Fallback을 네트워크 없이 바로 반환합니다.
+
+실패하거나 결과가 없는 검색도 짧은 TTL로 저장(negative caching)하여
+장애 중에 같은 검색을 반복해서 기다리지 않도록 합니다.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from src.rag.embedding_cache import normalize_text
+
+# 기본 캐시 파일 경로
+DEFAULT_SEARCH_CACHE_PATH = "data/cache/web_search.sqlite"
+
+
+class CachedSearchFailure(Exception):
+    """negative 캐시에 저장된 실패한 검색을 다시 조회했을 때 발생하는 예외 (raise_errors=True일 때)"""
+
+    def __init__(self, query: str):
+        super().__init__(f"Web search failed recently (cached failure): {query}")
+        self.query = query
+
+
+class WebSearchCache:
+    """SQLite 기반 웹 검색 결과 저장소 (TTL + negative caching + 크기 제한)"""
+
+    def __init__(
+        self,
+        cache_path: str = DEFAULT_SEARCH_CACHE_PATH,
+        ttl_seconds: float = 7 * 24 * 3600,
+        negative_ttl_seconds: float = 600,
+        max_entries: int = 10_000
+    ):
+        """
+        Args:
+            cache_path: SQLite 파일 경로
+            ttl_seconds: 결과가 있는 항목의 유효 시간 (초)
+            negative_ttl_seconds: 실패/빈 결과 항목의 유효 시간 (초)
+            max_entries: 최대 항목 수 (초과 시 가장 오래된 항목부터 삭제)
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_results (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                results TEXT NOT NULL,
+                failed INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_expires_at ON search_results (expires_at)"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, max_results: int, include_domains: Optional[Sequence[str]] = None) -> str:
+        """(정규화된 쿼리, 최대 결과 수, 정렬된 도메인) 해시 키를 만듭니다."""
+        domains = ",".join(sorted(include_domains)) if include_domains else ""
+        raw = f"{normalize_text(query)}\x00{max_results}\x00{domains}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """
+        유효한 검색 결과를 조회합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            검색 결과 리스트 (negative 항목이면 빈 리스트, 없거나 만료되면 None)
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[List[dict], bool]]:
+        """
+        유효한 검색 결과와 실패 여부를 조회합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            (검색 결과 리스트, 실패한 검색이었는지 여부) (없거나 만료되면 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results, failed FROM search_results WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            results = json.loads(row[0])
+            if results:
+                self.hits += 1
+            else:
+                self.negative_hits += 1
+            return results, bool(row[1])
+
+    def put(self, key: str, query: str, results: List[dict], failed: bool = False):
+        """
+        검색 결과를 저장합니다. 실패했거나 결과가 없으면 negative TTL을 적용합니다.
+
+        Args:
+            key: 캐시 키
+            query: 검색 쿼리 (확인용)
+            results: 검색 결과 리스트
+            failed: 검색 실패 여부
+        """
+        ttl = self.negative_ttl_seconds if failed or not results else self.ttl_seconds
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (key, query, results, failed, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, query, json.dumps(results, ensure_ascii=False), int(failed), now + ttl),
+            )
+            self._conn.execute("DELETE FROM search_results WHERE expires_at <= ?", (now,))
+            size = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+            overflow = size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM search_results WHERE key IN "
+                    "(SELECT key FROM search_results ORDER BY expires_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_results")
+            self._conn.commit()
+
+    def close(self):
+        """SQLite 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """
+        캐시 적중 통계를 반환합니다.
+
+        Returns:
+            hits, negative_hits, misses, hit_rate를 담은 딕셔너리
+        """
+        total = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.negative_hits) / total if total else 0.0,
+        }
@@ -4,17 +4,31 @@ Tavily API를 사용하여 웹 검색을 수행합니다.
 """
 
 import os
-from typing import List, Optional
-from tavily import TavilyClient
+import asyncio
+import threading
+from typing import List, Optional, Tuple
+from tavily import AsyncTavilyClient, TavilyClient
+
+from .search_cache import DEFAULT_SEARCH_CACHE_PATH, CachedSearchFailure, WebSearchCache
+
+# 검색 한 번에 기다리는 최대 시간 (초)
+DEFAULT_SEARCH_TIMEOUT = 5.0
 
 
 class WebSearcher:
     """Tavily를 사용한 웹 검색 클래스"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[WebSearchCache] = None,
+        timeout: float = DEFAULT_SEARCH_TIMEOUT
+    ):
         """
         Args:
             api_key: Tavily API Key (None이면 환경변수에서 로드)
+            cache: 검색 결과 캐시 (None이면 캐시하지 않음)
+            timeout: 검색 한 번의 기본 제한 시간 (초)
         """
         self.api_key = api_key or os.getenv("TAVILY_API_KEY")
 
@@ -22,55 +36,158 @@ class WebSearcher:
             raise ValueError("TAVILY_API_KEY not found in environment variables")
 
         self.client = TavilyClient(api_key=self.api_key)
+        self.async_client = AsyncTavilyClient(api_key=self.api_key)
+        self.cache = cache
+        self.timeout = timeout
+
+    def _cached(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        raise_errors: bool = False
+    ) -> Tuple[Optional[str], Optional[List[dict]]]:
+        """
+        캐시 키와 캐시된 결과를 반환합니다. (캐시가 없거나 미적중이면 결과 None)
+        raise_errors=True면 negative 캐시에 저장된 실패는 빈 결과 대신 CachedSearchFailure를 발생시킵니다.
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(query, max_results, include_domains)
+        entry = self.cache.get_entry(key)
+        if entry is None:
+            return key, None
+        results, failed = entry
+        if failed and raise_errors:
+            raise CachedSearchFailure(query)
+        return key, results
+
+    def _remember(self, key: Optional[str], query: str, results: List[dict], failed: bool = False):
+        """검색 결과를 캐시에 저장합니다. (실패/빈 결과는 짧은 TTL)"""
+        if self.cache is not None:
+            self.cache.put(key, query, results, failed=failed)
+
+    @staticmethod
+    def _parse_results(response: dict) -> List[dict]:
+        """Tavily 응답에서 title, url, content만 추립니다."""
+        return [
+            {
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "content": result.get("content", "")
+            }
+            for result in response.get("results", [])
+        ]
+
+    @staticmethod
+    def format_results(results: List[dict]) -> str:
+        """검색 결과 리스트를 프롬프트에 넣을 문자열로 포맷팅합니다."""
+        if not results:
+            return "검색 결과를 찾을 수 없습니다."
+
+        formatted = []
+        for i, result in enumerate(results, 1):
+            formatted.append(
+                f"[출처 {i}] {result['title']}\n"
+                f"URL: {result['url']}\n"
+                f"내용: {result['content']}\n"
+            )
+
+        return "\n".join(formatted)
 
     def search(
         self,
         query: str,
         max_results: int = 3,
         search_depth: str = "basic",
-        include_domains: Optional[List[str]] = None
+        include_domains: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        raise_errors: bool = False
     ) -> List[dict]:
         """
-        웹 검색을 수행합니다.
+        웹 검색을 수행합니다. 캐시에 있으면 네트워크 없이 반환합니다.
 
         Args:
             query: 검색 쿼리
             max_results: 반환할 최대 결과 수
             search_depth: 검색 깊이 ("basic" 또는 "advanced")
             include_domains: 특정 도메인만 검색 (예: ["nih.gov", "who.int"])
+            timeout: 제한 시간 (초, None이면 self.timeout)
+            raise_errors: 실패 시 빈 리스트 대신 예외를 다시 발생시킬지 여부
+                (최근 실패해 negative 캐시에 있는 검색은 CachedSearchFailure)
 
         Returns:
             검색 결과 리스트 (각 결과는 title, url, content 포함)
         """
+        key, cached = self._cached(query, max_results, include_domains, raise_errors)
+        if cached is not None:
+            return cached
+
         try:
             # Tavily 검색 실행
             response = self.client.search(
                 query=query,
                 max_results=max_results,
                 search_depth=search_depth,
-                include_domains=include_domains
+                include_domains=include_domains,
+                timeout=timeout or self.timeout
             )
+            results = self._parse_results(response)
+
+        except Exception as e:
+            self._remember(key, query, [], failed=True)
+            if raise_errors:
+                raise
+            print(f"Web search failed: {e!r}")
+            return []
 
-            # 결과 포맷팅
-            results = []
-            for result in response.get("results", []):
-                results.append({
-                    "title": result.get("title", ""),
-                    "url": result.get("url", ""),
-                    "content": result.get("content", "")
-                })
+        self._remember(key, query, results)
+        return results
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        search_depth: str = "basic",
+        include_domains: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        raise_errors: bool = False
+    ) -> List[dict]:
+        """search의 비동기 버전입니다. (AsyncTavilyClient 사용, 스레드를 점유하지 않음)"""
+        key, cached = self._cached(query, max_results, include_domains, raise_errors)
+        if cached is not None:
+            return cached
 
-            return results
+        timeout = timeout or self.timeout
+        try:
+            response = await asyncio.wait_for(
+                self.async_client.search(
+                    query=query,
+                    max_results=max_results,
+                    search_depth=search_depth,
+                    include_domains=include_domains,
+                    timeout=timeout
+                ),
+                timeout=timeout
+            )
+            results = self._parse_results(response)
 
         except Exception as e:
-            print(f"Web search failed: {e}")
+            self._remember(key, query, [], failed=True)
+            if raise_errors:
+                raise
+            print(f"Web search failed: {e!r}")
             return []
 
+        self._remember(key, query, results)
+        return results
+
     def search_and_format(
         self,
         query: str,
         max_results: int = 3,
-        include_domains: Optional[List[str]] = None
+        include_domains: Optional[List[str]] = None,
+        timeout: Optional[float] = None
     ) -> str:
         """
         웹 검색을 수행하고 결과를 문자열로 포맷팅합니다.
@@ -79,6 +196,7 @@ class WebSearcher:
             query: 검색 쿼리
             max_results: 반환할 최대 결과 수
             include_domains: 특정 도메인만 검색
+            timeout: 제한 시간 (초, None이면 self.timeout)
 
         Returns:
             포맷팅된 검색 결과 문자열
@@ -86,53 +204,94 @@ class WebSearcher:
         results = self.search(
             query=query,
             max_results=max_results,
-            include_domains=include_domains
+            include_domains=include_domains,
+            timeout=timeout
         )
+        return self.format_results(results)
 
-        if not results:
-            return "검색 결과를 찾을 수 없습니다."
+    async def asearch_and_format(
+        self,
+        query: str,
+        max_results: int = 3,
+        include_domains: Optional[List[str]] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """search_and_format의 비동기 버전입니다."""
+        results = await self.asearch(
+            query=query,
+            max_results=max_results,
+            include_domains=include_domains,
+            timeout=timeout
+        )
+        return self.format_results(results)
 
-        formatted = []
-        for i, result in enumerate(results, 1):
-            formatted.append(
-                f"[출처 {i}] {result['title']}\n"
-                f"URL: {result['url']}\n"
-                f"내용: {result['content']}\n"
-            )
 
-        return "\n".join(formatted)
+# 신뢰할 수 있는 영양/건강 관련 도메인 지정
+TRUSTED_DOMAINS = [
+    "nih.gov",           # 미국 국립보건원
+    "who.int",           # 세계보건기구
+    "mfds.go.kr",        # 식품의약품안전처
+    "kdca.go.kr",        # 질병관리청
+    "koreanhealthlog.com",  # 한국건강관리협회
+]
+
+
+def _enhance_query(query: str) -> str:
+    """한글 쿼리에 영양/건강 키워드를 추가합니다."""
+    return f"{query} 영양 건강 신장질환"
+
+
+# 프로세스 전체에서 공유하는 검색기 (클라이언트 연결과 결과 캐시 재사용)
+_shared_searcher: Optional[WebSearcher] = None
+_shared_searcher_lock = threading.Lock()
+
+
+def get_web_searcher() -> WebSearcher:
+    """
+    공유 WebSearcher를 반환합니다. 처음 호출할 때 한 번만 생성합니다.
+    캐시 경로와 제한 시간은 WEB_SEARCH_CACHE_PATH, WEB_SEARCH_TIMEOUT 환경변수로 바꿀 수 있습니다.
+
+    Returns:
+        WebSearcher (결과 캐시 포함)
+    """
+    global _shared_searcher
+    if _shared_searcher is None:
+        with _shared_searcher_lock:
+            if _shared_searcher is None:
+                _shared_searcher = WebSearcher(
+                    cache=WebSearchCache(os.getenv("WEB_SEARCH_CACHE_PATH", DEFAULT_SEARCH_CACHE_PATH)),
+                    timeout=float(os.getenv("WEB_SEARCH_TIMEOUT", DEFAULT_SEARCH_TIMEOUT)),
+                )
+    return _shared_searcher
 
 
-def search_for_nutrition_info(query: str, max_results: int = 3) -> str:
+def set_web_searcher(searcher: Optional[WebSearcher]):
+    """공유 WebSearcher를 교체합니다. (None이면 다음 호출 때 다시 생성)"""
+    global _shared_searcher
+    with _shared_searcher_lock:
+        _shared_searcher = searcher
+
+
+def search_for_nutrition_info(query: str, max_results: int = 3, timeout: Optional[float] = None) -> str:
     """
     영양 관련 정보를 웹에서 검색합니다.
 
     Args:
         query: 검색 쿼리
         max_results: 반환할 최대 결과 수
+        timeout: 제한 시간 (초, None이면 공유 검색기 기본값)
 
     Returns:
         포맷팅된 검색 결과
     """
     try:
-        searcher = WebSearcher()
-
-        # 신뢰할 수 있는 영양/건강 관련 도메인 지정
-        trusted_domains = [
-            "nih.gov",           # 미국 국립보건원
-            "who.int",           # 세계보건기구
-            "mfds.go.kr",        # 식품의약품안전처
-            "kdca.go.kr",        # 질병관리청
-            "koreanhealthlog.com",  # 한국건강관리협회
-        ]
-
-        # 한글 쿼리에 영양/건강 키워드 추가
-        enhanced_query = f"{query} 영양 건강 신장질환"
+        searcher = get_web_searcher()
 
         results = searcher.search_and_format(
-            query=enhanced_query,
+            query=_enhance_query(query),
             max_results=max_results,
-            include_domains=None  # 모든 도메인 검색 (필요시 trusted_domains 사용)
+            include_domains=None,  # 모든 도메인 검색 (필요시 TRUSTED_DOMAINS 사용)
+            timeout=timeout
         )
 
         return results
@@ -143,6 +302,24 @@ def search_for_nutrition_info(query: str, max_results: int = 3) -> str:
         return f"웹 검색 중 오류 발생: {e}"
 
 
+async def asearch_for_nutrition_info(query: str, max_results: int = 3, timeout: Optional[float] = None) -> str:
+    """search_for_nutrition_info의 비동기 버전입니다."""
+    try:
+        searcher = get_web_searcher()
+
+        return await searcher.asearch_and_format(
+            query=_enhance_query(query),
+            max_results=max_results,
+            include_domains=None,  # 모든 도메인 검색 (필요시 TRUSTED_DOMAINS 사용)
+            timeout=timeout
+        )
+
+    except ValueError as e:
+        return f"웹 검색을 사용할 수 없습니다: {e}"
+    except Exception as e:
+        return f"웹 검색 중 오류 발생: {e}"
+
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
 
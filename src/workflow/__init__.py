@@ -1,5 +1,6 @@
 """워크플로우 모듈: LangGraph 기반 자동 라우팅"""
 
 from .workflow import create_workflow_app
+from .response_cache import SemanticResponseCache
 
-__all__ = ["create_workflow_app"]
+__all__ = ["create_workflow_app", "SemanticResponseCache"]
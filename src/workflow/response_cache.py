@@ -0,0 +1,288 @@
+"""
+응답 캐시 모듈
+정규화된 쿼리와 쿼리 임베딩을 키로 워크플로우 최종 응답(final_result)을 저장하여
+"김치찌개 저칼륨 대체재"처럼 거의 같은 질문에 LLM 호출 없이 바로 답합니다.
+
+조회 단계:
+    1. 정확 일치: 정규화된 쿼리가 같으면 의도 분류 전에 바로 반환
+    2. 의미 일치: 의도가 같고 코사인 유사도가 임계값 이상이면 반환
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.rag.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def index_version(vectorstore) -> str:
+    """
+    벡터스토어 내용 버전을 만듭니다.
+    청크 ID에 텍스트 해시가 포함되어 있으므로 ID 목록 해시로 인덱스 재생성을 감지합니다.
+    """
+    digest = hashlib.sha256()
+    for i in range(len(vectorstore.index_to_docstore_id)):
+        digest.update(str(vectorstore.index_to_docstore_id[i]).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class _CacheEntry:
+    """캐시 항목"""
+    query: str
+    intent: str
+    vector: np.ndarray
+    result: str
+    created_at: float
+
+
+class SemanticResponseCache:
+    """의미 유사도 기반 워크플로우 응답 캐시 (TTL + LRU 크기 제한)"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.95,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1000,
+        version: str = "",
+        intents: Iterable[str] = ("recommendation", "summary"),
+        max_query_vectors: int = 256
+    ):
+        """
+        Args:
+            embeddings: 쿼리 임베딩 모델
+            threshold: 의미 일치로 판단할 최소 코사인 유사도
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+            version: 캐시 버전 (인덱스/프롬프트/모델이 바뀌면 달라지는 값, 다르면 항목 무효)
+            intents: 캐시할 의도 (매번 새로 만들어야 하는 quiz는 기본 제외)
+            max_query_vectors: 조회/저장 사이에 재사용할 쿼리 임베딩 수
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = version
+        self.intents = set(intents)
+        self.max_query_vectors = max_query_vectors
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._query_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # 의미 검색용 행렬 (항목이 바뀌면 다시 만듦)
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: list = []
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_version(self, version: str):
+        """버전을 바꾸고, 이전 버전 항목을 모두 삭제합니다."""
+        with self._lock:
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+                self._matrix = None
+
+    def clear(self):
+        """모든 항목을 삭제합니다."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def _cached_vector(self, normalized: str) -> Optional[np.ndarray]:
+        """최근에 임베딩한 쿼리 벡터를 찾습니다."""
+        with self._lock:
+            vector = self._query_vectors.get(normalized)
+            if vector is not None:
+                self._query_vectors.move_to_end(normalized)
+            return vector
+
+    def _remember_vector(self, normalized: str, vector) -> np.ndarray:
+        """쿼리 벡터를 단위 벡터로 만들어 기억합니다."""
+        vector = np.asarray(vector, dtype=np.float32)
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        with self._lock:
+            self._query_vectors[normalized] = vector
+            if len(self._query_vectors) > self.max_query_vectors:
+                self._query_vectors.popitem(last=False)
+        return vector
+
+    def _embed(self, normalized: str) -> np.ndarray:
+        """정규화된 쿼리의 단위 벡터 (최근 쿼리는 재사용)"""
+        vector = self._cached_vector(normalized)
+        if vector is None:
+            vector = self._remember_vector(normalized, self.embeddings.embed_query(normalized))
+        return vector
+
+    async def _aembed(self, normalized: str) -> np.ndarray:
+        """_embed의 비동기 버전"""
+        vector = self._cached_vector(normalized)
+        if vector is None:
+            vector = self._remember_vector(normalized, await self.embeddings.aembed_query(normalized))
+        return vector
+
+    def _expired(self, entry: _CacheEntry, now: float) -> bool:
+        return now - entry.created_at > self.ttl_seconds
+
+    def _evict_expired(self, now: float):
+        """만료된 항목을 삭제합니다. (lock 안에서 호출)"""
+        expired = [key for key, entry in self._entries.items() if self._expired(entry, now)]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def lookup(self, query: str, intent: Optional[str] = None) -> Optional[str]:
+        """
+        캐시된 응답을 찾습니다.
+
+        Args:
+            query: 사용자 쿼리
+            intent: 분류된 의도 (None이면 정확 일치만 조회하고 임베딩하지 않음)
+
+        Returns:
+            저장된 final_result (없으면 None)
+        """
+        normalized = normalize_text(query)
+        found, result = self._lookup_exact(normalized, intent)
+        if found:
+            return result
+        return self._lookup_semantic(self._embed(normalized), intent)
+
+    async def alookup(self, query: str, intent: Optional[str] = None) -> Optional[str]:
+        """lookup의 비동기 버전 (쿼리 임베딩을 비동기로 호출)"""
+        normalized = normalize_text(query)
+        found, result = self._lookup_exact(normalized, intent)
+        if found:
+            return result
+        return self._lookup_semantic(await self._aembed(normalized), intent)
+
+    def _lookup_exact(self, normalized: str, intent: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        정확 일치 항목을 찾습니다.
+
+        Returns:
+            (조회 종료 여부, 응답) - 종료 여부가 False면 의미 일치 조회가 필요
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is not None and self._expired(entry, now):
+                del self._entries[normalized]
+                self._matrix = None
+                entry = None
+            if entry is not None and (intent is None or entry.intent == intent):
+                self._entries.move_to_end(normalized)
+                self.exact_hits += 1
+                return True, entry.result
+            if intent is None:
+                return True, None
+            if intent not in self.intents or not self._entries:
+                self.misses += 1
+                return True, None
+        return False, None
+
+    def _lookup_semantic(self, vector: np.ndarray, intent: str) -> Optional[str]:
+        """의도가 같고 코사인 유사도가 임계값 이상인 항목을 찾습니다."""
+        with self._lock:
+            self._evict_expired(time.time())
+            if self._matrix is None:
+                self._matrix_keys = list(self._entries)
+                self._matrix = (
+                    np.stack([self._entries[key].vector for key in self._matrix_keys])
+                    if self._matrix_keys else None
+                )
+            if self._matrix is None:
+                self.misses += 1
+                return None
+
+            similarities = self._matrix @ vector
+            for row in np.argsort(-similarities):
+                if similarities[row] < self.threshold:
+                    break
+                key = self._matrix_keys[row]
+                entry = self._entries.get(key)
+                if entry is not None and entry.intent == intent:
+                    self._entries.move_to_end(key)
+                    self.semantic_hits += 1
+                    logger.info(f"💾 응답 캐시 의미 일치: '{entry.query}' (유사도 {similarities[row]:.3f})")
+                    return entry.result
+
+            self.misses += 1
+            return None
+
+    def store(self, query: str, intent: str, result: str):
+        """
+        응답을 저장합니다. (캐시 대상 의도가 아니거나 결과가 비어 있으면 무시)
+
+        Args:
+            query: 사용자 쿼리
+            intent: 분류된 의도
+            result: 워크플로우 final_result
+        """
+        if intent not in self.intents or not result:
+            return
+        normalized = normalize_text(query)
+        self._insert(normalized, intent, self._embed(normalized), result)
+
+    async def astore(self, query: str, intent: str, result: str):
+        """store의 비동기 버전"""
+        if intent not in self.intents or not result:
+            return
+        normalized = normalize_text(query)
+        self._insert(normalized, intent, await self._aembed(normalized), result)
+
+    def _insert(self, normalized: str, intent: str, vector: np.ndarray, result: str):
+        """항목을 추가하고 크기 제한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        with self._lock:
+            self._entries[normalized] = _CacheEntry(
+                query=normalized,
+                intent=intent,
+                vector=vector,
+                result=result,
+                created_at=time.time(),
+            )
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._matrix = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            {"exact_hits", "semantic_hits", "misses", "hit_rate", "entries", "evictions"}
+        """
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
+
+    def reset_stats(self):
+        """통계 카운터를 초기화합니다."""
+        self.exact_hits = self.semantic_hits = self.misses = self.evictions = 0
@@ -1,20 +1,36 @@
 """LangGraph 워크플로우 모듈 - query만 입력받음"""
 
+import uuid
 import logging
+import threading
+from collections import OrderedDict
 from typing import TypedDict, Literal, Optional
 from langgraph.graph import StateGraph, END
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema.output_parser import StrOutputParser
+from langchain_core.caches import BaseCache
+from langchain.schema.runnable import RunnableLambda, RunnableParallel
 from src.chains import (
     create_intent_classifier,
     create_recommendation_chain,
     create_summary_chain,
     create_quiz_chain,
+    LocalIntentClassifier,
 )
-from src.chains.common import get_llm
+from src.chains.query_analyzer import (
+    create_query_analyzer,
+    create_dish_extractor,
+    create_summary_decision_chain,
+)
+from src.chains.summary_decision import SummaryDecisionRules
+from src.chains.common import PROMPT_VERSION, ingredient_query, recommendation_query
+from src.rag.retrieval_context import RetrievalContext
+from src.nutrition.substitutes import SubstituteFinder
+from .response_cache import SemanticResponseCache, index_version
 
 logger = logging.getLogger(__name__)
 
+# 추천 → 요약 노드 사이에 보관하는 요청 단위 검색 컨텍스트 최대 수 (요약 노드가 실행되지 못한 요청 정리용)
+MAX_PENDING_RETRIEVAL_CONTEXTS = 1024
+
 
 # 상태 정의 - query만 필수 입력
 class _WorkflowStateRequired(TypedDict):
@@ -25,20 +41,56 @@ class _WorkflowStateRequired(TypedDict):
 class WorkflowState(_WorkflowStateRequired, total=False):
     """워크플로우 상태 - query만 필수, 나머지는 자동 초기화"""
     intent: str  # 의도 분류 결과
+    dish_name: str  # 요리명 (구조화 분석 모드에서 의도 분류와 함께 추출)
     recommendation_result: Optional[str]  # 추천 결과
     final_result: str  # 최종 결과
-    need_summary: bool  # 요약 필요 여부 (LLM이 판단)
+    need_summary: bool  # 요약 필요 여부 (키워드 규칙, 애매하면 LLM이 판단)
+    cache_hit: bool  # 응답 캐시에서 반환했는지 여부
+    retrieval_key: str  # 요청 단위 검색 컨텍스트 키 (추천 → 요약 노드로 전달, 컨텍스트 자체는 상태 밖에 보관)
+
+
+def canonical_intent(intent: str) -> str:
+    """분류기 출력을 'recommendation', 'quiz', 'summary' 중 하나로 정리합니다."""
+    if "recommendation" in intent:
+        return "recommendation"
+    if "quiz" in intent:
+        return "quiz"
+    return "summary"
 
 
 def create_workflow_app(
     vectorstore,
     llm_config: Optional[dict] = None,
+    sparse_index=None,
+    response_cache: Optional[SemanticResponseCache] = None,
+    use_response_cache: bool = False,
+    query_analysis: str = "structured",
+    llm_cache: Optional[BaseCache] = None,
+    nutrient_engine=None,
+    recipe_table=None,
 ):
     """
     LangGraph 워크플로우 앱 생성
 
     Args:
         vectorstore: RAG 벡터스토어
+        sparse_index: BM25 희소 인덱스 (있으면 벡터+BM25 하이브리드 검색 사용)
+        response_cache: 응답 캐시 (use_response_cache=True일 때 사용, None이면 벡터스토어 임베딩 모델로 새로 생성)
+        use_response_cache: 응답 캐시 사용 여부 (기본 False)
+            비슷한 쿼리에 다른 요리의 캐시 응답이 반환될 수 있으므로 호출하는 쪽에서 명시적으로 켬
+        query_analysis: 추천 요청의 요리명/요약 필요성 판단 방식
+            'structured': 의도·요리명·요약 필요성을 한 번의 구조화 출력 호출로 추출
+                (로컬 분류기가 확신하는 summary/quiz 요청은 LLM 호출 없음)
+            'parallel': 요리명 추출과 요약 필요성 판단을 별도 LLM 호출로 동시에 실행
+        llm_cache: 의도 분류/쿼리 분석/요리명 추출/요약 필요성 판단 LLM 응답 캐시
+            (None이면 캐시하지 않음, 추천/요약/퀴즈 생성은 캐시하지 않음)
+        nutrient_engine: 로컬 영양성분 엔진 (src.nutrition.NutrientEngine)
+            있으면 추천 체인이 재료 영양성분을 LLM 대신 식품성분표에서 계산
+        recipe_table: 미리 계산한 레시피 영양성분 테이블 (src.nutrition.RecipeNutrientTable)
+            있으면 알려진 요리는 재료 추출 LLM 호출 없이 테이블의 재료/영양성분 사용
+            (nutrient_engine이 있으면 추천 프롬프트에 식품성분표 기반 대체재 후보 순위도 포함,
+            nutrient_engine 또는 recipe_table이 있으면 "칼륨 300mg 이하 찌개" 같은 영양성분 조건 쿼리는
+            의도 분류 전에 범위 검색으로 바로 응답하고, 결과가 없으면 일반 흐름으로 진행)
         llm_config: LLM 설정 딕셔너리
             {
                 "model": "gpt-4o-mini",
@@ -48,7 +100,7 @@ def create_workflow_app(
             }
 
     Returns:
-        컴파일된 워크플로우 그래프
+        컴파일된 워크플로우 그래프 (app.invoke / await app.ainvoke)
     """
     if llm_config is None:
         llm_config = {}
@@ -63,7 +115,10 @@ def create_workflow_app(
 
     # 리트리버 생성
     from src.rag.retriever import create_retriever
-    retriever = create_retriever(vectorstore, retriever_type="basic", k=4)
+    if sparse_index is not None:
+        retriever = create_retriever(vectorstore, retriever_type="hybrid", k=4, sparse_index=sparse_index)
+    else:
+        retriever = create_retriever(vectorstore, retriever_type="basic", k=4)
 
     # 체인 생성
     logger.info("워크플로우 초기화 중...")
@@ -71,6 +126,7 @@ def create_workflow_app(
         model=default_config["model"],
         temperature=0.3,  # 의도분류는 낮은 온도 사용
         max_tokens=default_config["max_tokens"],
+        cache=llm_cache,
     )
 
     recommendation_chain = create_recommendation_chain(
@@ -78,6 +134,9 @@ def create_workflow_app(
         model=default_config["model"],
         temperature=default_config["temperature"],
         max_tokens=default_config["max_tokens"],
+        nutrient_engine=nutrient_engine,
+        recipe_table=recipe_table,
+        substitute_finder=SubstituteFinder(nutrient_engine) if nutrient_engine is not None else None,
     )
 
     summary_chain = create_summary_chain(
@@ -94,12 +153,130 @@ def create_workflow_app(
         max_tokens=default_config["max_tokens"],
     )
 
-    # 노드 함수 정의
+    # 영양성분 범위 검색 (식품성분표/레시피 테이블이 있을 때만)
+    nutrient_retriever = create_retriever(
+        vectorstore, retriever_type="nutrient_range", k=10,
+        nutrient_engine=nutrient_engine, recipe_table=recipe_table,
+    ) if nutrient_engine is not None or recipe_table is not None else None
 
-    def classify_intent(state: WorkflowState) -> WorkflowState:
-        """사용자 의도를 분류합니다."""
-        query = state["query"]
-        intent = intent_classifier.invoke({"query": query}).strip().lower()
+    # 요리명 추출 / 요약 필요성 판단 체인 (요청마다 만들지 않도록 한 번만 생성)
+    if query_analysis not in ("structured", "parallel"):
+        raise ValueError(f"Unknown query_analysis mode: {query_analysis}")
+
+    query_analyzer = create_query_analyzer(
+        model=default_config["model"],
+        max_tokens=default_config["max_tokens"],
+        cache=llm_cache,
+    ) if query_analysis == "structured" else None
+
+    dish_extractor = create_dish_extractor(model=default_config["model"], cache=llm_cache)
+    summary_decision_chain = create_summary_decision_chain(model=default_config["model"], cache=llm_cache)
+
+    # 요리명 추출과 요약 필요성 판단은 서로 독립이므로 동시에 실행
+    dish_and_decision = RunnableParallel(
+        dish_name=dish_extractor,
+        decision=summary_decision_chain,
+    )
+
+    # 요약 필요성 키워드 규칙 (애매한 경우에만 LLM 판단)
+    summary_rules = SummaryDecisionRules()
+
+    # 응답 캐시 (인덱스/프롬프트/모델이 바뀌면 이전 응답 무효화)
+    if use_response_cache:
+        if response_cache is None:
+            response_cache = SemanticResponseCache(vectorstore.embedding_function)
+        response_cache.set_version(
+            f"{index_version(vectorstore)}:{PROMPT_VERSION}:{default_config['model']}"
+            f"{':nutrient:substitutes' if nutrient_engine is not None else ''}"
+            f"{':recipes' if recipe_table is not None else ''}"
+        )
+    else:
+        response_cache = None
+
+    # 노드 함수 정의 (동기 invoke / 비동기 ainvoke 버전을 함께 정의)
+
+    def _cache_update(state: WorkflowState, result: Optional[str]) -> WorkflowState:
+        """캐시 조회 결과를 상태에 반영합니다."""
+        if result is None:
+            return {**state, "cache_hit": False}
+        logger.info("💾 응답 캐시 일치 → 종료")
+        return {**state, "final_result": result, "cache_hit": True}
+
+    def lookup_exact_cache(state: WorkflowState) -> WorkflowState:
+        """정규화된 쿼리가 같은 캐시 응답을 찾습니다. (의도 분류 전)"""
+        return _cache_update(state, response_cache.lookup(state["query"]))
+
+    async def alookup_exact_cache(state: WorkflowState) -> WorkflowState:
+        return _cache_update(state, await response_cache.alookup(state["query"]))
+
+    def lookup_semantic_cache(state: WorkflowState) -> WorkflowState:
+        """의도가 같고 의미가 비슷한 쿼리의 캐시 응답을 찾습니다."""
+        intent = canonical_intent(state["intent"])
+        return _cache_update(state, response_cache.lookup(state["query"], intent=intent))
+
+    async def alookup_semantic_cache(state: WorkflowState) -> WorkflowState:
+        intent = canonical_intent(state["intent"])
+        return _cache_update(state, await response_cache.alookup(state["query"], intent=intent))
+
+    def store_cache(state: WorkflowState) -> WorkflowState:
+        """최종 응답을 캐시에 저장합니다."""
+        response_cache.store(
+            state["query"], canonical_intent(state.get("intent", "")), state.get("final_result", "")
+        )
+        return state
+
+    async def astore_cache(state: WorkflowState) -> WorkflowState:
+        await response_cache.astore(
+            state["query"], canonical_intent(state.get("intent", "")), state.get("final_result", "")
+        )
+        return state
+
+    def _nutrient_search_update(state: WorkflowState, answer: Optional[str]) -> WorkflowState:
+        """범위 검색 결과를 상태에 반영합니다. (결과가 없으면 상태 그대로)"""
+        if answer is None:
+            logger.info("조건에 맞는 항목 없음 → 의도 분류로 진행")
+            return state
+        logger.info("✅ 영양성분 범위 검색 완료")
+        return {**state, "intent": "nutrient_search", "final_result": answer}
+
+    def run_nutrient_search(state: WorkflowState) -> WorkflowState:
+        """영양성분 조건 쿼리를 범위 색인으로 검색합니다. (LLM 호출 없음)"""
+        logger.info("🔢 영양성분 범위 검색 노드 실행 중...")
+        return _nutrient_search_update(state, nutrient_retriever.format_answer(state["query"]))
+
+    async def arun_nutrient_search(state: WorkflowState) -> WorkflowState:
+        logger.info("🔢 영양성분 범위 검색 노드 실행 중...")
+        return _nutrient_search_update(state, nutrient_retriever.format_answer(state["query"]))
+
+    def _local_intent(query: str) -> Optional[str]:
+        """구조화 분석 모드에서 로컬 분류기가 확신하는 summary/quiz 의도를 반환합니다."""
+        if isinstance(intent_classifier, LocalIntentClassifier):
+            local = intent_classifier.predict_local(query)
+            if local.confidence >= intent_classifier.min_margin and local.label != "recommendation":
+                logger.info(f"🎯 의도 분류: {local.label} (로컬)")
+                return local.label
+        return None
+
+    def _analysis_update(state: WorkflowState, analysis) -> WorkflowState:
+        """구조화 분석 결과를 상태에 반영합니다. (요약 필요성은 키워드 규칙 우선, 애매하면 LLM 판단)"""
+        need_summary = summary_rules.decide(state["query"])
+        source = "키워드 규칙"
+        if need_summary is None:
+            need_summary, source = analysis.need_summary, "구조화 분석"
+        logger.info(
+            f"🎯 의도 분류: {analysis.intent}, 요리명: {analysis.dish_name} (구조화 분석), "
+            f"요약 필요성: {'필요' if need_summary else '불필요'} ({source})"
+        )
+        return {
+            **state,
+            "intent": analysis.intent,
+            "dish_name": analysis.dish_name.strip(),
+            "need_summary": need_summary,
+        }
+
+    def _intent_update(state: WorkflowState, intent: str) -> WorkflowState:
+        """의도 분류 결과를 상태에 반영합니다."""
+        intent = intent.strip().lower()
         logger.info(f"🎯 의도 분류: {intent}")
         return {
             **state,
@@ -107,83 +284,184 @@ def create_workflow_app(
             "need_summary": False,  # 초기값
         }
 
-    def extract_dish_name(query: str) -> str:
-        """사용자 질문에서 요리명을 추출합니다."""
-        llm = get_llm(model=default_config["model"], temperature=0.3)
-        extract_dish_prompt = ChatPromptTemplate.from_messages([
-            ("system", "사용자의 질문에서 요리명만 추출하세요. 한 단어 또는 짧은 구문만 반환하세요."),
-            ("user", "{query}")
-        ])
-        dish_extractor = extract_dish_prompt | llm | StrOutputParser()
-        dish_name = dish_extractor.invoke({"query": query})
-        return dish_name.strip()
+    def classify_intent(state: WorkflowState) -> WorkflowState:
+        """사용자 의도를 분류합니다. (구조화 분석 모드에서는 요리명/요약 필요성도 함께 추출)"""
+        query = state["query"]
+        if query_analyzer is not None:
+            # 로컬 분류기가 확신하는 summary/quiz 요청은 LLM 호출 없이 라우팅
+            intent = _local_intent(query)
+            if intent is not None:
+                return {**state, "intent": intent, "need_summary": False}
+            return _analysis_update(state, query_analyzer.invoke({"query": query}))
+        return _intent_update(state, intent_classifier.invoke({"query": query}))
+
+    async def aclassify_intent(state: WorkflowState) -> WorkflowState:
+        query = state["query"]
+        if query_analyzer is not None:
+            intent = _local_intent(query)
+            if intent is not None:
+                return {**state, "intent": intent, "need_summary": False}
+            return _analysis_update(state, await query_analyzer.ainvoke({"query": query}))
+        return _intent_update(state, await intent_classifier.ainvoke({"query": query}))
+
+    def _decision_outputs(outputs: dict) -> tuple:
+        """요리명 추출 + 요약 필요성 LLM 판단 결과를 정리합니다."""
+        decision = outputs["decision"].strip().lower()
+        need_summary = "yes" in decision
+        logger.info(f"요약 필요성: {'필요' if need_summary else '불필요'} (판단: {decision})")
+        return outputs["dish_name"].strip(), need_summary
+
+    # 요청 단위 검색 컨텍스트 보관소 (Future/Lock을 담고 있어 직렬화되는 그래프 상태에는 키만 둠)
+    pending_contexts: "OrderedDict[str, RetrievalContext]" = OrderedDict()
+    pending_contexts_lock = threading.Lock()
+
+    def _keep_retrieval_context(retrieval_context: RetrievalContext) -> str:
+        """요약 노드가 이어서 쓸 검색 컨텍스트를 보관하고 키를 반환합니다."""
+        key = uuid.uuid4().hex
+        with pending_contexts_lock:
+            pending_contexts[key] = retrieval_context
+            while len(pending_contexts) > MAX_PENDING_RETRIEVAL_CONTEXTS:
+                pending_contexts.popitem(last=False)
+        return key
+
+    def _retrieval_context(state: WorkflowState) -> RetrievalContext:
+        """요청 단위 검색 컨텍스트 (추천 노드가 보관한 것을 꺼내 쓰고, 없으면 새로 생성)"""
+        key = state.get("retrieval_key")
+        if key:
+            with pending_contexts_lock:
+                retrieval_context = pending_contexts.pop(key, None)
+            if retrieval_context is not None:
+                return retrieval_context
+        return RetrievalContext(retriever)
+
+    def _known_queries(query: str, dish_name: str, need_summary: bool) -> list:
+        """요리명이 정해진 뒤 이번 요청에서 검색할 쿼리 (재료, 대체재, 요약 주제)"""
+        queries = [recommendation_query(dish_name)]
+        if recipe_table is None or dish_name not in recipe_table:
+            # 레시피 테이블에 있는 요리는 재료 추출을 생략하므로 재료 검색도 불필요
+            queries.insert(0, ingredient_query(dish_name))
+        if need_summary:
+            queries.append(query)
+        return queries
+
+    def _recommendation_update(
+        state: WorkflowState,
+        dish_name: str,
+        need_summary: bool,
+        result: str,
+        retrieval_context: RetrievalContext
+    ) -> WorkflowState:
+        """추천 결과를 상태에 반영합니다."""
+        logger.info("✅ 추천 체인 완료")
+        if need_summary:
+            # 요약 노드가 같은 검색 결과를 이어서 사용
+            state = {**state, "retrieval_key": _keep_retrieval_context(retrieval_context)}
+        return {
+            **state,
+            "dish_name": dish_name,
+            "recommendation_result": result,
+            "final_result": result,
+            "need_summary": need_summary,
+        }
 
     def run_recommendation(state: WorkflowState) -> WorkflowState:
-        """추천 체인을 실행하고, LLM으로 요약 필요성을 판단합니다."""
+        """추천 체인을 실행하고, 요약 필요성을 판단합니다."""
         logger.info("🍳 추천 노드 실행 중...")
+        query = state["query"]
 
-        # 요리명 추출
-        dish_name = extract_dish_name(state["query"])
+        if state.get("dish_name"):
+            # 구조화 분석에서 이미 추출됨
+            dish_name, need_summary = state["dish_name"], state.get("need_summary", False)
+        else:
+            need_summary = summary_rules.decide(query)
+            if need_summary is not None:
+                # 키워드 규칙으로 판단됨 → 요리명만 추출
+                logger.info(f"요약 필요성: {'필요' if need_summary else '불필요'} (키워드 규칙)")
+                dish_name = dish_extractor.invoke({"query": query}).strip()
+            else:
+                # 요리명 추출 + 요약 필요성 LLM 판단 (동시 실행)
+                logger.info("🤔 요리명 추출 및 요약 필요성 판단 중...")
+                dish_name, need_summary = _decision_outputs(dish_and_decision.invoke({"query": query}))
         logger.info(f"추출된 요리명: {dish_name}")
 
-        # 추천 체인 실행
-        result = recommendation_chain({"dish_name": dish_name})
-        logger.info("✅ 추천 체인 완료")
+        # 재료/대체재/요약 검색을 한 번의 배치 임베딩 + FAISS 검색으로 미리 수행
+        retrieval_context = RetrievalContext(retriever)
+        retrieval_context.prefetch(_known_queries(query, dish_name, need_summary))
 
-        # LLM으로 요약 필요성 판단
-        logger.info("🤔 요약 필요성 판단 중...")
-        llm = get_llm(model=default_config["model"], temperature=0.3)
-        summary_decision_prompt = ChatPromptTemplate.from_messages([
-            ("system", """사용자 쿼리를 분석하여 추천 후 조리법과 주의사항 요약이 필요한지 판단하세요.
+        result = recommendation_chain.invoke({"dish_name": dish_name, "retriever": retrieval_context})
+        return _recommendation_update(state, dish_name, need_summary, result, retrieval_context)
 
-다음 중 하나만 반환하세요:
-- "yes": 요약이 필요한 경우 (사용자가 조리법, 주의사항, 팁 등을 요청한 경우)
-- "no": 요약이 불필요한 경우 (단순 재료 대체 추천만 원하는 경우)
-
-판단 기준:
-- "만드는 법", "조리법", "어떻게", "방법", "주의", "팁", "알려줄래" 등의 키워드 포함 → yes
-- "추천", "대체", "뭐", "뭘", "뭐가", "가능한", "할 수" 등만 포함 → no"""),
-            ("user", "{query}")
-        ])
-
-        summary_decision_chain = summary_decision_prompt | llm | StrOutputParser()
-        decision = summary_decision_chain.invoke({"query": state["query"]}).strip().lower()
+    async def arun_recommendation(state: WorkflowState) -> WorkflowState:
+        logger.info("🍳 추천 노드 실행 중...")
+        query = state["query"]
 
-        need_summary = "yes" in decision
-        logger.info(f"요약 필요성: {'필요' if need_summary else '불필요'} (판단: {decision})")
+        if state.get("dish_name"):
+            dish_name, need_summary = state["dish_name"], state.get("need_summary", False)
+        else:
+            need_summary = summary_rules.decide(query)
+            if need_summary is not None:
+                logger.info(f"요약 필요성: {'필요' if need_summary else '불필요'} (키워드 규칙)")
+                dish_name = (await dish_extractor.ainvoke({"query": query})).strip()
+            else:
+                logger.info("🤔 요리명 추출 및 요약 필요성 판단 중...")
+                dish_name, need_summary = _decision_outputs(await dish_and_decision.ainvoke({"query": query}))
+        logger.info(f"추출된 요리명: {dish_name}")
 
-        return {
-            **state,
-            "recommendation_result": result,
-            "final_result": result,
-            "need_summary": need_summary,
-        }
+        retrieval_context = RetrievalContext(retriever)
+        await retrieval_context.aprefetch(_known_queries(query, dish_name, need_summary))
 
-    def run_summary(state: WorkflowState) -> WorkflowState:
-        """요약 체인을 실행합니다."""
-        logger.info("📝 요약 노드 실행 중...")
+        result = await recommendation_chain.ainvoke({"dish_name": dish_name, "retriever": retrieval_context})
+        return _recommendation_update(state, dish_name, need_summary, result, retrieval_context)
 
-        result = summary_chain({"topic": state["query"]})
+    def _summary_update(state: WorkflowState, result: str) -> WorkflowState:
+        """요약 결과를 상태에 반영합니다. (추천 결과가 있으면 결합)"""
         logger.info("✅ 요약 체인 완료")
-
-        # 추천 결과가 있으면 결합, 없으면 그냥 요약 결과만 반환
         if state.get("recommendation_result"):
             final_result = f"{state['recommendation_result']}\n\n{'='*70}\n\n## 추가 정보\n\n{result}"
         else:
             final_result = result
-
         return {**state, "final_result": final_result}
 
+    def run_summary(state: WorkflowState) -> WorkflowState:
+        """요약 체인을 실행합니다."""
+        logger.info("📝 요약 노드 실행 중...")
+        inputs = {"topic": state["query"], "retriever": _retrieval_context(state)}
+        return _summary_update(state, summary_chain.invoke(inputs))
+
+    async def arun_summary(state: WorkflowState) -> WorkflowState:
+        logger.info("📝 요약 노드 실행 중...")
+        inputs = {"topic": state["query"], "retriever": _retrieval_context(state)}
+        return _summary_update(state, await summary_chain.ainvoke(inputs))
+
     def run_quiz(state: WorkflowState) -> WorkflowState:
         """문제 생성 체인을 실행합니다."""
         logger.info("❓ 문제 생성 노드 실행 중...")
-
-        result = quiz_chain({"topic": state["query"]})
+        result = quiz_chain.invoke({"topic": state["query"]})
         logger.info("✅ 문제 생성 노드 완료")
+        return {**state, "final_result": result}
 
+    async def arun_quiz(state: WorkflowState) -> WorkflowState:
+        logger.info("❓ 문제 생성 노드 실행 중...")
+        result = await quiz_chain.ainvoke({"topic": state["query"]})
+        logger.info("✅ 문제 생성 노드 완료")
         return {**state, "final_result": result}
 
     # 라우터 함수
+    def route_query(state: WorkflowState) -> Literal["nutrient", "classifier"]:
+        """영양성분 범위 조건과 검색 대상(식품군/요리·식품 이름 등)이 있는 쿼리는 범위 검색 노드로 보냅니다."""
+        if nutrient_retriever is not None and nutrient_retriever.is_range_query(state["query"]):
+            logger.info("→ 영양성분 범위 검색 노드로 라우팅")
+            return "nutrient"
+        return "classifier"
+
+    def route_cache(state: WorkflowState) -> Literal["hit", "nutrient", "classifier"]:
+        """캐시 일치 여부에 따라 종료 또는 다음 단계(범위 검색/의도 분류)로 라우팅합니다"""
+        return "hit" if state.get("cache_hit") else route_query(state)
+
+    def route_after_nutrient_search(state: WorkflowState) -> Literal["found", "classifier"]:
+        """범위 검색 결과가 있으면 종료, 없으면 의도 분류로 진행합니다"""
+        return "found" if state.get("intent") == "nutrient_search" else "classifier"
+
     def route_after_recommendation(state: WorkflowState) -> Literal["summary", "end"]:
         """추천 후 요약 필요성에 따라 다음 노드를 결정합니다 (LangGraph conditional_edges)"""
         if state.get("need_summary", False):
@@ -195,40 +473,74 @@ def create_workflow_app(
 
     def route_intent(state: WorkflowState) -> Literal["recommendation", "summary", "quiz"]:
         """의도에 따라 다음 노드를 결정합니다"""
-        intent = state["intent"]
+        intent = canonical_intent(state["intent"])
 
-        if "recommendation" in intent:
+        if intent == "recommendation":
             logger.info("→ Recommendation 노드로 라우팅")
             return "recommendation"
-        elif "quiz" in intent:
+        elif intent == "quiz":
             logger.info("→ Quiz 노드로 라우팅")
             return "quiz"
         else:
             logger.info("→ Summary 노드로 라우팅")
             return "summary"
 
+    def route_after_semantic_cache(state: WorkflowState) -> Literal["hit", "recommendation", "summary", "quiz"]:
+        """캐시에 있으면 종료, 없으면 의도에 따라 다음 노드를 결정합니다"""
+        if state.get("cache_hit"):
+            logger.info("→ 캐시 응답 반환")
+            return "hit"
+        return route_intent(state)
+
     # LangGraph 구성
     workflow = StateGraph(WorkflowState)
 
-    # 노드 추가
-    workflow.add_node("classifier", classify_intent)
-    workflow.add_node("recommendation", run_recommendation)
-    workflow.add_node("summary", run_summary)
-    workflow.add_node("quiz", run_quiz)
-
-    # 엣지 추가
-    workflow.set_entry_point("classifier")
+    # 노드 추가 (app.invoke는 동기 함수, app.ainvoke는 비동기 함수 실행)
+    workflow.add_node("classifier", RunnableLambda(classify_intent, afunc=aclassify_intent))
+    workflow.add_node("recommendation", RunnableLambda(run_recommendation, afunc=arun_recommendation))
+    workflow.add_node("summary", RunnableLambda(run_summary, afunc=arun_summary))
+    workflow.add_node("quiz", RunnableLambda(run_quiz, afunc=arun_quiz))
+    if nutrient_retriever is not None:
+        workflow.add_node("nutrient_search", RunnableLambda(run_nutrient_search, afunc=arun_nutrient_search))
+        # 범위 검색은 LLM 없이 바로 끝나므로 응답 캐시에 저장하지 않고 종료
+        workflow.add_conditional_edges(
+            "nutrient_search", route_after_nutrient_search, {"found": END, "classifier": "classifier"}
+        )
+    query_routes = {"nutrient": "nutrient_search", "classifier": "classifier"} \
+        if nutrient_retriever is not None else {"classifier": "classifier"}
+
+    intent_routes = {
+        "recommendation": "recommendation",
+        "summary": "summary",
+        "quiz": "quiz",
+    }
 
-    # 의도 분류 후 조건부 라우팅
-    workflow.add_conditional_edges(
-        "classifier",
-        route_intent,
-        {
-            "recommendation": "recommendation",
-            "summary": "summary",
-            "quiz": "quiz",
-        }
-    )
+    if response_cache is not None:
+        workflow.add_node("cache_lookup", RunnableLambda(lookup_exact_cache, afunc=alookup_exact_cache))
+        workflow.add_node(
+            "semantic_cache_lookup", RunnableLambda(lookup_semantic_cache, afunc=alookup_semantic_cache)
+        )
+        workflow.add_node("cache_store", RunnableLambda(store_cache, afunc=astore_cache))
+        finish = "cache_store"
+
+        # 정확 일치 캐시 → (일치하면 종료) → 의도 분류 → 의미 일치 캐시 → 체인
+        workflow.set_entry_point("cache_lookup")
+        workflow.add_conditional_edges("cache_lookup", route_cache, {"hit": END, **query_routes})
+        workflow.add_edge("classifier", "semantic_cache_lookup")
+        workflow.add_conditional_edges(
+            "semantic_cache_lookup",
+            route_after_semantic_cache,
+            {"hit": END, **intent_routes},
+        )
+        workflow.add_edge("cache_store", END)
+    else:
+        finish = END
+
+        # 엣지 추가 (영양성분 범위 조건 쿼리는 범위 검색부터)
+        workflow.set_conditional_entry_point(route_query, query_routes)
+
+        # 의도 분류 후 조건부 라우팅
+        workflow.add_conditional_edges("classifier", route_intent, intent_routes)
 
     # Recommendation 후 조건부 라우팅 (need_summary 플래그 기반)
     workflow.add_conditional_edges(
@@ -236,16 +548,18 @@ def create_workflow_app(
         route_after_recommendation,
         {
             "summary": "summary",
-            "end": END,
+            "end": finish,
         }
     )
 
-    # 각 체인 노드에서 종료로 연결
-    workflow.add_edge("summary", END)
-    workflow.add_edge("quiz", END)
+    # 각 체인 노드에서 종료로 연결 (캐시 사용 시 저장 후 종료)
+    workflow.add_edge("summary", finish)
+    workflow.add_edge("quiz", finish)
 
     # 그래프 컴파일
     app = workflow.compile()
     logger.info("✅ 워크플로우 컴파일 완료")
+    if response_cache is not None:
+        logger.info(f"💾 응답 캐시 사용 (유사도 임계값 {response_cache.threshold})")
 
     return app
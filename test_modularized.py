@@ -5,6 +5,9 @@ import logging
 from dotenv import load_dotenv
 from src.rag.rag_setup import RAGSetup
 from src.workflow import create_workflow_app
+from src.chains import LRUSQLiteLLMCache
+from src.chains.web_fallback import fallback_stats
+from src.nutrition import DEFAULT_RECIPE_TABLE_PATH, NutrientEngine, RecipeNutrientTable
 
 # Logger 설정
 logging.basicConfig(
@@ -32,17 +35,29 @@ rag_setup = RAGSetup(
 
 # 벡터스토어 생성 또는 로드
 vectorstore = rag_setup.setup_rag(force_rebuild=False)
+sparse_index = rag_setup.load_sparse_index()
 logger.info("✅ RAG 시스템 초기화 완료")
 
 # 워크플로우 생성
 logger.info("\n워크플로우 생성 중...")
+llm_cache = LRUSQLiteLLMCache()
+nutrient_engine = NutrientEngine.from_csv()
+logger.info(f"✅ 영양성분 엔진 로드 완료 ({len(nutrient_engine)}개 식품)")
+# 레시피 영양성분 테이블 (src/preprocess/recipe_nutrient_builder.py로 미리 생성)
+recipe_table = RecipeNutrientTable.load() if os.path.exists(DEFAULT_RECIPE_TABLE_PATH) else None
+if recipe_table is not None:
+    logger.info(f"✅ 레시피 영양성분 테이블 로드 완료 ({len(recipe_table)}개 요리)")
 app = create_workflow_app(
     vectorstore,
     llm_config={
         "model": "gpt-4o-mini",
         "temperature": 0.7,
         "max_tokens": None,
-    }
+    },
+    sparse_index=sparse_index,
+    llm_cache=llm_cache,
+    nutrient_engine=nutrient_engine,
+    recipe_table=recipe_table,
 )
 
 logger.info("\n" + "="*70)
@@ -55,6 +70,7 @@ test_queries = [
     "된장찌개 만드는 법을 저칼륨으로 어떻게 해야 하고 주의할 점은?",  # 조리법 + 주의사항 필요 → summary 추가
     "혈액투석 환자의 식사 관리 주의사항 요약해줘",  # summary 의도
     "저염식에 대한 퀴즈 3개 만들어줘",  # quiz 의도
+    "칼륨 300mg 이하, 인 200mg 이하 찌개 알려줘",  # 영양성분 범위 검색 (LLM 호출 없음)
 ]
 
 for i, query in enumerate(test_queries, 1):
@@ -71,4 +87,6 @@ for i, query in enumerate(test_queries, 1):
     print(result["final_result"])
     logger.info("\n")
 
+logger.info(f"🧠 LLM 캐시 통계: {llm_cache.stats()}")
+logger.info(f"🌐 웹 검색 Fallback 통계: {fallback_stats()}")
 logger.info("✅ 모든 테스트 완료")
@@ -0,0 +1,22 @@
+"""테스트 공용 fixture"""
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def food_csv(tmp_path):
+    """food_data_processor.py 출력과 같은 형식의 작은 성분표 (단백질(mg) = 단백질(g) × 100)"""
+    path = tmp_path / "food_database_cleaned_df.csv"
+    pd.DataFrame({
+        "식품군": ["두류", "채소류"],
+        "식품명": ["두부", "오이_생것"],
+        "출처": ["", ""],
+        "에너지(kcal)": [84, 12],
+        "단백질(mg)": [960, 90],  # 9.6g, 0.9g
+        "인(mg)": [118, 34],
+        "칼륨(mg)": [141, 163],
+        "나트륨(mg)": [3, 2],
+        "영양성분함량기준량": ["100g", "100g"],
+    }).to_csv(path, index=False)
+    return path
@@ -0,0 +1,171 @@
+"""EmbeddingScheduler 속도 제한/백오프 테스트 (로컬 가짜 임베딩 HTTP 서버 사용)"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.rag.embedding_scheduler import EmbeddingScheduler, TokenBucket
+
+
+class FakeEmbeddingServer:
+    """최근 window초 동안 max_requests개를 넘는 요청에 429 + Retry-After를 돌려주는 임베딩 서버"""
+
+    def __init__(self, max_requests: int = 1000, window: float = 1.0, retry_after: float = 0.5):
+        self.max_requests = max_requests
+        self.window = window
+        self.retry_after = retry_after
+        self.accepted: List[float] = []  # 200으로 처리한 요청 시각
+        self.rejected: List[float] = []  # 429로 거절한 요청 시각
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                now = time.monotonic()
+                with server._lock:
+                    recent = [t for t in server.accepted if t > now - server.window]
+                    limited = len(recent) >= server.max_requests
+                    (server.rejected if limited else server.accepted).append(now)
+                if limited:
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(server.retry_after))
+                    self.end_headers()
+                    return
+                payload = json.dumps({"data": [[float(len(text)), 1.0] for text in body["input"]]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/embeddings"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class RateLimitError(Exception):
+    """OpenAI 클라이언트처럼 status_code와 response.headers를 가진 429 오류"""
+
+    def __init__(self, headers):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+class HTTPEmbeddings(Embeddings):
+    """가짜 서버로 요청을 보내는 임베딩 클라이언트"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"input": texts}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return json.loads(response.read())["data"]
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                raise RateLimitError({"retry-after": e.headers.get("Retry-After")}) from e
+            raise
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def max_in_window(times: List[float], window: float) -> int:
+    """window초 구간 안에 들어간 최대 요청 수"""
+    times = sorted(times)
+    best, start = 0, 0
+    for end, t in enumerate(times):
+        while t - times[start] >= window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def make_scheduler(url: str, requests_per_minute: int, burst: float = 1) -> EmbeddingScheduler:
+    """요청 하나에 텍스트 하나씩 보내고 버스트를 burst개로 줄인 스케줄러"""
+    scheduler = EmbeddingScheduler(
+        HTTPEmbeddings(url),
+        max_texts_per_batch=1,
+        max_concurrency=4,
+        requests_per_minute=requests_per_minute,
+        backoff_seconds=0.05,
+        token_counter=len,
+    )
+    scheduler.request_bucket = TokenBucket(requests_per_minute, capacity=burst)
+    return scheduler
+
+
+def test_request_limit_is_shared_across_threads():
+    """여러 스레드가 같은 스케줄러로 embed해도 합친 요청 속도가 RPM 한도를 넘지 않아야 함"""
+    with FakeEmbeddingServer() as server:
+        scheduler = make_scheduler(server.url, requests_per_minute=600)  # 초당 10개
+        texts = [[f"thread {t} text {i}" for i in range(5)] for t in range(4)]
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(scheduler.embed, texts))
+        elapsed = time.monotonic() - started
+
+    assert results == [[[float(len(text)), 1.0] for text in batch] for batch in texts]
+    assert len(server.accepted) == 20
+    # 버스트 1개 + 초당 10개 → 20개 요청에는 최소 1.9초
+    assert elapsed >= 1.8
+    assert max_in_window(server.accepted, 1.0) <= 11
+
+
+def test_rate_limit_backoff_pauses_all_threads():
+    """429를 받으면 Retry-After 동안 모든 스레드가 요청을 멈추고, 결과는 빠짐없이 돌아와야 함"""
+    with FakeEmbeddingServer(max_requests=5, window=1.0, retry_after=0.5) as server:
+        # 클라이언트 한도는 넉넉하게 두어 서버의 429로만 속도가 조절되도록 함
+        scheduler = make_scheduler(server.url, requests_per_minute=60_000, burst=100)
+        texts = [[f"thread {t} text {i}" for i in range(4)] for t in range(3)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(scheduler.embed, texts))
+
+    assert results == [[[float(len(text)), 1.0] for text in batch] for batch in texts]
+    assert len(server.accepted) == 12
+    assert server.rejected
+    # 429 이후 Retry-After(0.5초) 동안은 어느 스레드도 새 요청을 보내지 않음 (이미 보낸 요청 여유 0.1초)
+    requests = server.accepted + server.rejected
+    for rejected_at in server.rejected:
+        assert not [t for t in requests if rejected_at + 0.1 < t < rejected_at + 0.45]
+
+
+def test_token_bucket_penalty_blocks_other_event_loops():
+    """한 스레드에서 penalize한 버킷은 다른 스레드의 이벤트 루프에서도 대기해야 함"""
+    import asyncio
+
+    bucket = TokenBucket(60_000)
+    bucket.penalize(0.3)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: asyncio.run(bucket.acquire(1)), range(2)))
+    assert time.monotonic() - started == pytest.approx(0.3, abs=0.1)
@@ -0,0 +1,42 @@
+"""LocalIntentClassifier 평가 데이터/키워드 규칙 테스트"""
+
+import pytest
+
+from src.chains.local_intent_classifier import (
+    LABELED_QUERIES,
+    SEED_EXAMPLES,
+    LocalIntentClassifier,
+    evaluate_agreement,
+)
+
+
+def test_labeled_queries_are_held_out_from_seeds():
+    """평가 질문은 중심을 만드는 예시 질문과 겹치지 않아야 함"""
+    seeds = {query for queries in SEED_EXAMPLES.values() for query in queries}
+    assert not seeds & {query for query, _ in LABELED_QUERIES}
+
+
+def test_evaluate_agreement_rejects_training_queries():
+    """학습 예시를 평가 데이터로 넘기면 오류"""
+    classifier = LocalIntentClassifier()
+    with pytest.raises(ValueError):
+        evaluate_agreement(classifier, [(SEED_EXAMPLES["quiz"][0], "quiz")])
+
+
+def test_held_out_accuracy():
+    """LLM fallback 없이 held-out 질문 대부분을 맞혀야 함"""
+    report = evaluate_agreement(LocalIntentClassifier())
+    assert report["local_accuracy"] >= 0.8
+
+
+def test_generic_request_word_does_not_force_summary():
+    """'알려줘' 같은 범용 표현만으로 요리 재료 질문을 summary로 보내지 않음"""
+    prediction = LocalIntentClassifier().predict_local("김치찌개 재료 알려줘")
+    assert prediction.label == "recommendation"
+
+
+def test_keyword_disagreeing_with_centroid_is_not_confident():
+    """키워드 의도와 최근접 중심 의도가 다르면 확신도 0 (LLM fallback 대상)"""
+    classifier = LocalIntentClassifier(keywords={"summary": ("찌개",)})
+    prediction = classifier.predict_local("김치찌개 저칼륨 재료로 바꾸고 싶어")
+    assert prediction.confidence == 0.0
@@ -0,0 +1,14 @@
+"""NutrientEngine 성분표 불러오기 테스트"""
+
+import pytest
+
+from src.nutrition.engine import NUTRIENT_COLUMNS, NutrientEngine
+
+
+def test_from_csv_converts_protein_to_mg(food_csv):
+    """두부 300g의 단백질은 28.8g = 28800mg"""
+    engine = NutrientEngine.from_csv(str(food_csv))
+    item = engine.resolve("두부 300g")
+    amounts = dict(zip(NUTRIENT_COLUMNS, item.amounts.tolist()))
+    assert amounts["단백질(mg)"] == pytest.approx(28800)
+    assert amounts["칼륨(mg)"] == pytest.approx(423)
@@ -0,0 +1,32 @@
+"""병렬 PDF 파싱 결과가 PyPDFLoader와 같은지 확인하는 테스트"""
+
+from langchain_community.document_loaders import PyPDFLoader
+from pypdf import PdfWriter
+
+from src.rag.rag_setup import _load_pdf_pages
+
+
+def test_parallel_pages_match_pypdf_loader(tmp_path):
+    """페이지 범위로 나누어 읽어도 PyPDFLoader와 같은 메타데이터 (문서 메타데이터 포함)"""
+    path = tmp_path / "guide.pdf"
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    writer.add_metadata({
+        "/Producer": "Test Producer",
+        "/Creator": "Test Creator",
+        "/CreationDate": "D:20240101120000+09'00'",
+        "/ModDate": "D:20240102120000+09'00'",
+        "/Trapped": "/False",
+    })
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    expected = PyPDFLoader(str(path)).load()
+    pages = _load_pdf_pages(str(path), 0, 2) + _load_pdf_pages(str(path), 2, 4)
+
+    assert [page.metadata for page in pages] == [
+        {**doc.metadata, "source_file": "guide.pdf"} for doc in expected
+    ]
+    assert pages[0].metadata["creationdate"] == "2024-01-01T12:00:00+09:00"
+    assert [page.page_content for page in pages] == [doc.page_content for doc in expected]
@@ -0,0 +1,31 @@
+"""재료 분량 파싱 테스트"""
+
+import pytest
+
+from src.nutrition.quantity import parse_ingredient
+
+
+@pytest.mark.parametrize("text, name, grams", [
+    ("두부 300g", "두부", 300.0),
+    ("간장 2큰술", "간장", 30.0),
+    ("대파1/2대", "대파", 25.0),
+    ("소금 약간", "소금", 2.0),
+])
+def test_parse_ingredient(text, name, grams):
+    parsed = parse_ingredient(text)
+    assert (parsed.name, parsed.grams, parsed.has_quantity) == (name, grams, True)
+
+
+def test_number_inside_name_is_not_quantity():
+    """상품명 안의 숫자가 아니라 뒤쪽 분량을 사용"""
+    parsed = parse_ingredient("비타500 1병")
+    assert parsed.name == "비타500"
+    assert parsed.grams == 200.0
+
+
+def test_half_quantity():
+    """'반개'는 0.5개"""
+    parsed = parse_ingredient("오이 반개")
+    assert parsed.name == "오이"
+    assert parsed.grams == 50.0
+    assert parse_ingredient("반건조 오징어").has_quantity is False
@@ -0,0 +1,29 @@
+"""영양성분 범위 검색 테스트"""
+
+import numpy as np
+
+from src.nutrition.engine import NutrientEngine
+from src.nutrition.range_index import NutrientRangeIndex, parse_nutrient_query
+
+
+def test_parse_protein_grams_to_mg():
+    """단백질 g 조건은 mg 열 단위로 바뀜"""
+    query = parse_nutrient_query("단백질 10~20g 어패류 5개")
+    assert query.ranges == {1: (10_000.0, 20_000.0)}
+    assert query.terms == ["어패류"]
+    assert query.top_n == 5
+
+
+def test_parse_upper_bound_without_unit():
+    """단위가 없으면 영양성분별 기본 단위, 비교 표현이 없으면 상한"""
+    query = parse_nutrient_query("칼륨 300, 인 200mg 이하 찌개")
+    assert query.ranges == {3: (-np.inf, 300.0), 2: (-np.inf, 200.0)}
+    assert query.terms == ["찌개"]
+
+
+def test_protein_range_search_on_food_table(food_csv):
+    """두부(100g당 단백질 9.6g)는 '단백질 5g 이상'에 걸리고 '단백질 10g 이상'에는 걸리지 않음"""
+    index = NutrientRangeIndex.from_engine(NutrientEngine.from_csv(str(food_csv)))
+    assert [match.name for match in index.query(parse_nutrient_query("단백질 5g 이상 식품"))] == ["두부"]
+    assert index.query(parse_nutrient_query("단백질 10g 이상 식품")) == []
+    assert [match.name for match in index.query(parse_nutrient_query("단백질 1g 이하"))] == ["오이_생것"]
@@ -0,0 +1,22 @@
+"""영양성분 신호등 판정 테스트"""
+
+import pytest
+
+from src.nutrition.engine import NUTRIENT_COLUMNS, NutrientEngine
+from src.nutrition.scoring import GREEN, daily_limits, score_dishes
+
+_PROTEIN = NUTRIENT_COLUMNS.index("단백질(mg)")
+
+
+def test_protein_limit_is_in_mg():
+    """투석 전 60kg의 단백질 권장량은 0.8g/kg × 60kg = 48g"""
+    assert daily_limits("투석 전", 60)[_PROTEIN] == pytest.approx(48_000)
+
+
+def test_tofu_protein_band(food_csv):
+    """두부 300g(단백질 28.8g)은 투석 전 60kg 권장량의 60%, 녹색"""
+    engine = NutrientEngine.from_csv(str(food_csv))
+    _, matrix = engine.resolve_many(["두부 300g"])
+    score = score_dishes(matrix, stage="투석 전", weight_kg=60)
+    assert score.ratios[0, _PROTEIN] == pytest.approx(0.6)
+    assert score.bands[0, _PROTEIN] == GREEN
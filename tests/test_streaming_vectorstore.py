@@ -0,0 +1,96 @@
+"""스트리밍 벡터스토어 생성 테스트 (가짜 임베딩 사용)"""
+
+import hashlib
+from typing import List
+
+import numpy as np
+import pytest
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+from src.rag.docstore import OffsetDocstore
+from src.rag.embedding_scheduler import EmbeddingScheduler
+from src.rag.rag_setup import RAGSetup
+
+
+class HashEmbeddings(Embeddings):
+    """텍스트 해시로 만든 16차원 단위 벡터"""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).normal(size=16).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+def make_chunks(setup: RAGSetup, n: int) -> List[Document]:
+    chunks = [
+        Document(page_content=f"청크 {i} 저칼륨 식단", metadata={"source_file": "a.pdf", "page": i // 4})
+        for i in range(n)
+    ]
+    setup.assign_chunk_ids(chunks)
+    return chunks
+
+
+def make_setup(tmp_path, monkeypatch, **kwargs) -> RAGSetup:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    setup = RAGSetup(
+        vectorstore_path=str(tmp_path),
+        use_embedding_cache=False,
+        use_sparse_index=False,
+        streaming=True,
+        embed_batch_size=5,
+        **kwargs,
+    )
+    setup.embeddings = HashEmbeddings()
+    setup.embedding_scheduler = EmbeddingScheduler(setup.embeddings)
+    return setup
+
+
+@pytest.mark.parametrize("index_type, index_params", [("flat", None), ("ivf", {"nlist": 2})])
+def test_streaming_matches_batch_build(tmp_path, monkeypatch, index_type, index_params):
+    """스트리밍 생성은 청크를 Docstore 파일에 기록하고, 일괄 생성과 같은 위치/내용을 가져야 함"""
+    setup = make_setup(tmp_path, monkeypatch, index_type=index_type, index_params=index_params, index_train_size=12)
+    chunk_refs = []
+    chunks = make_chunks(setup, 23)
+    streamed = setup.create_vectorstore_streaming(iter(chunks), chunk_refs)
+    batch = setup.create_vectorstore(make_chunks(setup, 23))
+
+    assert isinstance(streamed.docstore, OffsetDocstore)
+    assert streamed.index.ntotal == 23
+    assert streamed.index_to_docstore_id == batch.index_to_docstore_id
+    assert [ref[1] for ref in chunk_refs] == [chunk.id for chunk in chunks]
+    for position, doc_id in streamed.index_to_docstore_id.items():
+        doc = streamed.docstore.search(doc_id)
+        assert doc.page_content == f"청크 {position} 저칼륨 식단"
+        assert doc.metadata == batch.docstore.search(doc_id).metadata
+        if index_type == "flat":
+            assert np.allclose(streamed.index.reconstruct(position), batch.index.reconstruct(position))
+
+
+def test_streaming_failure_removes_staging_docstore(tmp_path, monkeypatch):
+    """임베딩이 실패하면 임시 Docstore 디렉토리를 남기지 않음"""
+    setup = make_setup(tmp_path, monkeypatch)
+
+    def fail(texts):
+        raise RuntimeError("embedding failed")
+
+    monkeypatch.setattr(setup, "embed_texts", fail)
+    with pytest.raises(RuntimeError):
+        setup.create_vectorstore_streaming(iter(make_chunks(setup, 7)))
+    assert not list(tmp_path.glob("streaming_docstore_*"))
+
+
+def test_search_params_are_set_by_rag_setup(tmp_path, monkeypatch):
+    """nprobe는 RAGSetup이 인덱스를 만들 때 적용하고, retriever 생성은 공유 인덱스를 바꾸지 않음"""
+    from langchain_community.vectorstores.faiss import dependable_faiss_import
+
+    from src.rag.retriever import create_retriever
+
+    faiss = dependable_faiss_import()
+    setup = make_setup(tmp_path, monkeypatch, index_type="ivf", index_params={"nlist": 4}, nprobe=3)
+    vectorstore = setup.create_vectorstore(make_chunks(setup, 20))
+    create_retriever(vectorstore, "basic", k=2)
+    assert faiss.extract_index_ivf(vectorstore.index).nprobe == 3
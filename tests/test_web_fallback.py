@@ -0,0 +1,106 @@
+"""웹 검색 Fallback 시간 예산/서킷 브레이커 테스트 (가짜 검색기 사용)"""
+
+import asyncio
+import time
+
+import pytest
+
+import src.chains.web_fallback as web_fallback
+from src.chains.web_fallback import WebFallback
+
+RESULTS = [{"title": "저칼륨 식단", "url": "https://example.com", "content": "칼륨을 줄이는 조리법"}]
+
+
+class FakeSearcher:
+    """delay초 뒤에 결과를 돌려주거나 error를 던지는 검색기"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def search(self, query, max_results=3, timeout=None, raise_errors=False):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return RESULTS[:max_results]
+
+    async def asearch(self, query, max_results=3, timeout=None, raise_errors=False):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return RESULTS[:max_results]
+
+
+@pytest.fixture
+def searcher(monkeypatch):
+    fake = FakeSearcher()
+    monkeypatch.setattr(web_fallback, "get_web_searcher", lambda: fake)
+    return fake
+
+
+def run_sync(fallback: WebFallback):
+    started = time.monotonic()
+    return fallback.result(fallback.start("칼륨", 3, started), "칼륨", 3, started)
+
+
+def run_async(fallback: WebFallback):
+    async def main():
+        started = time.monotonic()
+        return await fallback.aresult(fallback.astart("칼륨", 3, started), "칼륨", 3, started)
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("run", [run_sync, run_async])
+def test_result_within_budget(searcher, run):
+    fallback = WebFallback(budget_seconds=1.0)
+    assert "저칼륨 식단" in run(fallback)
+    stats = fallback.stats()
+    assert (stats["web_used"], stats["timeout"], stats["web_failed"]) == (1, 0, 0)
+
+
+@pytest.mark.parametrize("run", [run_sync, run_async])
+def test_timeouts_open_circuit_at_threshold(searcher, run):
+    """동기/비동기 모두 시간 초과 failure_threshold회에 회로가 열리고, 이후 검색은 생략"""
+    searcher.delay = 0.3
+    fallback = WebFallback(budget_seconds=0.1, failure_threshold=2, recovery_seconds=60)
+
+    assert run(fallback) is None
+    assert fallback.breaker.state == "closed"
+    assert run(fallback) is None
+    assert fallback.breaker.state == "open"
+    calls = searcher.calls
+    assert run(fallback) is None
+    assert searcher.calls == calls
+
+    stats = fallback.stats()
+    assert (stats["timeout"], stats["web_failed"], stats["circuit_open"]) == (2, 0, 1)
+
+
+@pytest.mark.parametrize("run", [run_sync, run_async])
+def test_errors_count_as_web_failed(searcher, run):
+    searcher.error = RuntimeError("search failed")
+    fallback = WebFallback(budget_seconds=1.0, failure_threshold=2)
+    assert run(fallback) is None
+    assert run(fallback) is None
+    stats = fallback.stats()
+    assert (stats["web_failed"], stats["timeout"], stats["circuit_state"]) == (2, 0, "open")
+
+
+def test_late_sync_search_does_not_record_twice(searcher):
+    """예산을 넘겨 끝난 동기 검색은 시간 초과 기록 외에 실패를 다시 남기지 않음"""
+    searcher.delay = 0.2
+    fallback = WebFallback(budget_seconds=0.05, failure_threshold=2, recovery_seconds=60)
+    assert run_sync(fallback) is None
+    time.sleep(0.3)  # 백그라운드 검색이 끝날 때까지 대기
+    assert fallback.breaker.state == "closed"
+
+
+def test_exhausted_budget_skips_search(searcher):
+    fallback = WebFallback(budget_seconds=1.0)
+    started = time.monotonic() - 1.0
+    assert fallback.result(None, "칼륨", 3, started) is None
+    assert searcher.calls == 0
+    assert fallback.stats()["budget_exhausted"] == 1